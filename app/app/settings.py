@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.budgets.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -93,6 +96,29 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The catalog version (see workout.catalog) lives in the default cache and
+# must be shared by every worker, so the cache cannot be process-local.
+# Use Redis when REDIS_URL is set, otherwise a file cache that the workers
+# of one host share.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', '/tmp/workout-cache'),
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -141,6 +167,9 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    'DEFAULT_PAGINATION_CLASS': (
+        'workout.pagination.WorkoutCursorPagination'
+    ),
 }
 
 SIMPLE_JWT = {
@@ -150,6 +179,16 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# What to do when a request runs more queries than its view's budget (see
+# core.budgets): 'warn' logs it, 'raise' fails it, None skips the check.
+QUERY_BUDGET_MODE = 'warn' if DEBUG else None
+
+# Opt-in request profiling (see core.timing). SERVER_TIMING adds a
+# Server-Timing header to every response; SERVER_TIMING_LOG_RATE logs that
+# share of requests (0.0 to 1.0) as JSON lines.
+SERVER_TIMING = os.environ.get('SERVER_TIMING') == '1'
+SERVER_TIMING_LOG_RATE = float(os.environ.get('SERVER_TIMING_LOG_RATE', 0))
+
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
 }
@@ -44,10 +44,15 @@ class UserAdmin(BaseUserAdmin):
     )
 
 
+class WorkoutPlanExerciseAdmin(admin.ModelAdmin):
+    """Load the names used by __str__ with the changelist query."""
+    list_select_related = ['exercise', 'workout_plan']
+
+
 admin.site.register(models.User, UserAdmin)
 admin.site.register(models.Exercise)
 admin.site.register(models.MuscleGroup)
 admin.site.register(models.WorkoutPlan)
-admin.site.register(models.WorkoutPlanExercise)
+admin.site.register(models.WorkoutPlanExercise, WorkoutPlanExerciseAdmin)
 admin.site.register(models.WorkoutSession)
 admin.site.register(models.Progress)
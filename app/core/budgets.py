@@ -0,0 +1,141 @@
+"""
+Query budgets: the most SQL queries a view action may run.
+
+Views declare them in a ``query_budgets`` dict keyed by viewset action,
+or by HTTP method for plain API views. A budget of None marks an action
+whose query count grows with its input by design, such as a batched
+import, and is not checked. ``QueryBudgetMiddleware`` counts the queries
+of every request and, depending on ``QUERY_BUDGET_MODE``, logs or raises
+when a budget is exceeded. ``query_budget`` does the same
+for any block of code in tests. Both report the statements that ran more
+than once with the same shape, which is what an N+1 looks like.
+
+Savepoint statements are not counted: tests wrap every request in one,
+production does not. Queries a streaming response runs while it is being
+consumed happen after the middleware returns and are not counted either.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+MODES = ('warn', 'raise')
+# Shapes listed in a report, most repeated first.
+REPORTED_SHAPES = 5
+
+_SAVEPOINT = re.compile(r'^\s*(RELEASE |ROLLBACK TO )?SAVEPOINT\b', re.I)
+_PLACEHOLDERS = re.compile(r'%s(\s*,\s*%s)+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view or block ran more queries than its budget."""
+
+
+def is_savepoint(sql):
+    """Return whether `sql` creates, releases or rolls back a savepoint."""
+    return bool(_SAVEPOINT.match(sql))
+
+
+def sql_shape(sql):
+    """Return `sql` with whitespace and placeholder lists collapsed."""
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    return _PLACEHOLDERS.sub('%s, ...', sql)
+
+
+class QueryRecorder:
+    """Execute wrapper that keeps the SQL of every counted statement."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not is_savepoint(sql):
+            self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def duplicates(self):
+        """Return (count, shape) for shapes that ran more than once."""
+        counts = Counter(sql_shape(sql) for sql in self.statements)
+        return [
+            (count, shape) for shape, count in counts.most_common()
+            if count > 1
+        ]
+
+    def report(self, label, budget):
+        """Describe a budget overrun and its most repeated shapes."""
+        lines = [
+            f'{label} ran {len(self.statements)} queries, '
+            f'budget is {budget}.'
+        ]
+        for count, shape in self.duplicates()[:REPORTED_SHAPES]:
+            lines.append(f'  {count}x {shape[:300]}')
+        return '\n'.join(lines)
+
+
+@contextmanager
+def query_budget(budget, label='Block'):
+    """Fail with QueryBudgetExceeded if the block runs over `budget`."""
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        yield recorder
+    if len(recorder.statements) > budget:
+        raise QueryBudgetExceeded(recorder.report(label, budget))
+
+
+def get_query_budget(view_func, method):
+    """Return (label, budget) for a resolved view, or None if it has none.
+
+    ``view_func`` is what the URL resolved to; viewsets map the method to
+    an action, plain API views are looked up by the method itself.
+    """
+    view_class = getattr(view_func, 'cls', None)
+    budgets = getattr(view_class, 'query_budgets', None)
+    if not budgets:
+        return None
+    key = method.lower()
+    actions = getattr(view_func, 'actions', None)
+    if actions is not None:
+        # Viewsets answer HEAD with the GET action.
+        if key == 'head' and key not in actions:
+            key = 'get'
+        key = actions.get(key)
+    if key not in budgets:
+        return None
+    return f'{view_class.__name__}.{key}', budgets[key]
+
+
+class QueryBudgetMiddleware:
+    """Check every request against its view's query budget."""
+
+    def __init__(self, get_response):
+        self.mode = getattr(settings, 'QUERY_BUDGET_MODE', None)
+        if self.mode is None:
+            raise MiddlewareNotUsed
+        if self.mode not in MODES:
+            raise ValueError(
+                f'QUERY_BUDGET_MODE must be one of {MODES} or None.')
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        label, budget = getattr(request, '_query_budget', None) or (
+            None, None)
+        if budget is not None and len(recorder.statements) > budget:
+            message = recorder.report(label, budget)
+            if self.mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = get_query_budget(view_func, request.method)
@@ -1,179 +1,449 @@
-from django.core.management.base import BaseCommand
+"""
+Django command to load the exercise catalog from a JSON, NDJSON or CSV file.
+
+The file is read as a stream in every format, so catalogs of any size
+load in flat memory. Muscle groups and exercises are matched by name and
+upserted in batches.
+New names are inserted with ``bulk_create``. Existing rows are updated in
+one statement per batch, and only where their text actually changed.
+Each exercise's target muscles are then brought in line with the file by
+bulk inserts and deletes on the through table. Nothing that is missing
+from the file is deleted, so workout plans that use an exercise keep it.
+"""
+import csv
+import json
+import re
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
 from core.models import Exercise, MuscleGroup
+from workout.catalog import bump_catalog_version
+
+DEFAULT_CATALOG = (
+    Path(__file__).resolve().parents[2] / 'catalog' / 'exercises.json'
+)
+FORMATS = {'.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson',
+           '.csv': 'csv'}
+# Separates the target muscles in one CSV cell.
+MUSCLE_SEPARATOR = ';'
+# Characters read from a JSON catalog at a time.
+CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+UPDATE_MUSCLE_GROUPS = """
+UPDATE core_musclegroup AS m
+SET description = v.description, updated_at = %s
+FROM unnest(%s::bigint[], %s::text[]) AS v (id, description)
+WHERE m.id = v.id AND m.description IS DISTINCT FROM v.description
+"""
+
+# Rows are sent as parallel arrays, like the progress importer does, so a
+# batch costs one statement however many rows it carries. Each exercise's
+# sorted muscle ids travel as an array literal, because unnest cannot
+# unpack ragged arrays.
+INSERT_EXERCISES = """
+INSERT INTO core_exercise (name, description, instructions, target_muscle_ids,
+                           updated_at)
+SELECT v.name, v.description, v.instructions, v.muscle_ids::bigint[], %s
+FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+     AS v (name, description, instructions, muscle_ids)
+RETURNING id, name
+"""
+
+UPDATE_EXERCISES = """
+UPDATE core_exercise AS e
+SET description = v.description, instructions = v.instructions,
+    target_muscle_ids = v.muscle_ids::bigint[], updated_at = %s
+FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::text[])
+     AS v (id, description, instructions, muscle_ids)
+WHERE e.id = v.id
+  AND (e.description, e.instructions, e.target_muscle_ids)
+      IS DISTINCT FROM (v.description, v.instructions, v.muscle_ids::bigint[])
+RETURNING e.id, e.name
+"""
+
+# The through table is only touched for exercises that were created or
+# whose muscles changed; target_muscle_ids mirrors it for every other row.
+UNLINK_TARGET_MUSCLES = """
+DELETE FROM {table}
+WHERE exercise_id = ANY(%s)
+  AND (exercise_id, musclegroup_id) NOT IN (
+      SELECT * FROM unnest(%s::bigint[], %s::bigint[])
+  )
+"""
+
+LINK_TARGET_MUSCLES = """
+INSERT INTO {table} (exercise_id, musclegroup_id)
+SELECT * FROM unnest(%s::bigint[], %s::bigint[])
+ON CONFLICT DO NOTHING
+"""
+
+
+class JSONStream:
+    """Decode a JSON document one value at a time from a text file.
+
+    Only ``CHUNK_SIZE`` characters past the current value are held in
+    memory, so an array of any length can be walked item by item.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ''
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """Drop what has been read and append the next chunk."""
+        chunk = self.file.read(CHUNK_SIZE)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self):
+        """Return the next non-whitespace character, or '' at the end."""
+        while True:
+            self.pos = JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        """Consume `char`, the next non-whitespace character."""
+        found = self.peek()
+        if found != char:
+            raise CommandError(
+                f'Invalid JSON: expected "{char}", found {found!r}.')
+        self.pos += 1
+
+    def value(self):
+        """Decode and return the next complete value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError as error:
+                if self.fill():
+                    continue
+                raise CommandError(f'Invalid JSON: {error}.') from error
+            # A number at the end of the buffer may go on in the next chunk.
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """Yield the values of the array starting here."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise CommandError(
+                    f'Invalid JSON: expected "," or "]", '
+                    f'found {separator!r}.')
+
+
+def iter_json_object(stream, load_muscle_groups):
+    """Yield the numbered exercises of the catalog object starting here."""
+    stream.expect('{')
+    if stream.peek() == '}':
+        stream.pos += 1
+        return
+    while True:
+        key = stream.value()
+        if not isinstance(key, str):
+            raise CommandError(f'Invalid JSON: key {key!r} is not a string.')
+        stream.expect(':')
+        if key == 'exercises':
+            yield from enumerate(stream.items(), start=1)
+        elif key == 'muscle_groups':
+            load_muscle_groups(stream.value())
+        else:
+            stream.value()
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise CommandError(
+                f'Invalid JSON: expected "," or "}}", found {separator!r}.')
+
+
+def iter_json(path, load_muscle_groups):
+    """Yield (entry, row) for each exercise of a JSON document.
+
+    The document is a list of exercises, or an object with ``exercises``
+    and ``muscle_groups`` lists. Exercises are streamed; the muscle group
+    list is read whole and handed to `load_muscle_groups` as soon as it
+    has been read.
+    """
+    with open(path, encoding='utf-8-sig') as file:
+        stream = JSONStream(file)
+        start = stream.peek()
+        if start == '[':
+            yield from enumerate(stream.items(), start=1)
+        elif start == '{':
+            yield from iter_json_object(stream, load_muscle_groups)
+        else:
+            raise CommandError('Expected a JSON list or object.')
+        if stream.peek():
+            raise CommandError('Invalid JSON: extra data after the document.')
+
+
+def iter_ndjson(path):
+    """Yield (line, row) for each non-blank line of an NDJSON file."""
+    with open(path, encoding='utf-8-sig') as file:
+        for line, content in enumerate(file, start=1):
+            if not content.strip():
+                continue
+            try:
+                yield line, json.loads(content)
+            except ValueError:
+                yield line, None
+
+
+def iter_csv(path):
+    """Yield (line, row) for each record of a CSV file with a header."""
+    with open(path, encoding='utf-8-sig', newline='') as file:
+        reader = csv.DictReader(file)
+        if reader.fieldnames is None or 'name' not in reader.fieldnames:
+            raise CommandError('The CSV header must include a "name" column.')
+        for row in reader:
+            yield reader.line_num, row
+
+
+def parse_exercise(row):
+    """Return (record, error) for one raw exercise row."""
+    if not isinstance(row, dict):
+        return None, 'expected an object'
+
+    name = str(row.get('name') or '').strip()
+    if not name:
+        return None, 'missing name'
+    if len(name) > Exercise._meta.get_field('name').max_length:
+        return None, 'name is too long'
+
+    muscles = row.get('target_muscles') or []
+    if isinstance(muscles, str):
+        muscles = muscles.split(MUSCLE_SEPARATOR)
+    muscles = list(dict.fromkeys(
+        str(muscle).strip() for muscle in muscles if str(muscle).strip()
+    ))
+    max_length = MuscleGroup._meta.get_field('name').max_length
+    if any(len(muscle) > max_length for muscle in muscles):
+        return None, 'target muscle name is too long'
+
+    return {
+        'name': name,
+        'description': str(row.get('description') or ''),
+        # Older catalog files used the singular key.
+        'instructions': str(
+            row.get('instructions') or row.get('instruction') or ''),
+        'muscles': muscles,
+    }, None
 
 
 class Command(BaseCommand):
+    """Upsert muscle groups and exercises from a catalog file."""
     help = (
-        'Resets and seeds the DB with predefined exercises and '
-        'target muscles.'
+        'Loads muscle groups and exercises from a JSON, NDJSON or CSV '
+        'catalog, matching existing rows by name. Defaults to the bundled '
+        'catalog.'
     )
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default=str(DEFAULT_CATALOG),
+            help='Catalog file (default: the bundled exercises.json).',
+        )
+        parser.add_argument(
+            '--format', choices=sorted(set(FORMATS.values())),
+            help='File format (default: from the file extension).',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Exercises to write per batch.',
+        )
 
-        # Clear existing data
-        Exercise.objects.all().delete()
-        MuscleGroup.objects.all().delete()
-        self.stdout.write(self.style.SUCCESS(
-            'Existing data cleared successfully!'))
-
-        target_muscles = [
-            {"name": "Chest", "description": "Muscles of the chest"},
-            {"name": "Back", "description": "Muscles of the back"},
-            {"name": "Arms", "description": "Muscles of the arms"},
-            {"name": "Shoulders", "description": "Muscles of the shoulders"},
-            {"name": "Legs", "description": "Muscles of the lower body"},
-            {"name": "Glutes", "description": "Muscles of the buttocks"},
-            {"name": "Core", "description": "Abs and lower back"},
-            {"name": "Traps", "description": "Upper back trapezius muscles"},
-            {"name": "Calves", "description": "Lower leg muscles"},
-            {"name": "Forearms", "description": "Forearm and wrist muscles"},
-        ]
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f'"{path}" is not a file.')
+        file_format = options['format'] or FORMATS.get(path.suffix.lower())
+        if file_format is None:
+            raise CommandError(
+                'Cannot tell the format from the extension, use --format.')
+
+        self.now = timezone.now()
+        self.counts = dict.fromkeys(
+            ('muscles_created', 'muscles_updated', 'created', 'updated',
+             'unchanged', 'skipped'), 0)
+
+        with transaction.atomic():
+            # Names are the natural key, so map them to the lowest id.
+            self.muscle_ids = {}
+            for pk, name in MuscleGroup.objects.order_by(
+                    '-id').values_list('id', 'name'):
+                self.muscle_ids[name] = pk
+            self.exercise_ids = {}
+            for pk, name in Exercise.objects.order_by(
+                    '-id').values_list('id', 'name'):
+                self.exercise_ids[name] = pk
+
+            if file_format == 'json':
+                rows = iter_json(path, self.load_muscle_groups)
+            elif file_format == 'ndjson':
+                rows = iter_ndjson(path)
+            else:
+                rows = iter_csv(path)
+
+            self.load_exercises(rows, options['batch_size'])
+
+            if any(self.counts[key] for key in (
+                'muscles_created', 'muscles_updated', 'created', 'updated'
+            )):
+                bump_catalog_version()
+                transaction.on_commit(bump_catalog_version)
 
-        for muscle_data in target_muscles:
-            MuscleGroup.objects.get_or_create(
-                name=muscle_data["name"],
-                defaults={"description": muscle_data["description"]}
-            )
+        counts = self.counts
         self.stdout.write(self.style.SUCCESS(
-            'Target muscles populated successfully!'))
-
-        exercises = [
-            {
-                "name": "Push-up",
-                "description": "Chest, shoulders, triceps exercise",
-                "instruction": "Lower and push up body",
-                "target_muscles": ["Chest", "Shoulders", "Arms"]
-            },
-            {
-                "name": "Squat",
-                "description": "exercise for thighs, hips, and buttocks",
-                "instruction": "Lower hips, then stand",
-                "target_muscles": ["Legs", "Glutes", "Core"]
-            },
-            {
-                "name": "Deadlift",
-                "description": "exercise for the back, glutes, and legs",
-                "instruction": "Lift bar, then lower",
-                "target_muscles": ["Back", "Legs", "Glutes"]
-            },
-            {
-                "name": "Bench Press",
-                "description": "exercise that targets shoulders and triceps",
-                "instruction": "Press bar up and down",
-                "target_muscles": ["Chest", "Shoulders", "Arms"]
-            },
-            {
-                "name": "Pull-up",
-                "description": "Upper-body exercise for back and biceps",
-                "instruction": "Pull up body",
-                "target_muscles": ["Back", "Arms"]
-            },
-            {
-                "name": "Overhead Press",
-                "description": "Shoulder exercise for triceps and upper chest",
-                "instruction": "Press weights overhead",
-                "target_muscles": ["Shoulders", "Arms"]
-            },
-            {
-                "name": "Lunge",
-                "description": "Lower-body exercise for legs and glutes",
-                "instruction": "Step forward, lower body",
-                "target_muscles": ["Legs", "Glutes"]
-            },
-            {
-                "name": "Leg Press",
-                "description": "exercise targets the legs and glutes",
-                "instruction": "Press platform with legs",
-                "target_muscles": ["Legs", "Glutes"]
-            },
-            {
-                "name": "Bicep Curl",
-                "description": "An exercise focusing on the biceps",
-                "instruction": "Curl weights up",
-                "target_muscles": ["Arms"]
-            },
-            {
-                "name": "Tricep Dip",
-                "description": "exercise targets triceps using bodyweight",
-                "instruction": "Dip body, then lift",
-                "target_muscles": ["Arms"]
-            },
-            {
-                "name": "Lat Pulldown",
-                "description": "A back exercise for biceps and shoulders",
-                "instruction": "Pull bar down to chest",
-                "target_muscles": ["Back", "Arms"]
-            },
-            {
-                "name": "Romanian Deadlift",
-                "description": "A hamstring-focused deadlift variation",
-                "instruction": "Lower bar to shin, then stand",
-                "target_muscles": ["Legs", "Glutes"]
-            },
-            {
-                "name": "Plank",
-                "description": "Core exercise for abs and lower back",
-                "instruction": "Hold body in line",
-                "target_muscles": ["Core"]
-            },
-            {
-                "name": "Russian Twist",
-                "description": "Rotational core exercise",
-                "instruction": "Twist torso side to side",
-                "target_muscles": ["Core"]
-            },
-            {
-                "name": "Mountain Climbers",
-                "description": "A full-body workout for the core and legs",
-                "instruction": "Run in place on hands",
-                "target_muscles": ["Core", "Legs"]
-            },
-            {
-                "name": "Dumbbell Rows",
-                "description": "A back exercise for upper back and biceps",
-                "instruction": "Row weights to waist",
-                "target_muscles": ["Back", "Arms"]
-            },
-            {
-                "name": "Chest Fly",
-                "description": "A chest exercise using dumbbells or cables",
-                "instruction": "Open and close arms",
-                "target_muscles": ["Chest"]
-            },
-            {
-                "name": "Calf Raise",
-                "description": "Calf exercise",
-                "instruction": "Raise and lower heels",
-                "target_muscles": ["Calves"]
-            },
-            {
-                "name": "Forearm Curl",
-                "description": "An exercise for forearms and wrist flexors",
-                "instruction": "Curl weights up",
-                "target_muscles": ["Forearms"]
-            },
-            {
-                "name": "Tricep Pushdown",
-                "description": "Tricep exercise with a cable machine",
-                "instruction": "Push bar down",
-                "target_muscles": ["Arms"]
-            }
+            f'Muscle groups: {counts["muscles_created"]} created, '
+            f'{counts["muscles_updated"]} updated. '
+            f'Exercises: {counts["created"]} created, '
+            f'{counts["updated"]} updated, {counts["unchanged"]} unchanged, '
+            f'{counts["skipped"]} skipped.'
+        ))
+
+    def load_muscle_groups(self, entries):
+        """Upsert the muscle groups listed in the catalog."""
+        descriptions = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise CommandError(f'Expected a muscle group: {entry!r}')
+            name = str(entry.get('name') or '').strip()
+            if not name:
+                raise CommandError(f'Muscle group without a name: {entry!r}')
+            descriptions[name] = str(entry.get('description') or '')
+
+        new = [name for name in descriptions if name not in self.muscle_ids]
+        self.counts['muscles_created'] += self.create_muscle_groups(
+            new, descriptions)
+
+        existing = [
+            (self.muscle_ids[name], description)
+            for name, description in descriptions.items() if name not in new
         ]
+        if existing:
+            with connection.cursor() as cursor:
+                cursor.execute(UPDATE_MUSCLE_GROUPS, [
+                    self.now,
+                    [pk for pk, _ in existing],
+                    [description for _, description in existing],
+                ])
+                self.counts['muscles_updated'] += cursor.rowcount
 
-        for exercise_data in exercises:
-            exercise, created = Exercise.objects.get_or_create(
-                name=exercise_data["name"],
-                description=exercise_data["description"],
-                instructions=exercise_data["instruction"]
-            )
+    def create_muscle_groups(self, names, descriptions=None):
+        """Insert muscle groups by name, record their ids, return a count."""
+        descriptions = descriptions or {}
+        created = MuscleGroup.objects.bulk_create([
+            MuscleGroup(name=name, description=descriptions.get(name, ''))
+            for name in names
+        ])
+        for muscle_group in created:
+            self.muscle_ids[muscle_group.name] = muscle_group.pk
+        return len(created)
 
-            target_muscles = MuscleGroup.objects.filter(
-                name__in=exercise_data["target_muscles"])
-            exercise.target_muscles.set(target_muscles)
+    def load_exercises(self, rows, batch_size):
+        """Parse the numbered rows and write them in batches."""
+        batch = {}
+        for line, row in rows:
+            record, error = parse_exercise(row)
+            if error:
+                self.counts['skipped'] += 1
+                self.stderr.write(f'Skipped entry {line}: {error}.')
+                continue
+            # A name repeated within the batch keeps its last definition.
+            batch[record['name']] = record
+            if len(batch) == batch_size:
+                self.write_batch(list(batch.values()))
+                batch = {}
+        if batch:
+            self.write_batch(list(batch.values()))
 
-            if created:
-                self.stdout.write(self.style.SUCCESS(
-                    f'Exercise "{exercise.name}" created successfully.'))
-            else:
-                self.stdout.write(self.style.SUCCESS(
-                    f'Exercise "{exercise.name}" already exists.'))
+    def write_batch(self, records):
+        """Upsert one batch of exercises and their target muscles."""
+        missing_muscles = {
+            muscle for record in records for muscle in record['muscles']
+            if muscle not in self.muscle_ids
+        }
+        self.counts['muscles_created'] += self.create_muscle_groups(
+            sorted(missing_muscles))
+        for record in records:
+            record['muscle_ids'] = sorted(
+                self.muscle_ids[muscle] for muscle in record['muscles'])
+            record['muscle_array'] = (
+                '{' + ','.join(map(str, record['muscle_ids'])) + '}')
+
+        new = [r for r in records if r['name'] not in self.exercise_ids]
+        existing = [r for r in records if r['name'] in self.exercise_ids]
+        changed = set()
+        with connection.cursor() as cursor:
+            if new:
+                cursor.execute(INSERT_EXERCISES, [
+                    self.now,
+                    [r['name'] for r in new],
+                    [r['description'] for r in new],
+                    [r['instructions'] for r in new],
+                    [r['muscle_array'] for r in new],
+                ])
+                for pk, name in cursor.fetchall():
+                    self.exercise_ids[name] = pk
+            if existing:
+                cursor.execute(UPDATE_EXERCISES, [
+                    self.now,
+                    [self.exercise_ids[r['name']] for r in existing],
+                    [r['description'] for r in existing],
+                    [r['instructions'] for r in existing],
+                    [r['muscle_array'] for r in existing],
+                ])
+                changed = {name for _, name in cursor.fetchall()}
+
+            self.link_target_muscles(cursor, new + [
+                r for r in existing if r['name'] in changed
+            ])
+
+        self.counts['created'] += len(new)
+        self.counts['updated'] += len(changed)
+        self.counts['unchanged'] += len(existing) - len(changed)
+
+    def link_target_muscles(self, cursor, records):
+        """Make the through table rows of `records` match the file."""
+        if not records:
+            return
+        table = Exercise.target_muscles.through._meta.db_table
+        exercise_ids = []
+        muscle_ids = []
+        for record in records:
+            pk = self.exercise_ids[record['name']]
+            exercise_ids += [pk] * len(record['muscle_ids'])
+            muscle_ids += record['muscle_ids']
+
+        cursor.execute(UNLINK_TARGET_MUSCLES.format(table=table), [
+            [self.exercise_ids[record['name']] for record in records],
+            exercise_ids,
+            muscle_ids,
+        ])
+        if exercise_ids:
+            cursor.execute(LINK_TARGET_MUSCLES.format(table=table),
+                           [exercise_ids, muscle_ids])
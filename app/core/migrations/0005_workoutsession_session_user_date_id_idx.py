@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_exercise_updated_at_musclegroup_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workoutsession',
+            index=models.Index(fields=['user', 'date', 'id'], name='session_user_date_id_idx'),
+        ),
+    ]
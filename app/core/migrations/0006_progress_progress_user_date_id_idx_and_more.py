@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_workoutsession_session_user_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workoutplan',
+            index=models.Index(fields=['user', 'name', 'id'], name='plan_user_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workoutplanexercise',
+            index=models.Index(fields=['workout_plan', 'id'], name='plan_exercise_plan_id_idx'),
+        ),
+    ]
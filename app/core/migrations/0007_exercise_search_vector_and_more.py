@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({row}name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}description, '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}instructions, '')), 'C')
+"""
+
+CREATE_TRIGGER = f"""
+CREATE FUNCTION core_exercise_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_exercise_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, instructions
+    ON core_exercise
+    FOR EACH ROW EXECUTE FUNCTION core_exercise_search_vector_update();
+
+UPDATE core_exercise SET search_vector = {SEARCH_VECTOR_SQL.format(row='')};
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS core_exercise_search_vector_trigger ON core_exercise;
+DROP FUNCTION IF EXISTS core_exercise_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_progress_progress_user_date_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted name/description/instructions, maintained by a database trigger', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='exercise_search_vector_idx'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
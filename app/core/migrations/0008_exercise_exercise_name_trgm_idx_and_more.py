@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:35
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_exercise_search_vector_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='exercise_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Upper('name'), 'C'), name='exercise_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='musclegroup',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='musclegroup_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='musclegroup',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Upper('name'), 'C'), name='musclegroup_name_prefix_idx'),
+        ),
+    ]
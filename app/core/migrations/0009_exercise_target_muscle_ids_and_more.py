@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:39
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+BACKFILL_TARGET_MUSCLE_IDS = """
+UPDATE core_exercise SET target_muscle_ids = ARRAY(
+    SELECT musclegroup_id FROM core_exercise_target_muscles
+    WHERE exercise_id = core_exercise.id
+    ORDER BY musclegroup_id
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_exercise_exercise_name_trgm_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='target_muscle_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), blank=True, default=list, editable=False, help_text='Sorted copy of the target_muscles ids, kept in sync by the m2m_changed signal', size=None),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['target_muscle_ids'], name='exercise_target_muscles_idx'),
+        ),
+        migrations.RunSQL(BACKFILL_TARGET_MUSCLE_IDS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,288 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Statement-level triggers turn each INSERT, UPDATE or DELETE into signed
+# per-bucket deltas read from the transition tables. They then upsert
+# those deltas into the rollups, so bulk writes cost one upsert per
+# touched bucket instead of one per row. Buckets whose counts fall to
+# zero are removed. The SQL is frozen here; core.rollups builds the
+# rebuild query from the same counters, and a change to either needs a
+# new migration that replaces the trigger functions.
+CREATE_TRIGGERS = """
+CREATE FUNCTION core_workoutsession_rollup() RETURNS trigger AS $$
+DECLARE
+    changes text := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT user_id, date, completed, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT user_id, date, completed, -1 AS sign FROM old_rows'
+        WHEN 'UPDATE' THEN
+            'SELECT user_id, date, completed, 1 AS sign FROM new_rows
+             UNION ALL SELECT user_id, date, completed, -1 FROM old_rows'
+    END;
+BEGIN
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        INSERT INTO core_weeklyrollup AS r
+            (user_id, week, sessions, completed_sessions, progress_entries,
+             weight_entries, weight_total, updated_at)
+        SELECT user_id, date_trunc('week', date::timestamp)::date,
+               sum(sign), coalesce(sum(sign) FILTER (WHERE completed), 0),
+               0, 0, 0, now()
+        FROM changes
+        GROUP BY 1, 2
+        HAVING sum(sign) <> 0
+            OR coalesce(sum(sign) FILTER (WHERE completed), 0) <> 0
+        ORDER BY 1, 2
+        ON CONFLICT (user_id, week) DO UPDATE
+        SET sessions = r.sessions + EXCLUDED.sessions,
+            completed_sessions =
+                r.completed_sessions + EXCLUDED.completed_sessions,
+            updated_at = EXCLUDED.updated_at
+    $sql$, changes);
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        DELETE FROM core_weeklyrollup AS r
+        USING changes
+        WHERE r.user_id = changes.user_id
+          AND r.week = date_trunc('week', date::timestamp)::date
+          AND r.sessions <= 0 AND r.progress_entries <= 0
+    $sql$, changes);
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        INSERT INTO core_monthlyrollup AS r
+            (user_id, month, sessions, completed_sessions, progress_entries,
+             weight_entries, weight_total, updated_at)
+        SELECT user_id, date_trunc('month', date::timestamp)::date,
+               sum(sign), coalesce(sum(sign) FILTER (WHERE completed), 0),
+               0, 0, 0, now()
+        FROM changes
+        GROUP BY 1, 2
+        HAVING sum(sign) <> 0
+            OR coalesce(sum(sign) FILTER (WHERE completed), 0) <> 0
+        ORDER BY 1, 2
+        ON CONFLICT (user_id, month) DO UPDATE
+        SET sessions = r.sessions + EXCLUDED.sessions,
+            completed_sessions =
+                r.completed_sessions + EXCLUDED.completed_sessions,
+            updated_at = EXCLUDED.updated_at
+    $sql$, changes);
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        DELETE FROM core_monthlyrollup AS r
+        USING changes
+        WHERE r.user_id = changes.user_id
+          AND r.month = date_trunc('month', date::timestamp)::date
+          AND r.sessions <= 0 AND r.progress_entries <= 0
+    $sql$, changes);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_workoutsession_rollup_insert
+    AFTER INSERT ON core_workoutsession
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_workoutsession_rollup();
+CREATE TRIGGER core_workoutsession_rollup_update
+    AFTER UPDATE ON core_workoutsession
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_workoutsession_rollup();
+CREATE TRIGGER core_workoutsession_rollup_delete
+    AFTER DELETE ON core_workoutsession
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_workoutsession_rollup();
+
+CREATE FUNCTION core_progress_rollup() RETURNS trigger AS $$
+DECLARE
+    changes text := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT user_id, date, weight, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT user_id, date, weight, -1 AS sign FROM old_rows'
+        WHEN 'UPDATE' THEN
+            'SELECT user_id, date, weight, 1 AS sign FROM new_rows
+             UNION ALL SELECT user_id, date, weight, -1 FROM old_rows'
+    END;
+BEGIN
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        INSERT INTO core_weeklyrollup AS r
+            (user_id, week, sessions, completed_sessions, progress_entries,
+             weight_entries, weight_total, updated_at)
+        SELECT user_id, date_trunc('week', date::timestamp)::date, 0, 0,
+               sum(sign),
+               coalesce(sum(sign) FILTER (WHERE weight IS NOT NULL), 0),
+               coalesce(sum(sign * weight), 0), now()
+        FROM changes
+        GROUP BY 1, 2
+        HAVING sum(sign) <> 0
+            OR coalesce(sum(sign) FILTER (WHERE weight IS NOT NULL), 0) <> 0
+            OR coalesce(sum(sign * weight), 0) <> 0
+        ORDER BY 1, 2
+        ON CONFLICT (user_id, week) DO UPDATE
+        SET progress_entries = r.progress_entries + EXCLUDED.progress_entries,
+            weight_entries = r.weight_entries + EXCLUDED.weight_entries,
+            weight_total = r.weight_total + EXCLUDED.weight_total,
+            updated_at = EXCLUDED.updated_at
+    $sql$, changes);
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        DELETE FROM core_weeklyrollup AS r
+        USING changes
+        WHERE r.user_id = changes.user_id
+          AND r.week = date_trunc('week', date::timestamp)::date
+          AND r.sessions <= 0 AND r.progress_entries <= 0
+    $sql$, changes);
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        INSERT INTO core_monthlyrollup AS r
+            (user_id, month, sessions, completed_sessions, progress_entries,
+             weight_entries, weight_total, updated_at)
+        SELECT user_id, date_trunc('month', date::timestamp)::date, 0, 0,
+               sum(sign),
+               coalesce(sum(sign) FILTER (WHERE weight IS NOT NULL), 0),
+               coalesce(sum(sign * weight), 0), now()
+        FROM changes
+        GROUP BY 1, 2
+        HAVING sum(sign) <> 0
+            OR coalesce(sum(sign) FILTER (WHERE weight IS NOT NULL), 0) <> 0
+            OR coalesce(sum(sign * weight), 0) <> 0
+        ORDER BY 1, 2
+        ON CONFLICT (user_id, month) DO UPDATE
+        SET progress_entries = r.progress_entries + EXCLUDED.progress_entries,
+            weight_entries = r.weight_entries + EXCLUDED.weight_entries,
+            weight_total = r.weight_total + EXCLUDED.weight_total,
+            updated_at = EXCLUDED.updated_at
+    $sql$, changes);
+    EXECUTE format($sql$
+        WITH changes AS (%s)
+        DELETE FROM core_monthlyrollup AS r
+        USING changes
+        WHERE r.user_id = changes.user_id
+          AND r.month = date_trunc('month', date::timestamp)::date
+          AND r.sessions <= 0 AND r.progress_entries <= 0
+    $sql$, changes);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_progress_rollup_insert
+    AFTER INSERT ON core_progress
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_progress_rollup();
+CREATE TRIGGER core_progress_rollup_update
+    AFTER UPDATE ON core_progress
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_progress_rollup();
+CREATE TRIGGER core_progress_rollup_delete
+    AFTER DELETE ON core_progress
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION core_progress_rollup();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS core_workoutsession_rollup_insert ON core_workoutsession;
+DROP TRIGGER IF EXISTS core_workoutsession_rollup_update ON core_workoutsession;
+DROP TRIGGER IF EXISTS core_workoutsession_rollup_delete ON core_workoutsession;
+DROP FUNCTION IF EXISTS core_workoutsession_rollup();
+DROP TRIGGER IF EXISTS core_progress_rollup_insert ON core_progress;
+DROP TRIGGER IF EXISTS core_progress_rollup_update ON core_progress;
+DROP TRIGGER IF EXISTS core_progress_rollup_delete ON core_progress;
+DROP FUNCTION IF EXISTS core_progress_rollup();
+"""
+
+# Existing sessions and progress are counted once, after the triggers are
+# in place. Creating the triggers locks both tables against writes until
+# the migration commits, so no write is counted twice or missed.
+BACKFILL = """
+INSERT INTO core_weeklyrollup (
+    user_id, week, sessions, completed_sessions, progress_entries,
+    weight_entries, weight_total, updated_at
+)
+SELECT user_id, bucket, sum(sessions), sum(completed_sessions),
+       sum(progress_entries), sum(weight_entries), sum(weight_total), now()
+FROM (
+    SELECT user_id, date_trunc('week', date::timestamp)::date AS bucket,
+           count(*) AS sessions,
+           count(*) FILTER (WHERE completed) AS completed_sessions,
+           0 AS progress_entries, 0 AS weight_entries, 0 AS weight_total
+    FROM core_workoutsession
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT user_id, date_trunc('week', date::timestamp)::date,
+           0, 0, count(*), count(weight), coalesce(sum(weight), 0)
+    FROM core_progress
+    GROUP BY 1, 2
+) AS totals
+GROUP BY 1, 2;
+
+INSERT INTO core_monthlyrollup (
+    user_id, month, sessions, completed_sessions, progress_entries,
+    weight_entries, weight_total, updated_at
+)
+SELECT user_id, bucket, sum(sessions), sum(completed_sessions),
+       sum(progress_entries), sum(weight_entries), sum(weight_total), now()
+FROM (
+    SELECT user_id, date_trunc('month', date::timestamp)::date AS bucket,
+           count(*) AS sessions,
+           count(*) FILTER (WHERE completed) AS completed_sessions,
+           0 AS progress_entries, 0 AS weight_entries, 0 AS weight_total
+    FROM core_workoutsession
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT user_id, date_trunc('month', date::timestamp)::date,
+           0, 0, count(*), count(weight), coalesce(sum(weight), 0)
+    FROM core_progress
+    GROUP BY 1, 2
+) AS totals
+GROUP BY 1, 2;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_exercise_target_muscle_ids_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sessions', models.IntegerField(default=0)),
+                ('completed_sessions', models.IntegerField(default=0)),
+                ('progress_entries', models.IntegerField(default=0)),
+                ('weight_entries', models.IntegerField(default=0)),
+                ('weight_total', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('week', models.DateField(help_text='Monday of the ISO week')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'week')},
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sessions', models.IntegerField(default=0)),
+                ('completed_sessions', models.IntegerField(default=0)),
+                ('progress_entries', models.IntegerField(default=0)),
+                ('weight_entries', models.IntegerField(default=0)),
+                ('weight_total', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'month')},
+            },
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
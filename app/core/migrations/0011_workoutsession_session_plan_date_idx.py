@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_weeklyrollup_monthlyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='workoutsession',
+            index=models.Index(fields=['workout_plan', 'date'], name='session_plan_date_idx'),
+        ),
+    ]
@@ -2,7 +2,11 @@
 Database models.
 """
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Collate, Upper
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -47,6 +51,19 @@ class User(AbstractBaseUser, PermissionsMixin):
 class MuscleGroup(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(Upper('name'), name='gin_trgm_ops'),
+                name='musclegroup_name_trgm_idx',
+            ),
+            models.Index(
+                Collate(Upper('name'), 'C'),
+                name='musclegroup_name_prefix_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -57,6 +74,37 @@ class Exercise(models.Model):
     description = models.TextField()
     instructions = models.TextField()
     target_muscles = models.ManyToManyField(MuscleGroup)
+    target_muscle_ids = ArrayField(
+        models.BigIntegerField(), default=list, blank=True, editable=False,
+        help_text="Sorted copy of the target_muscles ids, "
+        "kept in sync by the m2m_changed signal"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(
+        null=True, editable=False,
+        help_text="Weighted name/description/instructions, "
+        "maintained by a database trigger"
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=['search_vector'],
+                name='exercise_search_vector_idx',
+            ),
+            GinIndex(
+                fields=['target_muscle_ids'],
+                name='exercise_target_muscles_idx',
+            ),
+            GinIndex(
+                OpClass(Upper('name'), name='gin_trgm_ops'),
+                name='exercise_name_trgm_idx',
+            ),
+            models.Index(
+                Collate(Upper('name'), 'C'),
+                name='exercise_name_prefix_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -77,6 +125,15 @@ class WorkoutPlan(models.Model):
         null=True, blank=True,
         help_text="Duration of each session"
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'name', 'id'],
+                name='plan_user_name_id_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.frequency}/week)"
@@ -96,6 +153,15 @@ class WorkoutPlanExercise(models.Model):
         help_text="Duration (e.g., 1 hour, 30 minutes)"
     )
     distance = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['workout_plan', 'id'],
+                name='plan_exercise_plan_id_idx',
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -114,6 +180,19 @@ class WorkoutSession(models.Model):
     )
     date = models.DateField()
     completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'date', 'id'],
+                name='session_user_date_id_idx',
+            ),
+            models.Index(
+                fields=['workout_plan', 'date'],
+                name='session_plan_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.name} - {self.workout_plan.name} ({self.date})"
@@ -127,9 +206,59 @@ class Progress(models.Model):
     date = models.DateField(default=timezone.now)
     weight = models.FloatField(null=True, blank=True)
     notes = models.TextField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('user', 'date')
 
     def __str__(self):
         return f"Progress of {self.user.name} on {self.date}"
+
+
+class Rollup(models.Model):
+    """Per-user totals for one period, kept current by database triggers."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Plain integers: a trigger may briefly push a row below zero while a
+    # cascade deletes it.
+    sessions = models.IntegerField(default=0)
+    completed_sessions = models.IntegerField(default=0)
+    progress_entries = models.IntegerField(default=0)
+    weight_entries = models.IntegerField(default=0)
+    weight_total = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def completion_rate(self):
+        if not self.sessions:
+            return None
+        return self.completed_sessions / self.sessions
+
+    @property
+    def average_weight(self):
+        if not self.weight_entries:
+            return None
+        return self.weight_total / self.weight_entries
+
+
+class WeeklyRollup(Rollup):
+    week = models.DateField(help_text="Monday of the ISO week")
+
+    class Meta:
+        unique_together = ('user', 'week')
+
+    def __str__(self):
+        return f"{self.user.name} - week of {self.week}"
+
+
+class MonthlyRollup(Rollup):
+    month = models.DateField(help_text="First day of the month")
+
+    class Meta:
+        unique_together = ('user', 'month')
+
+    def __str__(self):
+        return f"{self.user.name} - {self.month:%B %Y}"
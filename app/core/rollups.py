@@ -0,0 +1,74 @@
+"""
+SQL for the weekly and monthly rollups of sessions and progress.
+
+The counters are aggregates over signed rows: +1 for a row that was
+added, -1 for one that was removed. The triggers of migration 0010 apply
+them to the rows of each write, read from the transition tables.
+``rebuild_sql`` applies the same ``SOURCES`` aggregates to every stored
+row of a set of users, each counted as added. The trigger SQL is frozen
+in the migration, so a change to a counter here needs a new migration
+that replaces the trigger functions too.
+"""
+
+SOURCES = {
+    'core_workoutsession': {
+        'columns': 'user_id, date, completed',
+        'deltas': {
+            'sessions': 'sum(sign)',
+            'completed_sessions':
+                'coalesce(sum(sign) FILTER (WHERE completed), 0)',
+        },
+    },
+    'core_progress': {
+        'columns': 'user_id, date, weight',
+        'deltas': {
+            'progress_entries': 'sum(sign)',
+            'weight_entries':
+                'coalesce(sum(sign) FILTER (WHERE weight IS NOT NULL), 0)',
+            'weight_total': 'coalesce(sum(sign * weight), 0)',
+        },
+    },
+}
+
+ROLLUPS = {
+    'core_weeklyrollup': 'week',
+    'core_monthlyrollup': 'month',
+}
+
+COUNTERS = [
+    'sessions', 'completed_sessions', 'progress_entries', 'weight_entries',
+    'weight_total',
+]
+
+
+def bucket(period):
+    """Return the SQL for the first day of the `period` holding `date`."""
+    return f"date_trunc('{period}', date::timestamp)::date"
+
+
+def rebuild_sql(table, period):
+    """Return the SQL that fills `table` for the users in ``%s``.
+
+    Takes the user ids once per source table.
+    """
+    totals = []
+    for source, spec in SOURCES.items():
+        deltas = spec['deltas']
+        values = ', '.join(
+            f'{deltas.get(counter, "0")} AS {counter}'
+            for counter in COUNTERS
+        )
+        totals.append(f"""
+    SELECT user_id, {bucket(period)} AS bucket, {values}
+    FROM (SELECT {spec['columns']}, 1 AS sign FROM {source}
+          WHERE user_id = ANY(%s)) AS changes
+    GROUP BY 1, 2""")
+    totals = '\n    UNION ALL'.join(totals)
+    sums = ', '.join(f'sum({counter})' for counter in COUNTERS)
+    return f"""
+INSERT INTO {table} (user_id, {period}, {', '.join(COUNTERS)}, updated_at)
+SELECT user_id, bucket, {sums}, now()
+FROM ({totals}
+) AS totals
+GROUP BY 1, 2
+"""
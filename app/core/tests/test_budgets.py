@@ -0,0 +1,113 @@
+"""
+Tests for query budgets.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework.test import APIClient
+
+from core.budgets import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    get_query_budget,
+    query_budget,
+    sql_shape,
+)
+from core.models import Exercise, MuscleGroup
+from workout.catalog import clear_catalog_cache
+from workout.management.commands.benchmark_endpoints import QueryTimer
+from workout.views import MuscleGroupViewSet
+
+
+class QueryBudgetTests(TestCase):
+    """Test the query budget helper."""
+
+    def setUp(self):
+        muscle_group = MuscleGroup.objects.create(name='Back')
+        for index in range(3):
+            exercise = Exercise.objects.create(name=f'Row {index}')
+            exercise.target_muscles.add(muscle_group)
+
+    def test_shape_collapses_placeholder_lists(self):
+        """Test IN lists of any length share one shape."""
+        self.assertEqual(
+            sql_shape('SELECT *\n  FROM t WHERE id IN (%s, %s,  %s)'),
+            'SELECT * FROM t WHERE id IN (%s, ...)',
+        )
+
+    def test_budget_reports_repeated_shapes(self):
+        """Test an N+1 fails the budget and names the repeated query."""
+        with self.assertRaises(QueryBudgetExceeded) as context:
+            with query_budget(2, 'Muscle names'):
+                for exercise in Exercise.objects.all():
+                    list(exercise.target_muscles.all())
+
+        message = str(context.exception)
+        self.assertIn('Muscle names ran 4 queries, budget is 2.', message)
+        self.assertIn('3x SELECT "core_musclegroup"', message)
+
+    def test_budget_met_with_prefetch(self):
+        """Test prefetching brings the same loop within budget."""
+        with query_budget(2) as recorder:
+            for exercise in Exercise.objects.prefetch_related(
+                    'target_muscles'):
+                list(exercise.target_muscles.all())
+
+        self.assertEqual(recorder.duplicates(), [])
+
+    def test_savepoints_not_counted(self):
+        """Test budgets and benchmarks both leave savepoints out."""
+        timer = QueryTimer()
+        with query_budget(1) as recorder:
+            with connection.execute_wrapper(timer), transaction.atomic():
+                list(MuscleGroup.objects.all())
+
+        self.assertEqual(len(recorder.statements), 1)
+        self.assertEqual(timer.count, 1)
+
+    def test_head_uses_get_action(self):
+        """Test HEAD requests are held to the budget of the GET action."""
+        view = resolve(reverse('workout:muscle-group-list')).func
+
+        self.assertEqual(
+            get_query_budget(view, 'HEAD'),
+            ('MuscleGroupViewSet.list', MuscleGroupViewSet.query_budgets[
+                'list']),
+        )
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    """Test the query budget middleware."""
+
+    def setUp(self):
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create_user(
+            'user@example.com', 'testpass123'))
+
+    @override_settings(QUERY_BUDGET_MODE=None)
+    def test_disabled(self):
+        """Test the middleware removes itself when the mode is None."""
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryBudgetMiddleware(lambda request: None)
+
+    @override_settings(QUERY_BUDGET_MODE='warn')
+    def test_warns_over_budget(self):
+        """Test an action over its budget is logged, not failed."""
+        with mock.patch.dict(MuscleGroupViewSet.query_budgets, {'list': 0}):
+            with self.assertLogs('core.budgets', 'WARNING') as logs:
+                res = self.client.get(reverse('workout:muscle-group-list'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('MuscleGroupViewSet.list ran', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_raises_over_budget(self):
+        """Test an action over its budget fails in raise mode."""
+        with mock.patch.dict(MuscleGroupViewSet.query_budgets, {'list': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('workout:muscle-group-list'))
@@ -1,13 +1,30 @@
 """
 Test custom Django management commands.
 """
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import (
+    Exercise,
+    MuscleGroup,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+)
+from workout.catalog import get_catalog_version
 
 
 @patch('core.management.commands.wait_for_db.Command.check')
@@ -32,3 +49,167 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class PopulateExercisesCommandTests(TestCase):
+    """Test loading the exercise catalog."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write(self, name, content):
+        """Write a catalog file and return its path."""
+        path = self.directory / name
+        path.write_text(content)
+        return str(path)
+
+    def load(self, *args, **kwargs):
+        """Run the command quietly and return its output."""
+        out = StringIO()
+        call_command('populate_exercises', *args, stdout=out,
+                     stderr=StringIO(), **kwargs)
+        return out.getvalue()
+
+    def assert_target_muscle_ids_in_sync(self):
+        """Check the denormalized ids match the through table."""
+        for exercise in Exercise.objects.prefetch_related('target_muscles'):
+            self.assertEqual(
+                exercise.target_muscle_ids,
+                sorted(m.id for m in exercise.target_muscles.all()),
+            )
+
+    def test_load_bundled_catalog(self):
+        """Test the bundled catalog loads and reloads without changes."""
+        out = self.load()
+
+        self.assertIn('20 created', out)
+        self.assertEqual(MuscleGroup.objects.count(), 10)
+        bench = Exercise.objects.get(name='Bench Press')
+        self.assertEqual(
+            sorted(bench.target_muscles.values_list('name', flat=True)),
+            ['Arms', 'Chest', 'Shoulders'],
+        )
+        self.assert_target_muscle_ids_in_sync()
+
+        self.assertIn('0 updated, 20 unchanged', self.load())
+        self.assertEqual(Exercise.objects.count(), 20)
+
+    def test_reload_keeps_plan_exercises(self):
+        """Test referenced exercises survive a reload with new text."""
+        exercise = Exercise.objects.create(
+            name='Plank', description='Old', instructions='Old')
+        user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123')
+        plan = WorkoutPlan.objects.create(
+            user=user, name='Core', frequency=3, goal='Abs',
+            duration_per_session=timedelta(minutes=30))
+        WorkoutPlanExercise.objects.create(
+            workout_plan=plan, exercise=exercise)
+
+        self.load()
+
+        exercise.refresh_from_db()
+        self.assertEqual(exercise.description,
+                         'Core exercise for abs and lower back')
+        self.assertTrue(WorkoutPlanExercise.objects.filter(
+            exercise=exercise).exists())
+
+    def test_csv_upsert(self):
+        """Test CSV rows create muscles, relink and skip invalid rows."""
+        kept = Exercise.objects.create(
+            name='Kept', description='Not in the file', instructions='')
+        path = self.write('catalog.csv', (
+            'name,description,instructions,target_muscles\n'
+            'Bench Press,,Press bar up and down,Chest;Triceps\n'
+            ',Nameless,,Chest\n'
+        ))
+        self.load(path)
+        version = get_catalog_version()
+
+        path = self.write('catalog.csv', (
+            'name,description,instructions,target_muscles\n'
+            'Bench Press,Flat bench,Press bar up and down,Chest\n'
+        ))
+        out = self.load(path)
+
+        self.assertIn('1 updated', out)
+        self.assertGreater(get_catalog_version(), version)
+        bench = Exercise.objects.get(name='Bench Press')
+        self.assertEqual(bench.description, 'Flat bench')
+        self.assertEqual(
+            list(bench.target_muscles.values_list('name', flat=True)),
+            ['Chest'],
+        )
+        self.assertTrue(MuscleGroup.objects.filter(name='Triceps').exists())
+        self.assertTrue(Exercise.objects.filter(pk=kept.pk).exists())
+        self.assertFalse(Exercise.objects.filter(name='').exists())
+        self.assert_target_muscle_ids_in_sync()
+
+    def test_ndjson_queries_do_not_grow_with_rows(self):
+        """Test each batch is written with a fixed number of statements."""
+        def query_count(rows):
+            lines = [
+                json.dumps({'name': f'{rows} {i}',
+                            'target_muscles': ['Chest', 'Back']})
+                for i in range(rows)
+            ]
+            path = self.write(f'{rows}.ndjson', '\n'.join(lines))
+            with CaptureQueriesContext(connection) as queries:
+                self.load(path, batch_size=1000)
+            return len(queries)
+
+        query_count(1)
+        self.assertEqual(query_count(10), query_count(200))
+        self.assertEqual(Exercise.objects.count(), 211)
+        self.assert_target_muscle_ids_in_sync()
+
+    @patch('core.management.commands.populate_exercises.CHUNK_SIZE', 7)
+    def test_json_read_in_chunks(self):
+        """Test a JSON catalog is streamed across chunk boundaries."""
+        catalog = {
+            'version': 1.25,
+            'exercises': [
+                {'name': f'Curl {i}', 'description': 'Biceps curl ' * i,
+                 'target_muscles': ['Biceps']}
+                for i in range(1, 30)
+            ] + [{'description': 'no name'}],
+            'muscle_groups': [{'name': 'Biceps', 'description': 'Arms'}],
+        }
+        path = self.write('catalog.json', json.dumps(catalog, indent=2))
+
+        out = self.load(path, batch_size=10)
+
+        self.assertIn('29 created', out)
+        self.assertIn('1 skipped', out)
+        self.assertEqual(
+            Exercise.objects.get(name='Curl 3').description,
+            'Biceps curl ' * 3)
+        self.assertEqual(
+            MuscleGroup.objects.get(name='Biceps').description, 'Arms')
+        self.assert_target_muscle_ids_in_sync()
+
+        path = self.write('list.json', json.dumps(catalog['exercises']))
+        self.assertIn('29 unchanged', self.load(path))
+
+    def test_invalid_json(self):
+        """Test malformed JSON fails without writing anything."""
+        for content in ('[{"name": "Curl"},', '[{"name": "Curl"}] []',
+                        '{"exercises": [{"name": "Curl"}] "x": 1}'):
+            with self.subTest(content=content):
+                path = self.write('broken.json', content)
+
+                with self.assertRaises(CommandError):
+                    self.load(path)
+
+                self.assertFalse(Exercise.objects.exists())
+
+    def test_unknown_format(self):
+        """Test a file with an unknown extension needs --format."""
+        path = self.write('catalog.txt', '[]')
+
+        with self.assertRaises(CommandError):
+            self.load(path)
+
+        self.load(path, format='json')
@@ -0,0 +1,62 @@
+"""
+Tests for data migrations.
+"""
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+BEFORE = [('core', '0009_exercise_target_muscle_ids_and_more')]
+AFTER = [('core', '0010_weeklyrollup_monthlyrollup')]
+
+
+class RollupBackfillMigrationTests(TransactionTestCase):
+    """Test migration 0010 fills the rollups from existing rows."""
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        self.latest = executor.loader.graph.leaf_nodes('core')
+        executor.migrate(BEFORE)
+        apps = executor.loader.project_state(BEFORE).apps
+        user = apps.get_model('core', 'User').objects.create(
+            email='user@example.com', name='User')
+        plan = apps.get_model('core', 'WorkoutPlan').objects.create(
+            user=user, name='Full Body', frequency=3, goal='Strength')
+        apps.get_model('core', 'WorkoutSession').objects.bulk_create([
+            apps.get_model('core', 'WorkoutSession')(
+                user=user, workout_plan=plan, date=date(2025, 1, day),
+                completed=day % 2 == 0)
+            for day in (6, 7, 8)
+        ])
+        apps.get_model('core', 'Progress').objects.bulk_create([
+            apps.get_model('core', 'Progress')(
+                user=user, date=date(2025, 1, day), weight=weight)
+            for day, weight in ((6, 80), (7, None), (31, 79))
+        ])
+        self.user_id = user.pk
+
+    def tearDown(self):
+        MigrationExecutor(connection).migrate(self.latest)
+
+    def test_backfills_existing_rows(self):
+        """Test sessions and progress written before 0010 are counted."""
+        executor = MigrationExecutor(connection)
+        executor.migrate(AFTER)
+        apps = executor.loader.project_state(AFTER).apps
+
+        weekly = apps.get_model('core', 'WeeklyRollup').objects.get(
+            user_id=self.user_id, week=date(2025, 1, 6))
+        self.assertEqual(
+            (weekly.sessions, weekly.completed_sessions,
+             weekly.progress_entries, weekly.weight_entries,
+             weekly.weight_total),
+            (3, 2, 2, 1, 80),
+        )
+        monthly = apps.get_model('core', 'MonthlyRollup').objects.get(
+            user_id=self.user_id, month=date(2025, 1, 1))
+        self.assertEqual(
+            (monthly.sessions, monthly.progress_entries,
+             monthly.weight_total),
+            (3, 3, 159),
+        )
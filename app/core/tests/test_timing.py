@@ -0,0 +1,77 @@
+"""
+Tests for the Server-Timing middleware.
+"""
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.models import WorkoutPlan
+from core.timing import ServerTimingMiddleware
+
+PLANS_URL = reverse('workout:workout-plan-list')
+
+
+def parse_server_timing(header):
+    """Return {name: (duration, description)} from a Server-Timing header."""
+    entries = {}
+    for entry in header.split(', '):
+        name, *params = entry.split(';')
+        params = dict(param.split('=', 1) for param in params)
+        entries[name] = (float(params['dur']), params.get('desc'))
+    return entries
+
+
+class ServerTimingMiddlewareTests(TestCase):
+    """Test the Server-Timing middleware."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123')
+        WorkoutPlan.objects.create(
+            user=user, name='Full Body', frequency=3, goal='Strength')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=(
+            f'Bearer {RefreshToken.for_user(user).access_token}'))
+
+    @override_settings(SERVER_TIMING=False, SERVER_TIMING_LOG_RATE=0)
+    def test_disabled(self):
+        """Test the middleware removes itself unless it is opted into."""
+        with self.assertRaises(MiddlewareNotUsed):
+            ServerTimingMiddleware(lambda request: None)
+
+        res = self.client.get(PLANS_URL)
+
+        self.assertNotIn('Server-Timing', res)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_header_reports_phases(self):
+        """Test each phase of an authenticated list is in the header."""
+        res = self.client.get(PLANS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        timings = parse_server_timing(res['Server-Timing'])
+        self.assertEqual(
+            list(timings), ['auth', 'db', 'serialize', 'render', 'total'])
+        for name in ('auth', 'db', 'serialize', 'render'):
+            self.assertGreater(timings[name][0], 0, name)
+            self.assertLessEqual(timings[name][0], timings['total'][0])
+        self.assertRegex(timings['db'][1], r'^"\d+ queries"$')
+
+    @override_settings(SERVER_TIMING=False, SERVER_TIMING_LOG_RATE=1.0)
+    def test_sampled_log_line(self):
+        """Test a sampled request is logged as one JSON line."""
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            res = self.client.get(PLANS_URL)
+
+        self.assertNotIn('Server-Timing', res)
+        record = json.loads(re.sub(r'^INFO:core.timing:', '', logs.output[0]))
+        self.assertEqual(record['view'], 'workout:workout-plan-list')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['serialize_ms'], 0)
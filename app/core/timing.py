@@ -0,0 +1,155 @@
+"""
+Per-request timing of JWT authentication, SQL, serialization and rendering.
+
+``ServerTimingMiddleware`` is opt-in. With ``SERVER_TIMING`` on, every
+response carries a ``Server-Timing`` header. With
+``SERVER_TIMING_LOG_RATE`` above zero, that share of requests is also
+logged as one JSON line. With both off the middleware removes itself at
+startup and nothing is instrumented.
+
+SQL is timed with a database execute wrapper. Authentication and
+serialization are timed by wrapping ``JWTAuthentication.authenticate``
+and ``BaseSerializer.data``, once, the first time the middleware is
+enabled. The wrappers do nothing outside a timed request. Rendering is
+the time between ``process_template_response`` and the response coming
+back, which is when Django renders DRF responses. SQL overlaps the other
+phases: the user lookup runs during authentication, for example. The
+header is sent before a streaming response is consumed, so it does not
+include the streaming itself.
+"""
+import functools
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from rest_framework.serializers import BaseSerializer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+PHASES = ('auth', 'db', 'serialize', 'render')
+
+_current = ContextVar('server_timing', default=None)
+_installed = False
+
+
+class RequestTimer:
+    """Accumulated seconds per phase for one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.active = set()
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent in the block to `name`, outermost call only."""
+        if name in self.active:
+            yield
+            return
+        self.active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+            self.active.discard(name)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        with self.phase('db'):
+            return execute(sql, params, many, context)
+
+    def durations(self):
+        """Return the phase and total durations in milliseconds."""
+        total = time.perf_counter() - self.started
+        return {
+            **{name: seconds * 1000 for name, seconds in self.seconds.items()},
+            'total': total * 1000,
+        }
+
+    def header(self):
+        """Return the Server-Timing header value."""
+        entries = []
+        for name, ms in self.durations().items():
+            entry = f'{name};dur={ms:.2f}'
+            if name == 'db':
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+
+def timed(name, method):
+    """Wrap `method` so it counts towards phase `name` of the request."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        timer = _current.get()
+        if timer is None:
+            return method(*args, **kwargs)
+        with timer.phase(name):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def install():
+    """Wrap authentication and serialization, once per process."""
+    global _installed
+    if _installed:
+        return
+    JWTAuthentication.authenticate = timed(
+        'auth', JWTAuthentication.authenticate)
+    BaseSerializer.data = property(
+        timed('serialize', BaseSerializer.data.fget))
+    _installed = True
+
+
+class ServerTimingMiddleware:
+    """Measure request phases and report them in a header or the log."""
+
+    def __init__(self, get_response):
+        self.header = getattr(settings, 'SERVER_TIMING', False)
+        self.log_rate = getattr(settings, 'SERVER_TIMING_LOG_RATE', 0.0)
+        if not self.header and not self.log_rate:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            with connection.execute_wrapper(timer):
+                response = self.get_response(request)
+            rendering = getattr(request, '_render_started', None)
+            if rendering is not None:
+                timer.seconds['render'] += time.perf_counter() - rendering
+        finally:
+            _current.reset(token)
+
+        if self.header:
+            response['Server-Timing'] = timer.header()
+        if self.log_rate and random.random() < self.log_rate:
+            match = request.resolver_match
+            logger.info(json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'queries': timer.queries,
+                **{
+                    f'{name}_ms': round(ms, 2)
+                    for name, ms in timer.durations().items()
+                },
+            }))
+        return response
+
+    def process_template_response(self, request, response):
+        request._render_started = time.perf_counter()
+        return response
@@ -23,11 +23,9 @@ class UserSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """Update and return user."""
         password = validated_data.pop('password', None)
-        user = super().update(instance, validated_data)
         if password:
-            user.set_password(password)
-            user.save()
-        return user
+            instance.set_password(password)
+        return super().update(instance, validated_data)
 
 
 class AuthTokenSerializer(serializers.Serializer):
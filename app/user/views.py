@@ -14,6 +14,7 @@ from drf_spectacular.utils import extend_schema
 class CreateUserView(generics.CreateAPIView):
     """Create a new user in the system."""
     serializer_class = UserSerializer
+    query_budgets = {'post': 4}
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -32,6 +33,7 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'get': 1, 'put': 3, 'patch': 2}
 
     def get_object(self):
         """Retrieve and return the authenticated user."""
@@ -39,6 +41,8 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
 
 
 class LogoutView(APIView):
+    query_budgets = {'post': 5}
+
     @extend_schema(
         request=LogoutSerializer,
         responses={
@@ -0,0 +1,90 @@
+"""
+Plan adherence: completed sessions against the weekly target.
+
+One query buckets the sessions by ISO week and fills in weeks with no
+sessions. It then scores each week against the summed frequency of the
+plans in scope and derives the rolling percentage and the streak with
+window functions. Completions above the target do not count towards the
+rolling percentage, so one busy week cannot make up for a missed one.
+The current week is never counted as a miss while it is still under way.
+"""
+from django.db import connection
+from django.utils import timezone
+
+ADHERENCE_SQL = """
+WITH target AS (
+    SELECT coalesce(sum(frequency), 0) AS target
+    FROM core_workoutplan
+    WHERE user_id = %(user)s AND (%(plan)s::bigint IS NULL OR id = %(plan)s)
+),
+totals AS (
+    SELECT date_trunc('week', date::timestamp)::date AS week,
+           count(*) FILTER (WHERE completed) AS completed,
+           count(*) AS scheduled
+    FROM core_workoutsession
+    WHERE user_id = %(user)s
+      AND (%(plan)s::bigint IS NULL OR workout_plan_id = %(plan)s)
+      AND date <= %(today)s
+    GROUP BY 1
+),
+weekly AS (
+    SELECT weeks.week::date AS week, target.target,
+           coalesce(totals.completed, 0) AS completed,
+           coalesce(totals.scheduled, 0) AS scheduled
+    FROM generate_series(
+        (SELECT min(week) FROM totals)::timestamp,
+        date_trunc('week', %(today)s::timestamp),
+        interval '1 week'
+    ) AS weeks (week)
+    CROSS JOIN target
+    LEFT JOIN totals ON totals.week = weeks.week::date
+),
+scored AS (
+    SELECT *,
+           completed >= target AS met,
+           sum(least(completed, target)) OVER recent AS credited,
+           sum(target) OVER recent AS targeted,
+           count(*) FILTER (
+               WHERE completed < target
+                 AND week < date_trunc('week', %(today)s::timestamp)
+           ) OVER (ORDER BY week DESC) AS misses_since
+    FROM weekly
+    WINDOW recent AS (
+        ORDER BY week ROWS BETWEEN %(window)s PRECEDING AND CURRENT ROW
+    )
+)
+SELECT week, target, completed, scheduled,
+       round(100.0 * least(completed, target) / nullif(target, 0), 1)::float,
+       round(100.0 * credited / nullif(targeted, 0), 1)::float,
+       count(*) FILTER (WHERE misses_since = 0 AND met) OVER ()
+FROM scored
+ORDER BY week DESC
+LIMIT %(weeks)s
+"""
+
+WEEK_FIELDS = (
+    'week', 'target', 'completed', 'scheduled', 'adherence',
+    'rolling_adherence',
+)
+
+
+def plan_adherence(user, plan=None, weeks=12, window=4, today=None):
+    """Return weekly target vs completed sessions, newest week first.
+
+    Covers one plan, or every plan of the user when `plan` is None.
+    `window` is the number of weeks in the rolling percentage.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(ADHERENCE_SQL, {
+            'user': user.pk,
+            'plan': plan.pk if plan else None,
+            'today': today or timezone.localdate(),
+            'window': window - 1,
+            'weeks': weeks,
+        })
+        rows = cursor.fetchall()
+
+    return {
+        'current_streak': rows[0][-1] if rows else 0,
+        'weeks': [dict(zip(WEEK_FIELDS, row)) for row in rows],
+    }
@@ -0,0 +1,140 @@
+"""
+Vectorized analytics over a user's weight series.
+
+The series is loaded with one query and laid out on a daily grid from the
+first to the last logged date. Days without an entry are NaN, so rolling
+windows cover calendar days rather than rows. Missing days are left out
+of every average instead of being treated as zero. All arithmetic is
+done with NumPy array operations.
+"""
+import math
+from datetime import date
+
+import numpy as np
+
+ROLLING_WINDOWS = (7, 30)
+FIT_WINDOW = 30
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def rolling_mean(values, window):
+    """Return the mean of the logged values in each trailing window."""
+    logged = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(logged, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(logged)))
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    total = sums[end] - sums[start]
+    count = counts[end] - counts[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def discounted_cumsum(values, decay):
+    """Return y[t] = sum(decay ** (t - i) * values[i] for i <= t).
+
+    The grid is processed in blocks short enough that ``decay ** -k``
+    cannot overflow. Ten years of daily data fit in a single block for
+    any half-life of a week or more.
+    """
+    block = max(1, int(600 / -math.log(decay)))
+    result = np.empty_like(values)
+    carry = 0.0
+    for start in range(0, len(values), block):
+        segment = values[start:start + block]
+        powers = decay ** np.arange(len(segment))
+        part = np.cumsum(segment / powers) * powers + carry * decay * powers
+        result[start:start + block] = part
+        carry = part[-1]
+    return result
+
+
+def ewma(values, halflife):
+    """Return a time-decayed mean in which missing days carry no weight."""
+    decay = 0.5 ** (1 / halflife)
+    logged = ~np.isnan(values)
+    numerator = discounted_cumsum(np.where(logged, values, 0.0), decay)
+    denominator = discounted_cumsum(logged.astype(float), decay)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def weekly_means(days, values):
+    """Return ISO week starts, mean weight and change from the prior week."""
+    # 1970-01-01 was a Thursday, so day + 3 counts from a Monday.
+    weeks = (days + 3) // 7
+    offset = weeks.min()
+    sums = np.bincount(weeks - offset, weights=values)
+    counts = np.bincount(weeks - offset)
+    logged = np.flatnonzero(counts)
+    means = sums[logged] / counts[logged]
+
+    deltas = np.full(len(logged), np.nan)
+    follows = np.flatnonzero(np.diff(logged) == 1) + 1
+    deltas[follows] = means[follows] - means[follows - 1]
+
+    week_starts = ((logged + offset) * 7 - 3).astype('datetime64[D]')
+    return week_starts, means, deltas
+
+
+def project(days, values, horizon):
+    """Fit a line to the last FIT_WINDOW days and extend it by `horizon`."""
+    recent = days >= days[-1] - FIT_WINDOW + 1
+    if np.count_nonzero(recent) < 2:
+        return None
+    slope, intercept = np.polyfit(days[recent] - days[-1], values[recent], 1)
+    return {
+        'slope_per_week': round(float(slope * 7), 3),
+        'date': str(np.datetime64(int(days[-1] + horizon), 'D')),
+        'weight': round(float(intercept + slope * horizon), 2),
+    }
+
+
+def to_list(values, decimals=2):
+    """Return a JSON-ready list with NaN replaced by None."""
+    result = np.round(values, decimals).astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def analyze(dates, weights, halflife=10, horizon=30):
+    """Return smoothed series, weekly changes and a projection.
+
+    `dates` and `weights` are parallel sequences of the logged entries in
+    ascending date order.
+    """
+    if not dates:
+        return {
+            'series': {'date': [], 'weight': [], 'trend': [],
+                       **{f'mean_{w}': [] for w in ROLLING_WINDOWS}},
+            'weekly': {'week': [], 'mean': [], 'delta': []},
+            'projection': None,
+        }
+
+    # Converting ordinals is far cheaper than parsing date objects.
+    days = np.fromiter(
+        map(date.toordinal, dates), dtype=np.int64, count=len(dates)
+    ) - EPOCH_ORDINAL
+    weights = np.array(weights, dtype=float)
+    index = days - days[0]
+    grid = np.full(index[-1] + 1, np.nan)
+    grid[index] = weights
+
+    series = {
+        'date': np.datetime_as_string(days.astype('datetime64[D]')).tolist(),
+        'weight': to_list(weights),
+        'trend': to_list(ewma(grid, halflife)[index]),
+    }
+    for window in ROLLING_WINDOWS:
+        series[f'mean_{window}'] = to_list(rolling_mean(grid, window)[index])
+
+    week_starts, means, deltas = weekly_means(days, weights)
+    return {
+        'series': series,
+        'weekly': {
+            'week': np.datetime_as_string(week_starts).tolist(),
+            'mean': to_list(means),
+            'delta': to_list(deltas),
+        },
+        'projection': project(days, weights, horizon),
+    }
@@ -4,3 +4,11 @@ from django.apps import AppConfig # noqa
 class WorkoutConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'workout'
+
+    def ready(self):
+        from django.core import checks
+
+        from workout import signals  # noqa: F401
+        from workout.catalog import check_shared_cache
+
+        checks.register(check_shared_cache, checks.Tags.caches)
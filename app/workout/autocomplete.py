@@ -0,0 +1,73 @@
+"""
+Typo-tolerant autocomplete over exercise and muscle group names.
+
+Suggestions come from two index-backed lookups:
+
+* prefix matches walk the ``UPPER(name) COLLATE "C"`` b-tree in name order
+  and stop after ``limit`` rows;
+* when that leaves room, fuzzy matches are found with the pg_trgm
+  word-similarity operator on the ``gin_trgm_ops`` index. Only the first
+  ``FUZZY_CANDIDATES`` hits are ranked, so common words cannot force a
+  sort over a large part of the catalog.
+
+Fuzzy matches ("deadlfit") need a looser word similarity than the pg_trgm
+default of 0.6. The threshold is set with ``set_config(..., true)``, which
+lasts until the end of the transaction, so it never leaks to other
+queries on a pooled connection.
+"""
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models.functions import Collate, Upper
+
+from core.models import Exercise, MuscleGroup
+
+AUTOCOMPLETE_LIMIT = 10
+FUZZY_CANDIDATES = 100
+# Trigram matching needs at least one full trigram to use the index.
+FUZZY_MIN_LENGTH = 3
+FUZZY_THRESHOLD = 0.5
+
+SET_FUZZY_THRESHOLD = (
+    "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)"
+)
+
+
+def match_names(queryset, query, limit=AUTOCOMPLETE_LIMIT):
+    """Return up to `limit` (id, name) rows, prefix matches first."""
+    matches = list(
+        queryset.annotate(
+            prefix_key=Collate(Upper('name'), 'C')
+        ).filter(
+            prefix_key__startswith=query.upper()
+        ).order_by('prefix_key', 'id').values('id', 'name')[:limit]
+    )
+    if len(matches) == limit or len(query) < FUZZY_MIN_LENGTH:
+        return matches
+
+    candidates = queryset.annotate(
+        upper_name=Upper('name')
+    ).filter(
+        upper_name__trigram_word_similar=query
+    ).exclude(
+        id__in=[match['id'] for match in matches]
+    ).values('id')[:FUZZY_CANDIDATES]
+
+    matches += queryset.filter(id__in=candidates).annotate(
+        similarity=TrigramWordSimilarity(query, Upper('name'))
+    ).order_by('-similarity', 'name', 'id').values(
+        'id', 'name'
+    )[:limit - len(matches)]
+    return matches
+
+
+def autocomplete(query, limit=AUTOCOMPLETE_LIMIT):
+    """Return exercise and muscle group suggestions for a search box."""
+    with transaction.atomic():
+        if len(query) >= FUZZY_MIN_LENGTH:
+            with connection.cursor() as cursor:
+                cursor.execute(SET_FUZZY_THRESHOLD, [str(FUZZY_THRESHOLD)])
+        return {
+            'exercises': match_names(Exercise.objects.all(), query, limit),
+            'muscle_groups': match_names(
+                MuscleGroup.objects.all(), query, limit),
+        }
@@ -0,0 +1,18 @@
+"""
+Helpers shared by the benchmark commands.
+"""
+import math
+
+
+def percentile(samples, fraction):
+    """Return the nearest-rank percentile of a sorted list."""
+    index = max(0, min(len(samples) - 1,
+                       math.ceil(fraction * len(samples)) - 1))
+    return samples[index]
+
+
+def walk_plan(node):
+    """Yield every node of a JSON EXPLAIN plan."""
+    yield node
+    for child in node.get('Plans', []):
+        yield from walk_plan(child)
@@ -0,0 +1,171 @@
+"""
+In-process cache for the exercise catalog.
+
+Muscle groups and exercises are reference data that only staff can change,
+so list and retrieve responses are served from an already-serialized
+snapshot. Every snapshot is tagged with the catalog version; writes bump
+the version (see ``workout.signals``) and the next read rebuilds.
+
+The version lives in the default cache, which every worker has to share:
+with a process-local cache a write would only invalidate the snapshots of
+the worker that handled it. ``check_shared_cache`` warns about that.
+"""
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import Http404
+from rest_framework.response import Response
+
+from core.models import MuscleGroup, Exercise
+from workout.conditional import ConditionalGetMixin, make_etag
+from workout.pagination import CatalogCursorPagination
+
+CATALOG_VERSION_KEY = 'workout:catalog-version'
+
+# Cache backends that are not shared between worker processes.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+_snapshots = {}
+_lock = threading.Lock()
+
+
+def check_shared_cache(app_configs, **kwargs):
+    """Warn when the catalog version cannot be shared between workers."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [checks.Warning(
+        f'The default cache ({backend}) is local to each process, so a '
+        'catalog write only invalidates the snapshots of one worker.',
+        hint='Set REDIS_URL, or configure another shared cache backend.',
+        id='workout.W001',
+    )]
+
+
+def _content_etag(data):
+    return make_etag(json.dumps(data, sort_keys=True, default=str))
+
+
+class CatalogSnapshot:
+    """Serialized catalog rows for one viewset at one catalog version."""
+
+    def __init__(self, version, items, last_modified=None):
+        self.version = version
+        self.items = items
+        self.ids = [item['id'] for item in items]
+        self.by_id = dict(zip(self.ids, items))
+        self.last_modified = last_modified
+        # ETags hash the serialized content, so every worker agrees on them
+        # regardless of its local catalog version.
+        self.etag = _content_etag(items)
+        self.item_etags = {
+            pk: _content_etag(item) for pk, item in self.by_id.items()
+        }
+
+
+def _catalog_last_modified():
+    timestamps = [
+        model.objects.aggregate(value=Max('updated_at'))['value']
+        for model in (MuscleGroup, Exercise)
+    ]
+    timestamps = [value for value in timestamps if value is not None]
+    return max(timestamps) if timestamps else None
+
+
+def get_catalog_version():
+    """Return the current catalog version."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so the version keeps increasing even if the
+        # shared cache entry was evicted.
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    """Invalidate every catalog snapshot and return the new version."""
+    try:
+        version = cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        get_catalog_version()
+        version = cache.incr(CATALOG_VERSION_KEY)
+    _snapshots.clear()
+    return version
+
+
+def clear_catalog_cache():
+    """Drop the snapshots held by this process."""
+    _snapshots.clear()
+
+
+def get_snapshot(view):
+    """Return the catalog snapshot for a viewset, building it if stale."""
+    version = get_catalog_version()
+    key = view.basename
+    snapshot = _snapshots.get(key)
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None or snapshot.version != version:
+            serializer = view.get_serializer(view.get_queryset(), many=True)
+            snapshot = CatalogSnapshot(
+                version,
+                [dict(item) for item in serializer.data],
+                _catalog_last_modified(),
+            )
+            _snapshots[key] = snapshot
+    return snapshot
+
+
+class CatalogCacheMixin(ConditionalGetMixin):
+    """Serve list and retrieve, including 304s, from the catalog snapshot."""
+
+    pagination_class = CatalogCursorPagination
+    # Query parameters that filter the list; requests using them skip the
+    # snapshot and query the database.
+    catalog_filter_params = ()
+
+    def list(self, request, *args, **kwargs):
+        if any(param in request.query_params
+               for param in self.catalog_filter_params):
+            return super().list(request, *args, **kwargs)
+
+        snapshot = get_snapshot(self)
+
+        def build_response():
+            page = self.paginator.paginate_snapshot(
+                snapshot.items, snapshot.ids, request
+            )
+            return self.paginator.get_paginated_response(page)
+
+        return self.conditional_response(
+            make_etag(snapshot.etag, request.get_full_path()),
+            snapshot.last_modified,
+            build_response,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            pk = int(kwargs[lookup_url_kwarg])
+        except (TypeError, ValueError):
+            raise Http404
+        snapshot = get_snapshot(self)
+        item = snapshot.by_id.get(pk)
+        if item is None:
+            raise Http404
+        return self.conditional_response(
+            snapshot.item_etags[pk], snapshot.last_modified,
+            lambda: Response(item),
+        )
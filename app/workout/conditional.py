@@ -0,0 +1,97 @@
+"""
+Conditional GET support for the workout API.
+
+Lists are validated with a single aggregate query (row count and latest
+``updated_at``) and details with the row that ``get_object`` loads anyway,
+so a ``304 Not Modified`` is answered without serializing anything.
+``If-None-Match`` takes precedence over ``If-Modified-Since``; the ETag is
+authoritative because deleting a row does not advance ``Last-Modified``.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_vary_headers
+from django.utils.http import (
+    http_date,
+    parse_etags,
+    parse_http_date_safe,
+    quote_etag,
+)
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """Return a quoted strong ETag for the given parts."""
+    digest = hashlib.md5(
+        '|'.join(str(part) for part in parts).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return quote_etag(digest)
+
+
+def is_not_modified(request, etag, last_modified):
+    """Check the request's validators against the current state."""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+        return '*' in etags or etag in etags
+
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_modified_since and last_modified is not None:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and int(last_modified.timestamp()) <= since
+    return False
+
+
+class ConditionalGetMixin:
+    """Add ETag/Last-Modified headers and 304 responses to a viewset."""
+
+    def get_list_validators(self):
+        """Return the (etag, last_modified) pair for the list action."""
+        state = self.filter_queryset(self.get_queryset()).order_by(
+        ).aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+        etag = make_etag(
+            self.basename,
+            self.request.user.pk,
+            self.request.get_full_path(),
+            state['count'],
+            state['last_modified'] and state['last_modified'].isoformat(),
+        )
+        return etag, state['last_modified']
+
+    def get_object_validators(self, instance):
+        """Return the (etag, last_modified) pair for one object."""
+        etag = make_etag(
+            self.basename, instance.pk, instance.updated_at.isoformat()
+        )
+        return etag, instance.updated_at
+
+    def conditional_response(self, etag, last_modified, build_response):
+        """Return a 304 if the client is current, else build the response."""
+        if is_not_modified(self.request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = build_response()
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators()
+        return self.conditional_response(
+            etag, last_modified,
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            ),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        return self.conditional_response(
+            etag, last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+        )
@@ -0,0 +1,30 @@
+"""
+Query-string filters for the session and progress lists.
+
+The filters become plain lookups on the user's queryset. Every one of
+them leads with a column of a composite index: (user, date) for the
+range and (workout_plan, date) for a plan. A calendar month therefore
+reads only the rows in that month, however long the history is. The
+same filtered queryset backs the list, its ETag, exports and analytics.
+"""
+from workout import serializers
+
+
+class HistoryFilterMixin:
+    """Filter non-detail actions by the parameters in `history_filters`."""
+    history_filter_class = serializers.DateRangeSerializer
+    # Query parameter -> queryset lookup.
+    history_filters = {'from': 'date__gte', 'to': 'date__lte'}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.detail:
+            return queryset
+
+        params = self.history_filter_class(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return queryset.filter(**{
+            self.history_filters[name]: value
+            for name, value in params.validated_data.items()
+            if value is not None
+        })
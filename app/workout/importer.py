@@ -0,0 +1,185 @@
+"""
+Bulk import and upsert of progress entries.
+
+The upload is decoded and parsed line by line, so only one batch of rows
+is held in memory at a time. Each batch is written with a single
+``INSERT ... SELECT FROM unnest(...)`` statement. Its ``ON CONFLICT``
+clause relies on the unique (user, date) constraint to either skip dates
+the user has already logged or overwrite them. The same constraint
+backs the single-entry upsert, so concurrent writes to one date never
+race into an IntegrityError.
+"""
+import csv
+import io
+import json
+import math
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Progress
+
+IMPORT_BATCH_SIZE = 1000
+
+# Each batch is sent as three arrays, so the statement has five parameters
+# however many rows it carries. ``xmax = 0`` is true for freshly inserted
+# rows and false for rows rewritten by ``DO UPDATE``.
+INSERT_SQL = """
+INSERT INTO core_progress (user_id, updated_at, date, weight, notes)
+SELECT %s, %s, *
+FROM unnest(%s::date[], %s::double precision[], %s::text[])
+ON CONFLICT (user_id, date) DO {action}
+RETURNING xmax = 0
+"""
+UPDATE_ACTION = (
+    'UPDATE SET weight = EXCLUDED.weight, notes = EXCLUDED.notes, '
+    'updated_at = EXCLUDED.updated_at'
+)
+SKIP_SQL = INSERT_SQL.format(action='NOTHING')
+OVERWRITE_SQL = INSERT_SQL.format(action=UPDATE_ACTION)
+
+UPSERT_SQL = f"""
+INSERT INTO core_progress (user_id, updated_at, date, weight, notes)
+VALUES (%s, %s, %s, %s, %s)
+ON CONFLICT (user_id, date) DO {UPDATE_ACTION}
+RETURNING id, xmax = 0
+"""
+
+
+class ImportFileError(ValueError):
+    """The upload cannot be read at all."""
+
+
+def iter_csv_rows(text):
+    """Yield (line, row) for each record of a CSV file with a header."""
+    reader = csv.DictReader(text)
+    if reader.fieldnames is None or 'date' not in reader.fieldnames:
+        raise ImportFileError('The CSV header must include a "date" column.')
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(text):
+    """Yield (line, row) for each non-blank line of an NDJSON file."""
+    for line, content in enumerate(text, start=1):
+        if not content.strip():
+            continue
+        try:
+            row = json.loads(content)
+        except ValueError:
+            row = None
+        yield line, row
+
+
+def parse_row(row):
+    """Return (values, errors) for one raw row of an import."""
+    if not isinstance(row, dict):
+        return None, {'non_field_errors': ['Expected a JSON object.']}
+
+    values = {}
+    errors = {}
+
+    raw_date = row.get('date')
+    try:
+        values['date'] = date.fromisoformat(str(raw_date).strip())
+    except ValueError:
+        errors['date'] = ['Expected a date in YYYY-MM-DD format.']
+
+    raw_weight = row.get('weight')
+    if raw_weight is None or raw_weight == '':
+        values['weight'] = None
+    else:
+        try:
+            weight = float(raw_weight)
+        except (TypeError, ValueError):
+            weight = math.nan
+        if isinstance(raw_weight, bool) or not math.isfinite(weight):
+            errors['weight'] = ['A valid number is required.']
+        values['weight'] = weight
+
+    notes = row.get('notes')
+    values['notes'] = str(notes) if notes not in (None, '') else None
+
+    return values, errors
+
+
+def import_progress(user, rows, on_conflict='skip',
+                    batch_size=IMPORT_BATCH_SIZE):
+    """Import (line, row) pairs for a user and return a report.
+
+    `on_conflict` decides what happens to dates the user has already
+    logged: ``skip`` keeps the stored entry, ``overwrite`` replaces it.
+    A date that appears twice in the same file is reported as an error on
+    its second line.
+    """
+    report = {'created': 0, 'updated': 0, 'skipped': 0, 'errors': []}
+    seen = {}
+    batch = []
+
+    with transaction.atomic():
+        for line, row in rows:
+            values, errors = parse_row(row)
+            if not errors and values['date'] in seen:
+                errors = {'date': [
+                    f'Duplicate of line {seen[values["date"]]}.'
+                ]}
+            if errors:
+                report['errors'].append({'line': line, 'errors': errors})
+                continue
+
+            seen[values['date']] = line
+            batch.append(values)
+            if len(batch) == batch_size:
+                write_batch(user, batch, on_conflict, report)
+                batch = []
+
+        if batch:
+            write_batch(user, batch, on_conflict, report)
+
+    return report
+
+
+def write_batch(user, batch, on_conflict, report):
+    """Write one batch of parsed rows and update the report counts."""
+    sql = OVERWRITE_SQL if on_conflict == 'overwrite' else SKIP_SQL
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [
+            user.pk,
+            timezone.now(),
+            [values['date'] for values in batch],
+            [values['weight'] for values in batch],
+            [values['notes'] for values in batch],
+        ])
+        inserted = [row[0] for row in cursor.fetchall()]
+
+    created = sum(inserted)
+    report['created'] += created
+    if on_conflict == 'overwrite':
+        report['updated'] += len(inserted) - created
+    else:
+        report['skipped'] += len(batch) - created
+
+
+def upsert_progress(user, day, weight=None, notes=None):
+    """Create or replace the user's entry for a date in one statement.
+
+    Return the saved entry and whether it was created.
+    """
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_SQL, [user.pk, now, day, weight, notes])
+        pk, created = cursor.fetchone()
+    progress = Progress(
+        id=pk, user=user, date=day, weight=weight, notes=notes,
+        updated_at=now,
+    )
+    return progress, created
+
+
+def read_upload(upload, file_type):
+    """Return an iterator of (line, row) pairs over an uploaded file."""
+    text = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+    if file_type == 'csv':
+        return iter_csv_rows(text)
+    return iter_ndjson_rows(text)
@@ -0,0 +1,135 @@
+"""
+Django command to EXPLAIN the list queries of every workout viewset.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from workout.benchmark import walk_plan
+from workout.urls import router
+
+
+class Command(BaseCommand):
+    """Flag sequential scans and large sorts in per-user list queries."""
+    help = (
+        'Runs EXPLAIN on the list queryset of each workout viewset for a '
+        'sample user and flags sequential scans or sorts above a threshold.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            help='Email of the sample user (default: the busiest user).',
+        )
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Run EXPLAIN ANALYZE and judge actual row counts.',
+        )
+        parser.add_argument(
+            '--threshold', type=int, default=1000,
+            help='Rows a scan or sort may touch before it is flagged.',
+        )
+        parser.add_argument(
+            '--fail', action='store_true',
+            help='Exit with an error if anything is flagged.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if connection.vendor != 'postgresql':
+            raise CommandError('Index auditing requires PostgreSQL.')
+
+        user = self.get_user(options['user'])
+        threshold = options['threshold']
+        flagged = 0
+
+        for prefix, viewset, basename in router.registry:
+            queryset = self.get_list_queryset(viewset, basename, user)
+            plan = json.loads(
+                queryset.explain(format='json', analyze=options['analyze'])
+            )[0]['Plan']
+            issues = self.find_issues(plan, threshold, options['analyze'])
+            flagged += len(issues)
+
+            if issues:
+                self.stdout.write(self.style.WARNING(f'{prefix}:'))
+                for issue in issues:
+                    self.stdout.write(f'  {issue}')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{prefix}: OK'))
+
+        if flagged and options['fail']:
+            raise CommandError(f'{flagged} plan node(s) exceed the threshold.')
+
+    def get_user(self, email):
+        """Return the sample user to run the querysets for."""
+        User = get_user_model()
+        if email:
+            try:
+                return User.objects.get(email=email)
+            except User.DoesNotExist:
+                raise CommandError(f'User "{email}" does not exist.')
+
+        user = User.objects.annotate(
+            rows=Count('workout_sessions', distinct=True)
+            + Count('progress', distinct=True)
+        ).order_by('-rows').first()
+        if user is None:
+            raise CommandError('There are no users to audit with.')
+        return user
+
+    def get_list_queryset(self, viewset, basename, user):
+        """Return the queryset the list action would run for the user."""
+        request = Request(RequestFactory().get('/'))
+        request.user = user
+        view = viewset(
+            request=request, format_kwarg=None, action='list', detail=False,
+            kwargs={}, basename=basename,
+        )
+        queryset = view.filter_queryset(view.get_queryset())
+
+        paginator = view.paginator
+        if paginator is None:
+            return queryset
+        ordering = paginator.get_ordering(request, queryset, view)
+        return queryset.order_by(*ordering)[:paginator.page_size + 1]
+
+    def get_table_rows(self, table):
+        """Return the planner's row estimate for a table."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT GREATEST(reltuples, 0)::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [table],
+            )
+            return cursor.fetchone()[0]
+
+    def find_issues(self, plan, threshold, analyze):
+        """Return descriptions of scans and sorts above the threshold."""
+        rows_key = 'Actual Rows' if analyze else 'Plan Rows'
+        issues = []
+        for node in walk_plan(plan):
+            node_type = node['Node Type']
+            rows = node.get(rows_key, 0)
+            if node_type == 'Seq Scan':
+                # A sequential scan reads the whole table, whatever the
+                # filter lets through.
+                table_rows = self.get_table_rows(node['Relation Name'])
+                if table_rows > threshold:
+                    issues.append(
+                        f'Seq Scan on {node["Relation Name"]} '
+                        f'({table_rows} rows in table)'
+                    )
+            elif node_type in ('Sort', 'Incremental Sort') and (
+                rows > threshold or node.get('Sort Space Type') == 'Disk'
+            ):
+                issues.append(
+                    f'{node_type} on {", ".join(node["Sort Key"])} '
+                    f'({rows} rows)'
+                )
+        return issues
@@ -0,0 +1,98 @@
+"""
+Django command to benchmark exercise autocomplete at several catalog sizes.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.models import Exercise
+from workout.autocomplete import match_names
+from workout.benchmark import percentile
+
+# Keystroke prefixes and the typos people actually make in a search box.
+QUERIES = [
+    'b', 'be', 'ben', 'benc', 'bench', 'bench p', 'bench pres',
+    'deadlfit', 'romanian dead', 'sqaut', 'curl', 'lat pull',
+    'shoulder pres', 'tricep pushdwn', 'calf rase', 'plank',
+]
+
+GENERATE_EXERCISES = """
+INSERT INTO core_exercise (name, description, instructions, updated_at)
+SELECT
+    (ARRAY['Incline', 'Decline', 'Seated', 'Standing', 'Single-Arm',
+           'Romanian', 'Bulgarian', 'Close-Grip', 'Wide-Grip', 'Paused']
+    )[1 + floor(random() * 10)::int]
+    || ' ' ||
+    (ARRAY['Barbell', 'Dumbbell', 'Cable', 'Kettlebell', 'Machine',
+           'Band', 'Smith Machine', 'Bodyweight']
+    )[1 + floor(random() * 8)::int]
+    || ' ' ||
+    (ARRAY['Bench Press', 'Deadlift', 'Squat', 'Curl', 'Row',
+           'Lat Pulldown', 'Shoulder Press', 'Tricep Pushdown', 'Lunge',
+           'Calf Raise', 'Plank', 'Fly', 'Shrug', 'Hip Thrust']
+    )[1 + floor(random() * 14)::int]
+    || ' ' || g,
+    'Generated exercise', 'Generated instructions', now()
+FROM generate_series(1, %s) AS g
+"""
+
+
+class Command(BaseCommand):
+    """Measure autocomplete latency on generated catalogs."""
+    help = (
+        'Generates exercise catalogs of the given sizes inside a rolled-back '
+        'transaction and reports autocomplete latency percentiles.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+',
+            default=[10_000, 100_000, 1_000_000],
+            help='Catalog sizes to benchmark.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='How many times to run each query per size.',
+        )
+        parser.add_argument(
+            '--seed', type=float, default=0.42,
+            help='Seed for the generated names (-1 to 1).',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if connection.vendor != 'postgresql':
+            raise CommandError('Autocomplete requires PostgreSQL.')
+
+        self.stdout.write(
+            f'{"rows":>10} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}'
+        )
+        for size in options['sizes']:
+            samples = self.run_size(size, options['repeat'], options['seed'])
+            self.stdout.write(
+                f'{size:>10} {percentile(samples, 0.50):>8.2f} '
+                f'{percentile(samples, 0.95):>8.2f} '
+                f'{percentile(samples, 0.99):>8.2f}'
+            )
+
+    def run_size(self, size, repeat, seed):
+        """Return sorted latencies in ms for one catalog size."""
+        samples = []
+        with transaction.atomic():
+            existing = Exercise.objects.count()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT setseed(%s)', [seed])
+                cursor.execute(GENERATE_EXERCISES, [max(0, size - existing)])
+                cursor.execute('ANALYZE core_exercise')
+
+            for query in QUERIES:
+                match_names(Exercise.objects.all(), query)
+            for _ in range(repeat):
+                for query in QUERIES:
+                    start = time.perf_counter()
+                    match_names(Exercise.objects.all(), query)
+                    samples.append((time.perf_counter() - start) * 1000)
+
+            transaction.set_rollback(True)
+        return sorted(samples)
@@ -0,0 +1,394 @@
+"""
+Django command to benchmark every workout and user API route.
+"""
+import io
+import json
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import URLResolver, reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.budgets import is_savepoint
+from core.models import (
+    Exercise,
+    MonthlyRollup,
+    MuscleGroup,
+    Progress,
+    WeeklyRollup,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutSession,
+)
+from user import urls as user_urls
+from workout import urls as workout_urls
+from workout.benchmark import percentile
+
+PASSWORD = 'loadtest-password'
+# Metrics that a compare run checks against the baseline.
+TIMED_METRICS = ('p50_ms', 'p95_ms', 'sql_ms')
+
+# (label, method, url name, fixture args, data or query, format)
+# Data may be a callable taking the fixtures. Every request runs in a
+# savepoint that is rolled back, so writes can be repeated.
+CASES = [
+    ('api root', 'get', 'workout:api-root', (), None, None),
+    ('autocomplete', 'get', 'workout:autocomplete', (), {'q': 'bench'},
+     None),
+    ('muscle groups', 'get', 'workout:muscle-group-list', (), None, None),
+    ('muscle group', 'get', 'workout:muscle-group-detail',
+     ('muscle_group',), None, None),
+    ('exercises', 'get', 'workout:exercise-list', (), None, None),
+    ('exercises by muscle', 'get', 'workout:exercise-list', (),
+     lambda f: {'muscles': f['muscle_group']}, None),
+    ('exercise search', 'get', 'workout:exercise-search', (),
+     {'q': 'press'}, None),
+    ('exercise', 'get', 'workout:exercise-detail', ('exercise',), None,
+     None),
+    ('plans', 'get', 'workout:workout-plan-list', (), None, None),
+    ('plans expanded', 'get', 'workout:workout-plan-list', (),
+     {'expand': 'exercises'}, None),
+    ('plan create', 'post', 'workout:workout-plan-list', (),
+     {'name': 'Benchmark', 'frequency': 3, 'goal': 'Speed'}, 'json'),
+    ('plan', 'get', 'workout:workout-plan-detail', ('plan',), None, None),
+    ('plan expanded', 'get', 'workout:workout-plan-detail', ('plan',),
+     {'expand': 'exercises'}, None),
+    ('plan update', 'patch', 'workout:workout-plan-detail', ('plan',),
+     {'frequency': 4}, 'json'),
+    ('plan delete', 'delete', 'workout:workout-plan-detail', ('plan',),
+     None, None),
+    ('plan adherence', 'get', 'workout:workout-plan-adherence', ('plan',),
+     None, None),
+    ('overall adherence', 'get', 'workout:workout-plan-overall-adherence',
+     (), None, None),
+    ('plan clone', 'post', 'workout:workout-plan-clone', ('plan',),
+     {'sets_scale': 1.5}, 'json'),
+    ('plan schedule', 'post', 'workout:workout-plan-schedule', ('plan',),
+     {'weeks': 12}, 'json'),
+    ('plan exercises', 'get', 'workout:workout-plan-exercise-list', (),
+     None, None),
+    ('plan exercise create', 'post', 'workout:workout-plan-exercise-list',
+     (), lambda f: {'workout_plan': f['plan'], 'exercise': f['exercise'],
+                    'sets': 3, 'repetitions': 10}, 'json'),
+    ('plan exercise bulk', 'post', 'workout:workout-plan-exercise-bulk', (),
+     lambda f: {'workout_plan': f['plan'], 'items': [
+         {'exercise': f['exercise'], 'sets': 3, 'repetitions': reps}
+         for reps in range(1, 21)
+     ]}, 'json'),
+    ('plan exercise', 'get', 'workout:workout-plan-exercise-detail',
+     ('plan_exercise',), None, None),
+    ('plan exercise update', 'patch', 'workout:workout-plan-exercise-detail',
+     ('plan_exercise',), {'sets': 5}, 'json'),
+    ('sessions', 'get', 'workout:workout-session-list', (), None, None),
+    ('sessions one month', 'get', 'workout:workout-session-list', (),
+     lambda f: f['month'], None),
+    ('session create', 'post', 'workout:workout-session-list', (),
+     lambda f: {'workout_plan': f['plan'], 'date': f['month']['to']},
+     'json'),
+    ('session batch', 'post', 'workout:workout-session-batch', (),
+     lambda f: {'operation': 'complete', **f['month']}, 'json'),
+    ('session export', 'get', 'workout:workout-session-export', (), None,
+     None),
+    ('session', 'get', 'workout:workout-session-detail', ('session',),
+     None, None),
+    ('session update', 'patch', 'workout:workout-session-detail',
+     ('session',), {'completed': True}, 'json'),
+    ('progress', 'get', 'workout:progress-list', (), None, None),
+    ('progress one month', 'get', 'workout:progress-list', (),
+     lambda f: f['month'], None),
+    ('progress analytics', 'get', 'workout:progress-analytics', (), None,
+     None),
+    ('progress by date', 'put', 'workout:progress-by-date', ('day',),
+     {'weight': 80.5}, 'json'),
+    ('progress export', 'get', 'workout:progress-export', (), None, None),
+    ('progress import', 'post', 'workout:progress-import', (),
+     lambda f: {'type': 'csv', 'file': SimpleUploadedFile(
+         'progress.csv', b'date,weight\n2000-01-01,80\n2000-01-02,79.8\n')},
+     'multipart'),
+    ('progress entry', 'get', 'workout:progress-detail', ('progress',),
+     None, None),
+    ('progress update', 'patch', 'workout:progress-detail', ('progress',),
+     {'notes': 'Benchmark'}, 'json'),
+    ('weekly rollups', 'get', 'workout:weekly-rollup-list', (), None, None),
+    ('weekly rollup', 'get', 'workout:weekly-rollup-detail',
+     ('weekly_rollup',), None, None),
+    ('monthly rollups', 'get', 'workout:monthly-rollup-list', (), None,
+     None),
+    ('monthly rollup', 'get', 'workout:monthly-rollup-detail',
+     ('monthly_rollup',), None, None),
+    ('user create', 'post', 'user:create', (),
+     {'email': 'benchmark-new@example.com', 'password': PASSWORD,
+      'name': 'New'}, 'json'),
+    ('token obtain', 'post', 'user:token_obtain_pair', (),
+     lambda f: {'email': f['email'], 'password': PASSWORD}, 'json'),
+    ('token refresh', 'post', 'user:token_refresh', (),
+     lambda f: {'refresh': f['refresh']}, 'json'),
+    ('me', 'get', 'user:me', (), None, None),
+    ('me update', 'patch', 'user:me', (), {'name': 'Renamed'}, 'json'),
+    ('logout', 'post', 'user:logout', (),
+     lambda f: {'refresh_token': f['refresh']}, 'json'),
+]
+
+
+def route_names(module):
+    """Return the namespaced names of every route in a URL module."""
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns)
+            elif pattern.name:
+                yield f'{module.app_name}:{pattern.name}'
+    return set(walk(module.urlpatterns))
+
+
+def compare(baseline, results, tolerance, min_ms):
+    """Return descriptions of metrics that regressed past the tolerance."""
+    regressions = []
+    for label, old in baseline.items():
+        new = results.get(label)
+        if new is None:
+            continue
+        for metric in TIMED_METRICS:
+            if (new[metric] > old[metric] * (1 + tolerance)
+                    and new[metric] - old[metric] > min_ms):
+                regressions.append(
+                    f'{label}: {metric} {old[metric]:.2f} -> '
+                    f'{new[metric]:.2f}')
+        if new['queries'] > old['queries']:
+            regressions.append(
+                f'{label}: queries {old["queries"]} -> {new["queries"]}')
+        if new['bytes'] > old['bytes'] * (1 + tolerance):
+            regressions.append(
+                f'{label}: bytes {old["bytes"]} -> {new["bytes"]}')
+    return regressions
+
+
+class QueryTimer:
+    """Execute wrapper that counts and times every SQL statement.
+
+    Savepoints are left out, as in the query budgets, so both report the
+    same count for an endpoint.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        if is_savepoint(sql):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+class Command(BaseCommand):
+    """Measure latency, queries and payload size of every API route."""
+    help = (
+        'Requests every route of the workout and user APIs as a seeded '
+        'load-data user and reports latency percentiles, SQL queries, SQL '
+        'time and payload size. Results can be saved as a JSON baseline '
+        'and compared against one.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=20,
+            help='Load-data users to generate if the seed is not loaded.',
+        )
+        parser.add_argument(
+            '--years', type=float, default=2,
+            help='Longest generated history, in years.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=42,
+            help='Load-data seed; existing data for it is reused.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Measured requests per route.',
+        )
+        parser.add_argument(
+            '--only',
+            help='Only run cases whose label contains this text.',
+        )
+        parser.add_argument(
+            '--save', type=Path,
+            help='Write the results to this JSON baseline.',
+        )
+        parser.add_argument(
+            '--compare', type=Path,
+            help='Fail if results regress against this JSON baseline.',
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.25,
+            help='Allowed relative growth of times and payload sizes.',
+        )
+        parser.add_argument(
+            '--min-ms', type=float, default=1.0,
+            help='Time growth below this many ms is never a regression.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        missing = (
+            route_names(workout_urls) | route_names(user_urls)
+        ) - {case[2] for case in CASES}
+        if missing:
+            raise CommandError(
+                f'No benchmark case for: {", ".join(sorted(missing))}')
+
+        baseline = None
+        if options['compare']:
+            baseline = json.loads(options['compare'].read_text())['results']
+
+        cases = [
+            case for case in CASES
+            if not options['only'] or options['only'] in case[0]
+        ]
+        # The test client's host has to be allowed outside the test runner.
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        with override_settings(ALLOWED_HOSTS=hosts), transaction.atomic():
+            fixtures = self.seed(options)
+            self.stdout.write(
+                f'{"case":<24} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} '
+                f'{"queries":>7} {"sql ms":>7} {"bytes":>8}'
+            )
+            results = {}
+            for case in cases:
+                result = self.run_case(case, fixtures, options['repeat'])
+                results[case[0]] = result
+                self.stdout.write(
+                    f'{case[0]:<24} {result["p50_ms"]:>8.2f} '
+                    f'{result["p95_ms"]:>8.2f} {result["p99_ms"]:>8.2f} '
+                    f'{result["queries"]:>7} {result["sql_ms"]:>7.2f} '
+                    f'{result["bytes"]:>8}'
+                )
+            transaction.set_rollback(True)
+
+        if options['save']:
+            options['save'].write_text(json.dumps({
+                'options': {
+                    key: options[key]
+                    for key in ('users', 'years', 'seed', 'repeat')
+                },
+                'results': results,
+            }, indent=2) + '\n')
+            self.stdout.write(f'Saved baseline to {options["save"]}.')
+
+        if baseline is not None:
+            regressions = compare(
+                baseline, results, options['tolerance'], options['min_ms'])
+            if regressions:
+                for regression in regressions:
+                    self.stderr.write(regression)
+                raise CommandError(
+                    f'{len(regressions)} metric(s) regressed.')
+            self.stdout.write(self.style.SUCCESS('No regressions.'))
+
+    def seed(self, options):
+        """Load the seeded data if needed and return the request fixtures."""
+        if not Exercise.objects.exists():
+            call_command('populate_exercises', stdout=io.StringIO())
+        email = f'load-{options["seed"]}-0@example.com'
+        User = get_user_model()
+        if not User.objects.filter(email=email).exists():
+            call_command(
+                'generate_load_data', users=options['users'],
+                years=options['years'], seed=options['seed'],
+                stdout=io.StringIO(),
+            )
+        user = User.objects.get(email=email)
+
+        plan = WorkoutPlan.objects.filter(user=user).order_by('id').first()
+        session = WorkoutSession.objects.filter(
+            user=user).order_by('-date').first()
+        last = session.date.replace(day=1) - timedelta(days=1)
+        refresh = RefreshToken.for_user(user)
+        return {
+            'user': user,
+            'email': email,
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+            'plan': plan.pk,
+            'plan_exercise': WorkoutPlanExercise.objects.filter(
+                workout_plan=plan).first().pk,
+            'session': session.pk,
+            'progress': Progress.objects.filter(user=user).first().pk,
+            'exercise': Exercise.objects.order_by('id').first().pk,
+            'muscle_group': MuscleGroup.objects.order_by('id').first().pk,
+            'weekly_rollup': WeeklyRollup.objects.filter(
+                user=user).first().pk,
+            'monthly_rollup': MonthlyRollup.objects.filter(
+                user=user).first().pk,
+            'day': session.date.isoformat(),
+            'month': {
+                'from': last.replace(day=1).isoformat(),
+                'to': last.isoformat(),
+            },
+        }
+
+    def request(self, client, case, fixtures):
+        """Send one request and return the response with its body read."""
+        label, method, name, args, data, data_format = case
+        url = reverse(name, args=[fixtures[arg] for arg in args])
+        if callable(data):
+            data = data(fixtures)
+        send = getattr(client, method)
+        if method == 'get':
+            response = send(url, data)
+        else:
+            response = send(url, data, format=data_format)
+        if response.streaming:
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+        return response, content
+
+    def run_case(self, case, fixtures, repeat):
+        """Return the metrics of one case over `repeat` requests."""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {fixtures["access"]}')
+
+        samples, queries, sql_seconds = [], [], []
+        # The first request warms caches and is not recorded.
+        for iteration in range(repeat + 1):
+            timer = QueryTimer()
+            with transaction.atomic():
+                with connection.execute_wrapper(timer):
+                    start = time.perf_counter()
+                    response, content = self.request(client, case, fixtures)
+                    elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+            if response.status_code >= 400:
+                raise CommandError(
+                    f'{case[0]} returned {response.status_code}: '
+                    f'{content[:200]!r}')
+            if iteration:
+                samples.append(elapsed * 1000)
+                queries.append(timer.count)
+                sql_seconds.append(timer.seconds * 1000)
+
+        samples.sort()
+        return {
+            'status': response.status_code,
+            'p50_ms': round(percentile(samples, 0.50), 3),
+            'p95_ms': round(percentile(samples, 0.95), 3),
+            'p99_ms': round(percentile(samples, 0.99), 3),
+            'queries': int(statistics.median(queries)),
+            'sql_ms': round(statistics.median(sql_seconds), 3),
+            'bytes': len(content),
+        }
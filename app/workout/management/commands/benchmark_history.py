@@ -0,0 +1,146 @@
+"""
+Django command to benchmark filtered session and progress lists.
+"""
+import json
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import WorkoutPlan
+from workout.benchmark import percentile, walk_plan
+from workout.views import ProgressViewSet, WorkoutSessionViewSet
+
+GENERATE_SESSIONS = """
+INSERT INTO core_workoutsession (user_id, workout_plan_id, date, completed,
+                                 updated_at)
+SELECT %s, %s, day::date, random() < 0.8, now()
+FROM generate_series(%s::date, %s::date, interval '1 day') AS day
+"""
+
+GENERATE_PROGRESS = """
+INSERT INTO core_progress (user_id, date, weight, notes, updated_at)
+SELECT %s, day::date, 80 + 5 * sin(extract(epoch FROM day) / 8e6)
+                      + random(), NULL, now()
+FROM generate_series(%s::date, %s::date, interval '1 day') AS day
+"""
+
+
+class Command(BaseCommand):
+    """Measure list latency for a user with years of daily history."""
+    help = (
+        'Generates a user with a daily session and progress entry for the '
+        'given number of years inside a rolled-back transaction, then '
+        'reports latency percentiles of filtered and unfiltered lists.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--years', type=int, default=10,
+            help='Years of daily history to generate.',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='How many times to request each list.',
+        )
+        parser.add_argument(
+            '--seed', type=float, default=0.42,
+            help='Seed for the generated data (-1 to 1).',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        if connection.vendor != 'postgresql':
+            raise CommandError('The history benchmark requires PostgreSQL.')
+
+        # Pagination links need the request factory's host to be allowed.
+        hosts = [*settings.ALLOWED_HOSTS, 'testserver']
+        with override_settings(ALLOWED_HOSTS=hosts), transaction.atomic():
+            user, plan, end = self.generate(options['years'], options['seed'])
+            month = {
+                'from': (end.replace(day=1) - timedelta(days=1)).replace(
+                    day=1).isoformat(),
+                'to': (end.replace(day=1) - timedelta(days=1)).isoformat(),
+            }
+            cases = [
+                ('sessions, first page', WorkoutSessionViewSet, {}),
+                ('sessions, one month', WorkoutSessionViewSet, month),
+                ('sessions, month+plan+completed', WorkoutSessionViewSet,
+                 {**month, 'plan': plan.pk, 'completed': 'true'}),
+                ('progress, first page', ProgressViewSet, {}),
+                ('progress, one month', ProgressViewSet, month),
+            ]
+
+            self.stdout.write(
+                f'{"list":<32} {"rows":>6} {"p50 ms":>8} {"p95 ms":>8} '
+                f'{"p99 ms":>8}  plan'
+            )
+            for label, viewset, params in cases:
+                samples, rows = self.run_case(
+                    viewset, user, params, options['repeat'])
+                self.stdout.write(
+                    f'{label:<32} {rows:>6} {percentile(samples, 0.50):>8.2f} '
+                    f'{percentile(samples, 0.95):>8.2f} '
+                    f'{percentile(samples, 0.99):>8.2f}  '
+                    f'{self.describe_plan(viewset, user, params)}'
+                )
+
+            transaction.set_rollback(True)
+
+    def generate(self, years, seed):
+        """Create the benchmark user and their daily history."""
+        end = date.today()
+        start = end - timedelta(days=365 * years)
+        user = get_user_model().objects.create_user(
+            'history-benchmark@example.com', 'unused-password')
+        plan = WorkoutPlan.objects.create(
+            user=user, name='Daily', frequency=7, goal='Benchmark')
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT setseed(%s)', [seed])
+            cursor.execute(GENERATE_SESSIONS, [user.pk, plan.pk, start, end])
+            cursor.execute(GENERATE_PROGRESS, [user.pk, start, end])
+            cursor.execute('ANALYZE core_workoutsession, core_progress')
+        return user, plan, end
+
+    def make_request(self, user, params):
+        """Return an authenticated GET request with the given filters."""
+        request = APIRequestFactory().get('/', params)
+        force_authenticate(request, user=user)
+        return request
+
+    def run_case(self, viewset, user, params, repeat):
+        """Return sorted latencies in ms and the rows on the page."""
+        view = viewset.as_view({'get': 'list'})
+        response = view(self.make_request(user, params))
+        rows = len(response.data['results'])
+
+        samples = []
+        for _ in range(repeat):
+            request = self.make_request(user, params)
+            start = time.perf_counter()
+            view(request).render()
+            samples.append((time.perf_counter() - start) * 1000)
+        return sorted(samples), rows
+
+    def describe_plan(self, viewset, user, params):
+        """Return the scan nodes of the filtered list query."""
+        request = Request(self.make_request(user, params))
+        request.user = user
+        view = viewset(
+            request=request, format_kwarg=None, action='list', kwargs={},
+            detail=False,
+        )
+        queryset = view.filter_queryset(view.get_queryset()).order_by(
+            *view.ordering)[:view.paginator.page_size + 1]
+        plan = json.loads(
+            queryset.explain(format='json', analyze=True))[0]['Plan']
+        return ', '.join(
+            f'{node["Node Type"]} ({node["Actual Rows"]} rows)'
+            for node in walk_plan(plan) if 'Scan' in node['Node Type']
+        )
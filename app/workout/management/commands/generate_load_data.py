@@ -0,0 +1,266 @@
+"""
+Django command to fill the database with synthetic users and history.
+"""
+import csv
+import io
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import (
+    Exercise,
+    Progress,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutSession,
+)
+
+PLAN_NAMES = [
+    'Full Body', 'Upper/Lower', 'Push Pull Legs', 'Strength Base',
+    'Hypertrophy Block', 'Conditioning', 'Home Workout', 'Marathon Prep',
+]
+GOALS = [
+    'Build muscle', 'Lose fat', 'Get stronger', 'Improve endurance',
+    'Stay healthy',
+]
+FREQUENCIES = ([2, 3, 4, 5, 6], [0.15, 0.4, 0.25, 0.15, 0.05])
+SESSION_MINUTES = [30, 45, 60, 75, 90]
+SETS = ([2, 3, 4, 5], [0.1, 0.5, 0.3, 0.1])
+REPETITIONS = [5, 6, 8, 10, 12, 15, 20]
+
+
+def user_history(rng, history_days, exercise_ids):
+    """Return plans, plan exercises, sessions and progress for one user.
+
+    Day numbers count back from the last generated day, which is 0.
+    Plans carry their plan exercises and sessions; progress entries are
+    (day, weight) pairs.
+    """
+    joined = int(rng.integers(30, history_days + 1))
+    # Adherence and logging habits vary a lot more between people than
+    # from one week to the next.
+    adherence = rng.beta(5, 2)
+    logging = rng.beta(2, 2)
+
+    plans = []
+    for _ in range(1 + min(int(rng.poisson(0.8)), 4)):
+        frequency = int(rng.choice(FREQUENCIES[0], p=FREQUENCIES[1]))
+        count = min(int(rng.integers(4, 11)), len(exercise_ids))
+        exercises = rng.choice(exercise_ids, size=count, replace=False)
+
+        # Each plan runs for a stretch of the user's history and picks
+        # `frequency` distinct weekdays every week.
+        start = int(rng.integers(0, joined))
+        weeks = start // 7 + 1
+        offsets = rng.random((weeks, 7)).argsort(axis=1)[:, :frequency]
+        ago = start - (np.arange(weeks)[:, None] * 7 + offsets).ravel()
+        ago = np.sort(ago[ago >= 0])[::-1]
+
+        plans.append({
+            'name': str(rng.choice(PLAN_NAMES)),
+            'goal': str(rng.choice(GOALS)),
+            'frequency': frequency,
+            'minutes': int(rng.choice(SESSION_MINUTES)),
+            'exercises': list(zip(
+                exercises.tolist(),
+                rng.choice(SETS[0], size=count, p=SETS[1]).tolist(),
+                rng.choice(REPETITIONS, size=count).tolist(),
+            )),
+            'sessions': list(zip(
+                ago.tolist(), (rng.random(len(ago)) < adherence).tolist(),
+            )),
+        })
+
+    # A slow drift plus day-to-day noise around a personal start weight.
+    steps = rng.normal(rng.normal(-0.01, 0.02), 0.3, size=joined)
+    weights = rng.normal(80, 12) + np.cumsum(steps)
+    logged = np.flatnonzero(rng.random(joined) < logging)
+    progress = list(zip(
+        (joined - 1 - logged).tolist(),
+        np.round(weights[logged], 1).tolist(),
+    ))
+    return plans, progress
+
+
+class RowWriter:
+    """Write plain rows with COPY on PostgreSQL, else with bulk_create."""
+
+    def __init__(self, use_copy):
+        self.use_copy = use_copy
+        self.counts = {}
+
+    def write(self, model, fields, rows):
+        if not rows:
+            return
+        if self.use_copy:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            columns = ', '.join(
+                model._meta.get_field(field).column for field in fields)
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f'COPY {model._meta.db_table} ({columns}) '
+                    f'FROM STDIN WITH (FORMAT csv)',
+                    buffer,
+                )
+        else:
+            model.objects.bulk_create(
+                [model(**dict(zip(fields, row))) for row in rows],
+                batch_size=1000,
+            )
+        self.counts[model] = self.counts.get(model, 0) + len(rows)
+
+
+class Command(BaseCommand):
+    """Generate reproducible users, plans, sessions and progress."""
+    help = (
+        'Generates synthetic users with workout plans, plan exercises, '
+        'sessions and daily progress. The same seed always produces the '
+        'same data. Uses COPY on PostgreSQL and bulk_create elsewhere.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users', type=int, default=100,
+            help='Number of users to generate.',
+        )
+        parser.add_argument(
+            '--years', type=float, default=2,
+            help='Longest history a user can have, in years.',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=42,
+            help='Seed for every random choice.',
+        )
+        parser.add_argument(
+            '--end', type=date.fromisoformat, default=None,
+            help='Last day of history, YYYY-MM-DD (default: today).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Users to write per transaction.',
+        )
+        parser.add_argument(
+            '--method', choices=['auto', 'copy', 'bulk'], default='auto',
+            help='Write path (default: COPY on PostgreSQL, else bulk).',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        method = options['method']
+        if method == 'auto':
+            method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+        if method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('COPY requires PostgreSQL.')
+
+        exercise_ids = np.array(
+            Exercise.objects.order_by('id').values_list('id', flat=True))
+        if not len(exercise_ids):
+            raise CommandError(
+                'The exercise catalog is empty, run populate_exercises.')
+
+        seed = options['seed']
+        prefix = f'load-{seed}-'
+        if get_user_model().objects.filter(
+                email__startswith=prefix).exists():
+            raise CommandError(
+                f'Users for seed {seed} already exist, pick another seed.')
+
+        end = options['end'] or timezone.localdate()
+        history_days = max(30, int(options['years'] * 365))
+        self.days = [
+            (end - timedelta(days=ago)).isoformat()
+            for ago in range(history_days)
+        ]
+        self.now = timezone.now().isoformat()
+        # Hashing is deliberately slow, so every user shares one hash.
+        self.password = make_password('loadtest-password')
+        writer = RowWriter(use_copy=method == 'copy')
+
+        started = time.perf_counter()
+        total = options['users']
+        for first in range(0, total, options['chunk_size']):
+            last = min(first + options['chunk_size'], total)
+            with transaction.atomic():
+                self.write_users(writer, prefix, seed, range(first, last),
+                                 history_days, exercise_ids)
+            self.stdout.write(f'{last}/{total} users written.')
+
+        elapsed = time.perf_counter() - started
+        rows = sum(writer.counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {rows} rows in {elapsed:.1f}s '
+            f'({rows / max(elapsed, 1e-9):,.0f} rows/s): '
+            + ', '.join(
+                f'{model.__name__} {count}'
+                for model, count in writer.counts.items()
+            )
+        ))
+
+    def write_users(self, writer, prefix, seed, indexes, history_days,
+                    exercise_ids):
+        """Generate and write the users with the given indexes."""
+        User = get_user_model()
+        histories = [
+            # Seeding per user keeps the data independent of chunk size.
+            user_history(np.random.default_rng([seed, index]),
+                         history_days, exercise_ids)
+            for index in indexes
+        ]
+        users = User.objects.bulk_create([
+            User(email=f'{prefix}{index}@example.com',
+                 name=f'Load User {index}', password=self.password)
+            for index in indexes
+        ])
+        writer.counts[User] = writer.counts.get(User, 0) + len(users)
+
+        plans = WorkoutPlan.objects.bulk_create([
+            WorkoutPlan(
+                user=user, name=plan['name'], goal=plan['goal'],
+                frequency=plan['frequency'],
+                duration_per_session=timedelta(minutes=plan['minutes']),
+            )
+            for user, (user_plans, _) in zip(users, histories)
+            for plan in user_plans
+        ])
+        writer.counts[WorkoutPlan] = (
+            writer.counts.get(WorkoutPlan, 0) + len(plans))
+
+        plan_exercises, sessions, progress = [], [], []
+        plan_rows = iter(plans)
+        for user, (user_plans, entries) in zip(users, histories):
+            for plan in user_plans:
+                plan_pk = next(plan_rows).pk
+                plan_exercises += [
+                    (plan_pk, exercise, sets, repetitions, self.now)
+                    for exercise, sets, repetitions in plan['exercises']
+                ]
+                sessions += [
+                    (user.pk, plan_pk, self.days[ago], completed, self.now)
+                    for ago, completed in plan['sessions']
+                ]
+            progress += [
+                (user.pk, self.days[ago], weight, self.now)
+                for ago, weight in entries
+            ]
+
+        writer.write(
+            WorkoutPlanExercise,
+            ('workout_plan_id', 'exercise_id', 'sets', 'repetitions',
+             'updated_at'),
+            plan_exercises,
+        )
+        writer.write(
+            WorkoutSession,
+            ('user_id', 'workout_plan_id', 'date', 'completed', 'updated_at'),
+            sessions,
+        )
+        writer.write(
+            Progress, ('user_id', 'date', 'weight', 'updated_at'), progress)
@@ -0,0 +1,56 @@
+"""
+Django command to rebuild the weekly and monthly rollups from scratch.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.rollups import ROLLUPS, SOURCES, rebuild_sql
+
+
+class Command(BaseCommand):
+    """Recompute the rollup tables for every user, one chunk at a time."""
+    help = (
+        'Rebuilds the weekly and monthly rollups from the session and '
+        'progress tables, a chunk of users per transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=500,
+            help='Users to rebuild per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        user_ids = get_user_model().objects.order_by('id').values_list(
+            'id', flat=True)
+        chunk_size = options['chunk_size']
+        chunk = []
+        rebuilt = 0
+        for user_id in user_ids.iterator(chunk_size=chunk_size):
+            chunk.append(user_id)
+            if len(chunk) == chunk_size:
+                self.rebuild(chunk)
+                rebuilt += len(chunk)
+                chunk = []
+        if chunk:
+            self.rebuild(chunk)
+            rebuilt += len(chunk)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt rollups for {rebuilt} users.'))
+
+    def rebuild(self, user_ids):
+        """Replace the rollups of a chunk of users."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Hold off writes, and their triggers, until the chunk is done.
+            cursor.execute(
+                f'LOCK TABLE {", ".join(SOURCES)} IN SHARE MODE')
+            for table, period in ROLLUPS.items():
+                cursor.execute(
+                    f'DELETE FROM {table} WHERE user_id = ANY(%s)',
+                    [user_ids],
+                )
+                cursor.execute(
+                    rebuild_sql(table, period), [user_ids] * len(SOURCES))
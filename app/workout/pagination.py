@@ -0,0 +1,71 @@
+"""
+Pagination for the workout API.
+"""
+from bisect import bisect_left, bisect_right
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor
+
+
+class WorkoutCursorPagination(CursorPagination):
+    """
+    Keyset pagination ordered by the view's ``ordering`` attribute.
+
+    Each page filters on the first ordering field instead of using an
+    OFFSET, so deep pages cost the same as the first one.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+
+class CatalogCursorPagination(WorkoutCursorPagination):
+    """Keyset pagination over a catalog snapshot sorted by id."""
+
+    def paginate_snapshot(self, items, ids, request):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None or self.cursor.position is None:
+            start = 0
+            end = self.page_size
+        else:
+            try:
+                position = int(self.cursor.position)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+            if self.cursor.reverse:
+                end = bisect_left(ids, position)
+                start = max(0, end - self.page_size)
+            else:
+                start = bisect_right(ids, position)
+                end = start + self.page_size
+
+        self.page = items[start:end]
+        self.has_previous = bool(self.page) and start > 0
+        self.has_next = bool(self.page) and end < len(items)
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        cursor = Cursor(
+            offset=0, reverse=False, position=str(self.page[-1]['id'])
+        )
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        cursor = Cursor(
+            offset=0, reverse=True, position=str(self.page[0]['id'])
+        )
+        return self.encode_cursor(cursor)
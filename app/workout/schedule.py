@@ -0,0 +1,39 @@
+"""
+Generate the dated sessions of a workout plan.
+
+A plan only says how many sessions a week it wants. The generator splits
+the requested period into 7-day blocks starting on the start date and
+picks `frequency` days in each block. Without preferred weekdays the days
+are spread evenly across the block; with them, they are spread evenly
+across the preferred weekdays instead.
+"""
+from datetime import timedelta
+
+DAYS_PER_WEEK = 7
+
+
+def spread(options, count):
+    """Pick `count` items from `options`, spaced as evenly as possible."""
+    return [options[i * len(options) // count] for i in range(count)]
+
+
+def schedule_dates(start, weeks, frequency, weekdays=None):
+    """Return the session dates for `weeks` weeks from `start`.
+
+    `weekdays` are ISO-style day numbers with Monday as 0, and there must
+    be at least `frequency` of them.
+    """
+    if weekdays:
+        # Offsets from the start date of each preferred weekday.
+        offsets = sorted(
+            (day - start.weekday()) % DAYS_PER_WEEK for day in set(weekdays)
+        )
+    else:
+        offsets = list(range(DAYS_PER_WEEK))
+    offsets = spread(offsets, frequency)
+
+    return [
+        start + timedelta(days=week * DAYS_PER_WEEK + offset)
+        for week in range(weeks)
+        for offset in offsets
+    ]
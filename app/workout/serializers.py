@@ -1,3 +1,4 @@
+from django.utils import timezone
 from rest_framework import serializers
 from core.models import (
     MuscleGroup,
@@ -5,10 +6,14 @@ from core.models import (
     WorkoutPlan,
     WorkoutPlanExercise,
     WorkoutSession,
-    Progress
+    Progress,
+    WeeklyRollup,
+    MonthlyRollup,
 )
 from typing import List
 
+from workout.schedule import DAYS_PER_WEEK
+
 
 class MuscleGroupSerializer(serializers.ModelSerializer):
     class Meta:
@@ -18,8 +23,10 @@ class MuscleGroupSerializer(serializers.ModelSerializer):
 
 
 class ExerciseSerializer(serializers.ModelSerializer):
-    target_muscles = serializers.PrimaryKeyRelatedField(
-        many=True, queryset=MuscleGroup.objects.all(), write_only=True
+    # A plain list, looked up in one query below; a many
+    # PrimaryKeyRelatedField runs one query per id.
+    target_muscles = serializers.ListField(
+        child=serializers.IntegerField(), write_only=True
     )
     target_muscle_names = serializers.SerializerMethodField()
 
@@ -36,11 +43,66 @@ class ExerciseSerializer(serializers.ModelSerializer):
             exercise.target_muscles.set(target_muscles_data)
         return exercise
 
+    def validate_target_muscles(self, value):
+        """Return the muscle groups for the given ids."""
+        muscles = MuscleGroup.objects.in_bulk(value)
+        for pk in value:
+            if pk not in muscles:
+                raise serializers.ValidationError(
+                    f'Invalid pk "{pk}" - object does not exist.')
+        return [muscles[pk] for pk in dict.fromkeys(value)]
+
     def get_target_muscle_names(self, obj) -> List[str]:
         """Return a list of muscle names."""
         return [muscle.name for muscle in obj.target_muscles.all()]
 
 
+class ExerciseSearchSerializer(serializers.Serializer):
+    """Validate the query parameters of the exercise search."""
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class ExerciseFilterSerializer(serializers.Serializer):
+    """Validate the muscle filter of the exercise list."""
+    muscles = serializers.CharField(
+        help_text="Comma-separated muscle group ids")
+    match = serializers.ChoiceField(
+        choices=['all', 'any', 'none'], default='all')
+
+    def validate_muscles(self, value):
+        try:
+            muscles = {int(pk) for pk in value.split(',') if pk.strip()}
+        except ValueError:
+            raise serializers.ValidationError(
+                "Expected comma-separated muscle group ids.")
+        if not muscles:
+            raise serializers.ValidationError(
+                "Provide at least one muscle group id.")
+        return sorted(muscles)
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    """Validate the query parameters of the autocomplete endpoint."""
+    q = serializers.CharField(max_length=100)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Validate the query parameters of a history export."""
+    type = serializers.ChoiceField(
+        choices=['ndjson', 'csv'], default='ndjson')
+
+
+class NameSuggestionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class AutocompleteSerializer(serializers.Serializer):
+    exercises = NameSuggestionSerializer(many=True)
+    muscle_groups = NameSuggestionSerializer(many=True)
+
+
 class WorkoutPlanSerializer(serializers.ModelSerializer):
     class Meta:
         model = WorkoutPlan
@@ -55,6 +117,67 @@ class WorkoutPlanSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user']
 
 
+class MuscleGroupSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MuscleGroup
+        fields = ['id', 'name']
+
+
+class ExerciseSummarySerializer(serializers.ModelSerializer):
+    target_muscles = MuscleGroupSummarySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Exercise
+        fields = ['id', 'name', 'target_muscles']
+
+
+class NestedWorkoutPlanExerciseSerializer(serializers.ModelSerializer):
+    exercise = ExerciseSummarySerializer(read_only=True)
+
+    class Meta:
+        model = WorkoutPlanExercise
+        fields = [
+            'id',
+            'repetitions',
+            'sets',
+            'duration',
+            'distance',
+            'exercise'
+        ]
+
+
+class WorkoutPlanDetailSerializer(WorkoutPlanSerializer):
+    """A workout plan with its exercises and their target muscles."""
+    exercises = NestedWorkoutPlanExerciseSerializer(
+        source='workout_plan_exercises', many=True, read_only=True)
+
+    class Meta(WorkoutPlanSerializer.Meta):
+        fields = WorkoutPlanSerializer.Meta.fields + ['exercises']
+
+
+class WorkoutPlanExpandSerializer(serializers.Serializer):
+    """Validate the expand parameter of the workout plan endpoints."""
+    expand = serializers.ChoiceField(
+        choices=['exercises'], required=False,
+        help_text="Set to 'exercises' to nest the plan's exercises")
+
+
+class WorkoutPlanCloneSerializer(serializers.Serializer):
+    """Overrides applied while copying a workout plan."""
+    name = serializers.CharField(
+        max_length=255, required=False,
+        help_text="Name of the copy (defaults to the original's name)")
+    frequency = serializers.IntegerField(
+        min_value=1, required=False,
+        help_text="Sessions per week (defaults to the original's)")
+    sets_scale = serializers.FloatField(
+        min_value=0.1, max_value=10, default=1,
+        help_text="Multiply every exercise's sets by this factor")
+    repetitions_scale = serializers.FloatField(
+        min_value=0.1, max_value=10, default=1,
+        help_text="Multiply every exercise's repetitions by this factor")
+
+
 class WorkoutPlanExerciseSerializer(serializers.ModelSerializer):
     exercise = serializers.PrimaryKeyRelatedField(
         queryset=Exercise.objects.all())
@@ -75,6 +198,126 @@ class WorkoutPlanExerciseSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class WorkoutPlanExerciseBulkItemSerializer(serializers.ModelSerializer):
+    """Validate one row of a bulk write without touching the database."""
+    id = serializers.IntegerField(
+        required=False, help_text="Set to update an existing row")
+    exercise = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = WorkoutPlanExercise
+        fields = [
+            'id',
+            'repetitions',
+            'sets',
+            'duration',
+            'distance',
+            'exercise'
+        ]
+
+
+class WorkoutPlanExerciseBulkSerializer(serializers.Serializer):
+    """Validate the envelope of a bulk write to one workout plan."""
+    workout_plan = serializers.IntegerField()
+    items = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=500)
+
+
+class BulkItemErrorSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class WorkoutPlanExerciseBulkResultSerializer(serializers.Serializer):
+    created = WorkoutPlanExerciseSerializer(many=True)
+    updated = WorkoutPlanExerciseSerializer(many=True)
+    errors = BulkItemErrorSerializer(many=True)
+
+
+class ProgressImportSerializer(serializers.Serializer):
+    """Validate a progress import upload."""
+    file = serializers.FileField()
+    type = serializers.ChoiceField(choices=['csv', 'ndjson'], default='csv')
+    on_conflict = serializers.ChoiceField(
+        choices=['skip', 'overwrite'], default='skip',
+        help_text="What to do with dates that are already logged")
+
+
+class ImportRowErrorSerializer(serializers.Serializer):
+    line = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class ProgressImportResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+    errors = ImportRowErrorSerializer(many=True)
+
+
+class ProgressAnalyticsQuerySerializer(serializers.Serializer):
+    """Validate the query parameters of the progress analytics."""
+    halflife = serializers.IntegerField(
+        min_value=1, max_value=90, default=10,
+        help_text="Half-life in days of the weighted trend")
+    horizon = serializers.IntegerField(
+        min_value=1, max_value=365, default=30,
+        help_text="Days ahead to project the weight")
+
+
+class WeightSeriesSerializer(serializers.Serializer):
+    date = serializers.ListField(child=serializers.DateField())
+    weight = serializers.ListField(child=serializers.FloatField())
+    mean_7 = serializers.ListField(
+        child=serializers.FloatField(allow_null=True))
+    mean_30 = serializers.ListField(
+        child=serializers.FloatField(allow_null=True))
+    trend = serializers.ListField(child=serializers.FloatField())
+
+
+class WeeklyWeightSerializer(serializers.Serializer):
+    week = serializers.ListField(child=serializers.DateField())
+    mean = serializers.ListField(child=serializers.FloatField())
+    delta = serializers.ListField(
+        child=serializers.FloatField(allow_null=True))
+
+
+class WeightProjectionSerializer(serializers.Serializer):
+    slope_per_week = serializers.FloatField()
+    date = serializers.DateField()
+    weight = serializers.FloatField()
+
+
+class ProgressAnalyticsSerializer(serializers.Serializer):
+    series = WeightSeriesSerializer()
+    weekly = WeeklyWeightSerializer()
+    projection = WeightProjectionSerializer(allow_null=True)
+
+
+class AdherenceQuerySerializer(serializers.Serializer):
+    """Validate the query parameters of an adherence report."""
+    weeks = serializers.IntegerField(
+        min_value=1, max_value=520, default=12,
+        help_text="Number of most recent weeks to return")
+    window = serializers.IntegerField(
+        min_value=1, max_value=52, default=4,
+        help_text="Weeks in the rolling adherence percentage")
+
+
+class AdherenceWeekSerializer(serializers.Serializer):
+    week = serializers.DateField()
+    target = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    scheduled = serializers.IntegerField()
+    adherence = serializers.FloatField(allow_null=True)
+    rolling_adherence = serializers.FloatField(allow_null=True)
+
+
+class AdherenceSerializer(serializers.Serializer):
+    current_streak = serializers.IntegerField()
+    weeks = AdherenceWeekSerializer(many=True)
+
+
 class WorkoutSessionSerializer(serializers.ModelSerializer):
     workout_plan = serializers.PrimaryKeyRelatedField(
         queryset=WorkoutPlan.objects.all())
@@ -86,6 +329,116 @@ class WorkoutSessionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'user']
 
 
+class DateRangeSerializer(serializers.Serializer):
+    """Validate an inclusive ``from``/``to`` date range."""
+
+    def get_fields(self):
+        # `from` is a Python keyword, so these cannot be class attributes.
+        fields = super().get_fields()
+        fields['from'] = serializers.DateField(
+            required=False, help_text="First date to include")
+        fields['to'] = serializers.DateField(
+            required=False, help_text="Last date to include")
+        return fields
+
+    def validate(self, attrs):
+        if 'from' in attrs and 'to' in attrs and attrs['from'] > attrs['to']:
+            raise serializers.ValidationError(
+                {'to': ["Must not be before 'from'."]})
+        return attrs
+
+
+class OptionalBooleanField(serializers.BooleanField):
+    """A boolean query parameter that is left out, not False, if absent."""
+    default_empty_html = serializers.empty
+
+
+class WorkoutSessionFilterSerializer(DateRangeSerializer):
+    """Validate the filters of the workout session list."""
+    plan = serializers.IntegerField(
+        min_value=1, required=False,
+        help_text="Only sessions of this workout plan")
+    completed = OptionalBooleanField(
+        allow_null=True, required=False,
+        help_text="Only completed (true) or pending (false) sessions")
+
+
+class WorkoutSessionBatchSerializer(DateRangeSerializer):
+    """Validate a batch transition of workout sessions.
+
+    Sessions are picked either by ``ids`` or by a ``from``/``to`` range,
+    optionally narrowed to one ``workout_plan``.
+    """
+    operation = serializers.ChoiceField(
+        choices=['complete', 'uncomplete', 'reschedule'])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False, allow_empty=False, max_length=1000)
+    workout_plan = serializers.IntegerField(min_value=1, required=False)
+    days = serializers.IntegerField(
+        min_value=-365, max_value=365, required=False,
+        help_text="Days to move the sessions by when rescheduling")
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        by_range = {'from', 'to', 'workout_plan'} & attrs.keys()
+        if 'ids' in attrs and by_range:
+            raise serializers.ValidationError(
+                "Select sessions by ids or by date range, not both.")
+        if 'ids' not in attrs and not {'from', 'to'} <= attrs.keys():
+            raise serializers.ValidationError(
+                "Provide either ids or both 'from' and 'to'.")
+
+        if attrs['operation'] == 'reschedule':
+            if not attrs.get('days'):
+                raise serializers.ValidationError(
+                    {'days': ["A non-zero number of days is required."]})
+        elif 'days' in attrs:
+            raise serializers.ValidationError(
+                {'days': ["Only used when rescheduling."]})
+        return attrs
+
+
+class WorkoutSessionBatchResultSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
+
+
+class WorkoutScheduleSerializer(serializers.Serializer):
+    """Validate a request to generate a plan's sessions.
+
+    Expects the plan being scheduled as ``plan`` in the context.
+    """
+    start = serializers.DateField(
+        default=timezone.localdate,
+        help_text="First day of the schedule (defaults to today)")
+    weeks = serializers.IntegerField(
+        min_value=1, max_value=104,
+        help_text="Number of weeks to schedule")
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        required=False, allow_empty=False, max_length=7,
+        help_text="Preferred days, 0 for Monday to 6 for Sunday")
+
+    def validate(self, attrs):
+        frequency = self.context['plan'].frequency
+        if frequency < 1:
+            raise serializers.ValidationError(
+                "The plan has no sessions a week to schedule.")
+        days = len(set(attrs.get('weekdays', range(DAYS_PER_WEEK))))
+        if frequency > days:
+            raise serializers.ValidationError(
+                f"A frequency of {frequency} needs at least {frequency} "
+                f"days a week, got {days}."
+            )
+        return attrs
+
+
+class WorkoutScheduleResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+    sessions = WorkoutSessionSerializer(many=True)
+
+
 class ProgressSerializer(serializers.ModelSerializer):
     user = serializers.StringRelatedField()
 
@@ -94,14 +447,44 @@ class ProgressSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "date", "weight", "notes"]
         read_only_fields = ["id", "user"]
 
-    def validate_date(self, value):
-        """Check if a progress entry already exists for the date"""
-        user = self.context['request'].user
-        progress_id = self.instance.id if self.instance else None
 
-        if Progress.objects.filter(
-            user=user, date=value
-        ).exclude(id=progress_id).exists():
-            raise serializers.ValidationError(
-                "You have already logged progress for this date")
-        return value
+class ProgressUpsertSerializer(serializers.ModelSerializer):
+    """Validate the body of an upsert by date."""
+
+    class Meta:
+        model = Progress
+        fields = ["weight", "notes"]
+
+
+class WeeklyRollupSerializer(serializers.ModelSerializer):
+    completion_rate = serializers.FloatField(read_only=True, allow_null=True)
+    average_weight = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = WeeklyRollup
+        fields = [
+            'week',
+            'sessions',
+            'completed_sessions',
+            'completion_rate',
+            'progress_entries',
+            'average_weight'
+        ]
+        read_only_fields = fields
+
+
+class MonthlyRollupSerializer(serializers.ModelSerializer):
+    completion_rate = serializers.FloatField(read_only=True, allow_null=True)
+    average_weight = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = MonthlyRollup
+        fields = [
+            'month',
+            'sessions',
+            'completed_sessions',
+            'completion_rate',
+            'progress_entries',
+            'average_weight'
+        ]
+        read_only_fields = fields
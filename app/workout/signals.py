@@ -0,0 +1,73 @@
+"""
+Signal handlers for the workout app.
+"""
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import transaction
+from django.db.models import OuterRef
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import MuscleGroup, Exercise
+from workout.catalog import bump_catalog_version
+
+
+@receiver(post_save, sender=MuscleGroup)
+@receiver(post_delete, sender=MuscleGroup)
+@receiver(post_save, sender=Exercise)
+@receiver(post_delete, sender=Exercise)
+@receiver(m2m_changed, sender=Exercise.target_muscles.through)
+def invalidate_catalog(sender, **kwargs):
+    """Bump the catalog version when muscle groups or exercises change."""
+    if kwargs.get('action', 'post_').startswith('pre_'):
+        return
+    bump_catalog_version()
+    # Bump again once committed so a snapshot rebuilt from pre-commit data
+    # inside the transaction window is discarded too.
+    transaction.on_commit(bump_catalog_version)
+
+
+def refresh_target_muscles(exercises):
+    """Recompute target_muscle_ids and updated_at in one UPDATE."""
+    through = Exercise.target_muscles.through
+    exercises.update(
+        updated_at=timezone.now(),
+        target_muscle_ids=ArraySubquery(
+            through.objects.filter(
+                exercise_id=OuterRef('pk')
+            ).order_by('musclegroup_id').values('musclegroup_id')
+        ),
+    )
+
+
+@receiver(m2m_changed, sender=Exercise.target_muscles.through)
+def sync_target_muscles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep the denormalized muscle ids of changed exercises current."""
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        # Also refresh the instance so a later save() does not write
+        # stale values back.
+        instance.target_muscle_ids = sorted(
+            sender.objects.filter(
+                exercise_id=instance.pk
+            ).values_list('musclegroup_id', flat=True)
+        )
+        instance.updated_at = timezone.now()
+        Exercise.objects.filter(pk=instance.pk).update(
+            target_muscle_ids=instance.target_muscle_ids,
+            updated_at=instance.updated_at,
+        )
+    elif action == 'post_clear':
+        refresh_target_muscles(Exercise.objects.filter(
+            target_muscle_ids__contains=[instance.pk]))
+    else:
+        refresh_target_muscles(Exercise.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_delete, sender=MuscleGroup)
+def drop_deleted_muscle(sender, instance, **kwargs):
+    """Remove a deleted muscle group from the exercises that targeted it."""
+    refresh_target_muscles(Exercise.objects.filter(
+        target_muscle_ids__contains=[instance.pk]))
@@ -0,0 +1,168 @@
+from django.urls import reverse
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import WorkoutPlan, WorkoutSession
+from workout.adherence import plan_adherence
+from datetime import date, timedelta
+
+
+def adherence_url(workout_plan_id):
+    """Return the adherence URL for a specific workout plan"""
+    return reverse('workout:workout-plan-adherence', args=[workout_plan_id])
+
+
+def overall_adherence_url():
+    """Return the adherence URL across all workout plans"""
+    return reverse('workout:workout-plan-overall-adherence')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Helper function to create a new user"""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_workout_plan(user, name="Full Body Strength", frequency=3):
+    """Helper function to create a workout plan"""
+    return WorkoutPlan.objects.create(
+        user=user,
+        name=name,
+        frequency=frequency,
+        goal="Build muscle & strength",
+        duration_per_session=timedelta(hours=1)
+    )
+
+
+class AdherenceTests(TestCase):
+    """Test the weekly adherence calculation"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.plan = create_workout_plan(self.user, frequency=2)
+        # A Wednesday, so the current week is under way.
+        self.today = date(2024, 3, 13)
+
+    def log(self, week_start, completed, missed=0):
+        """Log sessions in the week starting on `week_start`"""
+        WorkoutSession.objects.bulk_create([
+            WorkoutSession(user=self.user, workout_plan=self.plan,
+                           date=week_start + timedelta(days=i),
+                           completed=i < completed)
+            for i in range(completed + missed)
+        ])
+
+    def test_weekly_target_vs_completed(self):
+        """Test each week reports its target and completed sessions"""
+        self.log(date(2024, 2, 26), completed=1, missed=1)
+        self.log(date(2024, 3, 4), completed=3)
+
+        report = plan_adherence(self.user, self.plan, today=self.today)
+
+        self.assertEqual(report['weeks'], [
+            {'week': date(2024, 3, 11), 'target': 2, 'completed': 0,
+             'scheduled': 0, 'adherence': 0.0, 'rolling_adherence': 50.0},
+            {'week': date(2024, 3, 4), 'target': 2, 'completed': 3,
+             'scheduled': 3, 'adherence': 100.0, 'rolling_adherence': 75.0},
+            {'week': date(2024, 2, 26), 'target': 2, 'completed': 1,
+             'scheduled': 2, 'adherence': 50.0, 'rolling_adherence': 50.0},
+        ])
+
+    def test_streak_skips_current_week(self):
+        """Test the streak counts met weeks up to an unfinished week"""
+        self.log(date(2024, 2, 12), completed=2)
+        self.log(date(2024, 2, 19), completed=1)
+        self.log(date(2024, 2, 26), completed=2)
+        self.log(date(2024, 3, 4), completed=2)
+
+        report = plan_adherence(self.user, self.plan, today=self.today)
+
+        self.assertEqual(report['current_streak'], 2)
+
+    def test_streak_includes_met_current_week(self):
+        """Test the current week extends the streak once it is met"""
+        self.log(date(2024, 3, 4), completed=2)
+        self.log(date(2024, 3, 11), completed=2)
+
+        report = plan_adherence(self.user, self.plan, today=self.today)
+
+        self.assertEqual(report['current_streak'], 2)
+
+    def test_empty_week_breaks_streak(self):
+        """Test a week without sessions counts as a miss"""
+        self.log(date(2024, 2, 19), completed=2)
+        self.log(date(2024, 3, 4), completed=2)
+
+        report = plan_adherence(self.user, self.plan, today=self.today)
+
+        self.assertEqual(report['current_streak'], 1)
+        self.assertEqual(report['weeks'][2]['completed'], 0)
+
+    def test_all_plans_sum_targets(self):
+        """Test the overall report targets the sum of plan frequencies"""
+        other_plan = create_workout_plan(self.user, "Cardio", frequency=1)
+        self.log(date(2024, 3, 4), completed=2)
+        WorkoutSession.objects.create(
+            user=self.user, workout_plan=other_plan,
+            date=date(2024, 3, 5), completed=True)
+
+        report = plan_adherence(self.user, today=self.today)
+
+        self.assertEqual(report['weeks'][1]['target'], 3)
+        self.assertEqual(report['weeks'][1]['completed'], 3)
+
+    def test_no_sessions(self):
+        """Test a plan without sessions has an empty report"""
+        report = plan_adherence(self.user, self.plan, today=self.today)
+
+        self.assertEqual(report, {'current_streak': 0, 'weeks': []})
+
+
+class AdherenceApiTests(TestCase):
+    """Test the adherence endpoints"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.plan = create_workout_plan(self.user)
+        today = timezone.localdate()
+        WorkoutSession.objects.bulk_create([
+            WorkoutSession(user=self.user, workout_plan=self.plan,
+                           date=today - timedelta(days=i),
+                           completed=i % 3 != 0)
+            for i in range(2000)
+        ])
+
+    def test_plan_adherence(self):
+        """Test the plan report uses one query after the plan lookup"""
+        with self.assertNumQueries(2):
+            res = self.client.get(adherence_url(self.plan.id), {'weeks': 8})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['weeks']), 8)
+        self.assertEqual(res.data['weeks'][1]['target'], 3)
+
+    def test_overall_adherence(self):
+        """Test the overall report is a single query"""
+        with self.assertNumQueries(1):
+            res = self.client.get(overall_adherence_url())
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['weeks']), 12)
+
+    def test_other_users_plan(self):
+        """Test another user's plan returns 404"""
+        other_plan = create_workout_plan(
+            create_user(email='other@example.com'))
+
+        res = self.client.get(adherence_url(other_plan.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_window(self):
+        """Test an out of range window returns 400"""
+        res = self.client.get(overall_adherence_url(), {'window': 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,101 @@
+from django.urls import reverse
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import Exercise, MuscleGroup
+from workout.autocomplete import AUTOCOMPLETE_LIMIT, autocomplete
+
+
+def autocomplete_url():
+    """Return the autocomplete URL"""
+    return reverse('workout:autocomplete')
+
+
+def create_exercise(name):
+    """Helper function to create an exercise"""
+    return Exercise.objects.create(
+        name=name, description="Sample description")
+
+
+class PublicAutocompleteApiTests(TestCase):
+    """Test unauthenticated autocomplete requests"""
+
+    def test_auth_required(self):
+        """Test authentication is required for autocomplete"""
+        res = APIClient().get(autocomplete_url(), {'q': 'bench'})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PrivateAutocompleteApiTests(TestCase):
+    """Test authenticated autocomplete requests"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for name in ["Bench Press", "Deadlift", "Romanian Deadlift",
+                     "Incline Bench Press", "Squat"]:
+            create_exercise(name)
+        MuscleGroup.objects.create(name="Back")
+        MuscleGroup.objects.create(name="Biceps")
+
+    def test_prefix_matches_first(self):
+        """Test names starting with the query come before other matches"""
+        res = self.client.get(autocomplete_url(), {'q': 'bench pr'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        names = [item['name'] for item in res.data['exercises']]
+        self.assertEqual(names[0], "Bench Press")
+        self.assertIn("Incline Bench Press", names)
+
+    def test_fuzzy_matches_typos(self):
+        """Test misspelt queries still find the exercise"""
+        res = self.client.get(autocomplete_url(), {'q': 'deadlfit'})
+
+        names = [item['name'] for item in res.data['exercises']]
+        self.assertIn("Deadlift", names)
+        self.assertIn("Romanian Deadlift", names)
+        self.assertNotIn("Squat", names)
+
+    def test_muscle_groups_matched(self):
+        """Test muscle groups are suggested alongside exercises"""
+        res = self.client.get(autocomplete_url(), {'q': 'b'})
+
+        self.assertEqual(
+            [item['name'] for item in res.data['muscle_groups']],
+            ["Back", "Biceps"],
+        )
+
+    def test_results_are_limited(self):
+        """Test suggestions are capped at a small fixed number"""
+        for i in range(AUTOCOMPLETE_LIMIT + 5):
+            create_exercise(f"Bench Variation {i}")
+
+        res = self.client.get(autocomplete_url(), {'q': 'bench'})
+
+        self.assertEqual(len(res.data['exercises']), AUTOCOMPLETE_LIMIT)
+
+    def test_query_required(self):
+        """Test autocomplete without q is rejected"""
+        res = self.client.get(autocomplete_url())
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FuzzyThresholdTests(TransactionTestCase):
+    """Test the fuzzy threshold is scoped to the autocomplete query"""
+
+    def test_threshold_not_kept_on_connection(self):
+        """Test the connection keeps the pg_trgm default afterwards"""
+        create_exercise("Deadlift")
+
+        names = [item['name'] for item in autocomplete('deadlfit')[
+            'exercises']]
+
+        self.assertEqual(names, ["Deadlift"])
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW pg_trgm.word_similarity_threshold')
+            self.assertEqual(cursor.fetchone()[0], '0.6')
@@ -0,0 +1,24 @@
+"""
+Tests for the benchmark helpers.
+"""
+from django.test import SimpleTestCase
+
+from workout.benchmark import percentile
+
+
+class PercentileTests(SimpleTestCase):
+    """Test the nearest-rank percentile."""
+
+    def test_median_of_odd_count(self):
+        """Test p50 of an odd number of samples is the middle one."""
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 0.5), 3)
+
+    def test_nearest_rank(self):
+        """Test each percentile takes the first sample covering it."""
+        samples = list(range(1, 21))
+
+        self.assertEqual(percentile(samples, 0.95), 19)
+        self.assertEqual(percentile(samples, 0.99), 20)
+        self.assertEqual(percentile(samples, 0.01), 1)
+        self.assertEqual(percentile(samples, 0), 1)
+        self.assertEqual(percentile(samples, 1), 20)
@@ -0,0 +1,138 @@
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+from core.models import Exercise, MuscleGroup
+from workout.catalog import (
+    CATALOG_VERSION_KEY,
+    bump_catalog_version,
+    check_shared_cache,
+    clear_catalog_cache,
+    get_catalog_version,
+)
+
+
+def exercise_url():
+    """Return the exercise list URL"""
+    return reverse('workout:exercise-list')
+
+
+def exercise_detail_url(exercise_id):
+    """Return the detail URL for a specific exercise"""
+    return reverse('workout:exercise-detail', args=[exercise_id])
+
+
+def muscle_group_url():
+    """Return the muscle group list URL"""
+    return reverse('workout:muscle-group-list')
+
+
+class CatalogCacheTests(APITestCase):
+    """Test the cached catalog read path"""
+
+    def setUp(self):
+        clear_catalog_cache()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.muscle_group = MuscleGroup.objects.create(
+            name="Chest", description="Muscles of the chest")
+        self.exercise = Exercise.objects.create(
+            name="Push-up",
+            description="Chest exercise",
+            instructions="Lower and push up body"
+        )
+        self.exercise.target_muscles.set([self.muscle_group])
+
+    def test_steady_state_reads_skip_database(self):
+        """Test repeated catalog reads are served without queries"""
+        self.client.get(exercise_url())
+        self.client.get(muscle_group_url())
+
+        with self.assertNumQueries(0):
+            res_list = self.client.get(exercise_url())
+            res_detail = self.client.get(
+                exercise_detail_url(self.exercise.id))
+            res_muscles = self.client.get(muscle_group_url())
+
+        self.assertEqual(res_list.status_code, status.HTTP_200_OK)
+        self.assertEqual(res_detail.data['name'], "Push-up")
+        self.assertEqual(res_muscles.data['results'][0]['name'], "Chest")
+
+    def test_retrieve_missing_exercise(self):
+        """Test retrieving an unknown exercise returns 404"""
+        res = self.client.get(exercise_detail_url(self.exercise.id + 1))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_save_invalidates_snapshot(self):
+        """Test renaming a muscle group is visible on the next read"""
+        self.client.get(exercise_url())
+
+        self.muscle_group.name = "Pecs"
+        self.muscle_group.save()
+        self.exercise.name = "Wide Push-up"
+        self.exercise.save()
+        res = self.client.get(exercise_url())
+
+        exercise = res.data['results'][0]
+        self.assertEqual(exercise['name'], "Wide Push-up")
+        self.assertEqual(exercise['target_muscle_names'], ["Pecs"])
+
+    def test_m2m_change_invalidates_snapshot(self):
+        """Test changing target muscles is visible on the next read"""
+        self.client.get(exercise_url())
+
+        self.exercise.target_muscles.clear()
+        res = self.client.get(exercise_detail_url(self.exercise.id))
+
+        self.assertEqual(res.data['target_muscle_names'], [])
+
+    def test_delete_invalidates_snapshot(self):
+        """Test a deleted exercise drops out of the catalog"""
+        self.client.get(exercise_url())
+
+        self.exercise.delete()
+        res = self.client.get(exercise_url())
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_version_is_monotonic(self):
+        """Test every bump yields a larger catalog version"""
+        version = get_catalog_version()
+        self.assertGreater(bump_catalog_version(), version)
+        self.assertGreater(get_catalog_version(), version)
+
+    def test_bump_from_another_worker_invalidates_snapshot(self):
+        """Test a version bumped in the shared cache triggers a rebuild"""
+        self.client.get(exercise_url())
+
+        # Another worker's write: the rows change and the shared version
+        # moves, but this process's snapshots are left alone.
+        Exercise.objects.filter(pk=self.exercise.pk).update(name="Dip")
+        get_catalog_version()
+        cache.incr(CATALOG_VERSION_KEY)
+        res = self.client.get(exercise_detail_url(self.exercise.id))
+
+        self.assertEqual(res.data['name'], "Dip")
+
+
+class SharedCacheCheckTests(APITestCase):
+    """Test the system check for a shared catalog version"""
+
+    def test_configured_cache_is_shared(self):
+        """Test the project's cache passes the check"""
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_process_local_cache_warns(self):
+        """Test a per-process cache is reported"""
+        warnings = check_shared_cache(None)
+
+        self.assertEqual([warning.id for warning in warnings],
+                         ['workout.W001'])
@@ -0,0 +1,225 @@
+"""
+Test workout management commands.
+"""
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import TestCase
+
+from core.models import (
+    MonthlyRollup,
+    Progress,
+    WeeklyRollup,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutSession,
+)
+from datetime import date
+
+
+class AuditIndexesCommandTests(TestCase):
+    """Test the audit_indexes command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123')
+        Progress.objects.create(user=self.user, date=date(2025, 1, 1))
+
+    def test_audit_reports_every_viewset(self):
+        """Test every registered viewset is explained."""
+        out = StringIO()
+
+        call_command('audit_indexes', user='user@example.com', stdout=out)
+
+        for prefix in ('muscle_groups', 'exercises', 'workout_plan',
+                       'workout_plan_exercise', 'workout_session',
+                       'progress', 'rollups/weekly', 'rollups/monthly'):
+            self.assertIn(f'{prefix}:', out.getvalue())
+
+    def test_audit_flags_nodes_over_threshold(self):
+        """Test scans over the threshold are flagged and can fail."""
+        out = StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command(
+                'audit_indexes', threshold=-1, analyze=True, fail=True,
+                stdout=out,
+            )
+
+        self.assertIn('Sort on core_progress.date DESC', out.getvalue())
+
+    def test_audit_unknown_user(self):
+        """Test an unknown user is reported as an error."""
+        with self.assertRaises(CommandError):
+            call_command('audit_indexes', user='missing@example.com')
+
+
+class RebuildRollupsCommandTests(TestCase):
+    """Test the rebuild_rollups command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'testpass123')
+        Progress.objects.bulk_create([
+            Progress(user=self.user, date=date(2025, 1, day), weight=80)
+            for day in range(1, 29)
+        ])
+
+    def test_rebuild_restores_rollups(self):
+        """Test rebuilding replaces drifted and missing rollups."""
+        expected = list(WeeklyRollup.objects.order_by('week').values_list(
+            'week', 'progress_entries', 'weight_total'))
+        WeeklyRollup.objects.filter(week=date(2025, 1, 6)).delete()
+        WeeklyRollup.objects.update(progress_entries=99)
+        MonthlyRollup.objects.all().delete()
+
+        call_command('rebuild_rollups', chunk_size=1, stdout=StringIO())
+
+        self.assertEqual(
+            list(WeeklyRollup.objects.order_by('week').values_list(
+                'week', 'progress_entries', 'weight_total')),
+            expected)
+        self.assertEqual(
+            MonthlyRollup.objects.get(user=self.user).progress_entries, 28)
+
+    def test_rebuild_matches_triggers(self):
+        """Test a rebuild yields every counter the triggers maintain."""
+        plan = WorkoutPlan.objects.create(
+            user=self.user, name='Full Body', frequency=3, goal='Strength')
+        WorkoutSession.objects.bulk_create([
+            WorkoutSession(user=self.user, workout_plan=plan,
+                           date=date(2025, 1, day), completed=day % 2 == 0)
+            for day in range(1, 15)
+        ])
+        Progress.objects.filter(date__day__gt=20).update(weight=None)
+        fields = ('sessions', 'completed_sessions', 'progress_entries',
+                  'weight_entries', 'weight_total')
+        rollups = [(WeeklyRollup, 'week'), (MonthlyRollup, 'month')]
+        expected = [
+            list(model.objects.order_by(period).values_list(period, *fields))
+            for model, period in rollups
+        ]
+        for model, _ in rollups:
+            model.objects.all().delete()
+
+        call_command('rebuild_rollups', stdout=StringIO())
+
+        self.assertEqual([
+            list(model.objects.order_by(period).values_list(period, *fields))
+            for model, period in rollups
+        ], expected)
+
+
+class BenchmarkHistoryCommandTests(TestCase):
+    """Test the benchmark_history command."""
+
+    def test_benchmark_reports_every_list(self):
+        """Test each list is timed and the generated data rolled back."""
+        out = StringIO()
+
+        call_command('benchmark_history', years=1, repeat=1, stdout=out)
+
+        for label in ('sessions, one month', 'progress, one month'):
+            self.assertIn(label, out.getvalue())
+        self.assertIn('Index Scan', out.getvalue())
+        self.assertFalse(get_user_model().objects.exists())
+
+
+class BenchmarkEndpointsCommandTests(TestCase):
+    """Test the benchmark_endpoints command."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.baseline = Path(directory.name) / 'baseline.json'
+
+    def benchmark(self, **options):
+        call_command('benchmark_endpoints', users=2, years=0.2, repeat=1,
+                     stdout=StringIO(), stderr=StringIO(), **options)
+
+    def test_save_then_compare(self):
+        """Test every route is measured and passes against itself."""
+        self.benchmark(save=self.baseline)
+
+        results = json.loads(self.baseline.read_text())['results']
+        self.assertIn('logout', results)
+        self.assertEqual(
+            set(results['me']),
+            {'status', 'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'sql_ms',
+             'bytes'},
+        )
+        self.assertFalse(get_user_model().objects.exists())
+
+        self.benchmark(compare=self.baseline, only='me', tolerance=100)
+
+    def test_compare_flags_regression(self):
+        """Test a case running more queries than its baseline fails."""
+        self.benchmark(save=self.baseline, only='muscle group')
+        baseline = json.loads(self.baseline.read_text())
+        baseline['results']['muscle groups']['queries'] -= 1
+        self.baseline.write_text(json.dumps(baseline))
+
+        with self.assertRaisesMessage(CommandError, '1 metric(s) regressed'):
+            self.benchmark(compare=self.baseline, only='muscle group',
+                           tolerance=100)
+
+
+class GenerateLoadDataCommandTests(TestCase):
+    """Test the generate_load_data command."""
+
+    def setUp(self):
+        call_command('populate_exercises', stdout=StringIO())
+
+    def snapshot(self):
+        """Return the generated history keyed by user email."""
+        return (
+            sorted(WorkoutSession.objects.values_list(
+                'user__email', 'workout_plan__name', 'date', 'completed')),
+            sorted(Progress.objects.values_list(
+                'user__email', 'date', 'weight')),
+            sorted(WorkoutPlanExercise.objects.values_list(
+                'workout_plan__user__email', 'exercise__name', 'sets',
+                'repetitions')),
+        )
+
+    def generate(self, **options):
+        call_command('generate_load_data', users=3, years=1, seed=7,
+                     end=date(2025, 6, 30), stdout=StringIO(), **options)
+
+    def test_same_seed_same_data_on_every_write_path(self):
+        """Test COPY and bulk_create write identical seeded data."""
+        self.generate(method='copy', chunk_size=2)
+        copied = self.snapshot()
+        get_user_model().objects.all().delete()
+
+        self.generate(method='bulk')
+
+        self.assertEqual(self.snapshot(), copied)
+        sessions, progress, plan_exercises = copied
+        self.assertGreater(len(sessions), 50)
+        self.assertGreater(len(progress), 10)
+        self.assertTrue(plan_exercises)
+        self.assertLessEqual(max(row[2] for row in sessions),
+                             date(2025, 6, 30))
+
+    def test_rollups_follow_generated_rows(self):
+        """Test the rollup triggers see COPY writes."""
+        self.generate()
+
+        totals = WeeklyRollup.objects.aggregate(
+            sessions=Sum('sessions'), progress=Sum('progress_entries'))
+        self.assertEqual(totals['sessions'], WorkoutSession.objects.count())
+        self.assertEqual(totals['progress'], Progress.objects.count())
+
+    def test_seed_already_used(self):
+        """Test generating the same seed twice is refused."""
+        self.generate()
+
+        with self.assertRaises(CommandError):
+            self.generate()
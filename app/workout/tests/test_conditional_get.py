@@ -0,0 +1,152 @@
+from django.urls import reverse
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import WorkoutPlan, Exercise, MuscleGroup
+from workout.catalog import clear_catalog_cache
+from datetime import timedelta
+
+
+def workout_plan_url():
+    """Return the workout plan list URL"""
+    return reverse('workout:workout-plan-list')
+
+
+def detail_workout_plan_url(workout_plan_id):
+    """Return the detail URL for a specific workout plan"""
+    return reverse('workout:workout-plan-detail', args=[workout_plan_id])
+
+
+def exercise_url():
+    """Return the exercise list URL"""
+    return reverse('workout:exercise-list')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Helper function to create a new user"""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_workout_plan(user, name="Full Body Strength"):
+    """Helper function to create a workout plan"""
+    return WorkoutPlan.objects.create(
+        user=user,
+        name=name,
+        frequency=3,
+        goal="Build muscle & strength",
+        duration_per_session=timedelta(hours=1)
+    )
+
+
+class ConditionalGetTests(TestCase):
+    """Test ETag/Last-Modified handling on workout endpoints"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.workout_plan = create_workout_plan(self.user)
+
+    def test_list_sets_validators(self):
+        """Test list responses carry ETag and Last-Modified"""
+        res = self.client.get(workout_plan_url())
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', res)
+
+    def test_list_not_modified_uses_one_query(self):
+        """Test an unchanged list returns 304 from a single aggregate"""
+        etag = self.client.get(workout_plan_url())['ETag']
+
+        with self.assertNumQueries(1):
+            res = self.client.get(workout_plan_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], etag)
+
+    def test_list_modified_after_update(self):
+        """Test updating a plan changes the list ETag"""
+        etag = self.client.get(workout_plan_url())['ETag']
+
+        self.client.patch(
+            detail_workout_plan_url(self.workout_plan.id), {'frequency': 4})
+        res = self.client.get(workout_plan_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+    def test_list_modified_after_delete(self):
+        """Test deleting a plan changes the list ETag"""
+        other_plan = create_workout_plan(self.user, name="Cardio")
+        etag = self.client.get(workout_plan_url())['ETag']
+
+        other_plan.delete()
+        res = self.client.get(workout_plan_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_list_etag_differs_between_users(self):
+        """Test users never share a list ETag"""
+        etag = self.client.get(workout_plan_url())['ETag']
+        other_user = create_user(email='other@example.com')
+        create_workout_plan(other_user)
+        self.client.force_authenticate(other_user)
+
+        res = self.client.get(workout_plan_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_detail_not_modified(self):
+        """Test an unchanged plan detail returns 304"""
+        url = detail_workout_plan_url(self.workout_plan.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_modified_since(self):
+        """Test If-Modified-Since is honoured without an ETag"""
+        last_modified = self.client.get(workout_plan_url())['Last-Modified']
+
+        res = self.client.get(
+            workout_plan_url(), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class CatalogConditionalGetTests(TestCase):
+    """Test conditional GET on the cached catalog"""
+
+    def setUp(self):
+        clear_catalog_cache()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        muscle_group = MuscleGroup.objects.create(name="Chest")
+        self.exercise = Exercise.objects.create(
+            name="Push-up", description="Chest exercise")
+        self.exercise.target_muscles.set([muscle_group])
+
+    def test_catalog_not_modified_skips_database(self):
+        """Test an unchanged catalog returns 304 without queries"""
+        etag = self.client.get(exercise_url())['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(exercise_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_catalog_modified_after_muscle_change(self):
+        """Test changing target muscles changes the catalog ETag"""
+        etag = self.client.get(exercise_url())['ETag']
+
+        self.exercise.target_muscles.clear()
+        res = self.client.get(exercise_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['target_muscle_names'], [])
@@ -1,5 +1,7 @@
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
@@ -44,7 +46,7 @@ class ExerciseAPITest(APITestCase):
         serializer = ExerciseSerializer(exercises, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_user_cannot_create_exercise(self):
         """Test that a user cannot create an exercise"""
@@ -70,6 +72,35 @@ class ExerciseAPITest(APITestCase):
         res = self.client.delete(detail_url(self.exercise.id))
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_list_exercises_query_count(self):
+        """Test listing exercises uses a fixed number of queries"""
+        for i in range(10):
+            exercise = Exercise.objects.create(
+                name=f"Exercise {i}",
+                description="Sample description",
+                instructions="Sample instructions"
+            )
+            exercise.target_muscles.set([self.muscle_group])
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(4):
+            res = self.client.get(exercise_url())
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 11)
+        for item in res.data['results']:
+            self.assertEqual(item['target_muscle_names'], ['Biceps'])
+
+    def test_retrieve_exercise_query_count(self):
+        """Test retrieving an exercise prefetches its muscles"""
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(4):
+            res = self.client.get(detail_url(self.exercise.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['target_muscle_names'], ['Biceps'])
+
 
 class AdminExerciseAPITest(APITestCase):
     def setUp(self):
@@ -99,6 +130,19 @@ class AdminExerciseAPITest(APITestCase):
         res = self.client.post(exercise_url(), payload)
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Exercise.objects.count(), 2)
+        self.assertEqual(res.data['target_muscle_names'], ['Legs'])
+
+    def test_update_exercise_muscles_reserialized(self):
+        """Test updating target muscles returns the fresh muscle names"""
+        arms = MuscleGroup.objects.create(name="Arms")
+        payload = {'target_muscles': [arms.id]}
+
+        with self.assertNumQueries(13):
+            res = self.client.patch(
+                detail_url(self.exercise.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['target_muscle_names'], ['Arms'])
 
     def test_retrieve_exercises(self):
         """Test that an admin can retrieve exercises"""
@@ -106,7 +150,7 @@ class AdminExerciseAPITest(APITestCase):
         exercises = Exercise.objects.all().order_by('id')
         serializer = ExerciseSerializer(exercises, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_update_exercise(self):
         """Test that an admin can update an exercise"""
@@ -121,3 +165,146 @@ class AdminExerciseAPITest(APITestCase):
         res = self.client.delete(detail_url(self.exercise.id))
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Exercise.objects.filter(id=self.exercise.id).exists())
+
+
+def search_url():
+    """Return the exercise search URL"""
+    return reverse('workout:exercise-search')
+
+
+class ExerciseSearchAPITest(APITestCase):
+    """Test full-text search over the exercise catalog"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.bench = Exercise.objects.create(
+            name="Bench Press",
+            description="Chest exercise on a flat bench",
+            instructions="Press bar up and down"
+        )
+        self.fly = Exercise.objects.create(
+            name="Chest Fly",
+            description="Isolation movement done lying on a bench",
+            instructions="Open and close arms"
+        )
+        Exercise.objects.create(
+            name="Squat",
+            description="Exercise for thighs and glutes",
+            instructions="Lower hips, then stand"
+        )
+
+    def test_search_ranks_name_matches_first(self):
+        """Test name matches outrank description matches"""
+        res = self.client.get(search_url(), {'q': 'bench'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in res.data], [self.bench.id, self.fly.id])
+
+    def test_search_matches_word_forms(self):
+        """Test search stems terms and matches instructions"""
+        res = self.client.get(search_url(), {'q': 'pressing'})
+
+        self.assertEqual([item['name'] for item in res.data], ["Bench Press"])
+
+    def test_search_respects_limit(self):
+        """Test the number of results is capped by limit"""
+        res = self.client.get(search_url(), {'q': 'bench', 'limit': 1})
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_search_requires_query(self):
+        """Test searching without q is rejected"""
+        res = self.client.get(search_url())
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_vector_follows_updates(self):
+        """Test renaming an exercise updates the search index"""
+        self.bench.name = "Floor Press"
+        self.bench.save()
+
+        res = self.client.get(search_url(), {'q': 'floor'})
+
+        self.assertEqual([item['id'] for item in res.data], [self.bench.id])
+
+
+class ExerciseMuscleFilterAPITest(APITestCase):
+    """Test filtering exercises by target muscles"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com', password='password123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.chest = MuscleGroup.objects.create(name="Chest")
+        self.arms = MuscleGroup.objects.create(name="Arms")
+        self.legs = MuscleGroup.objects.create(name="Legs")
+        self.push_up = Exercise.objects.create(name="Push-up")
+        self.push_up.target_muscles.set([self.chest, self.arms])
+        self.curl = Exercise.objects.create(name="Curl")
+        self.curl.target_muscles.set([self.arms])
+        self.squat = Exercise.objects.create(name="Squat")
+        self.squat.target_muscles.set([self.legs])
+
+    def filter_ids(self, muscles, match=None):
+        params = {'muscles': ','.join(str(m.id) for m in muscles)}
+        if match:
+            params['match'] = match
+        res = self.client.get(exercise_url(), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in res.data['results']]
+
+    def test_filter_all(self):
+        """Test match=all requires every muscle"""
+        self.assertEqual(
+            self.filter_ids([self.chest, self.arms]), [self.push_up.id])
+
+    def test_filter_any(self):
+        """Test match=any requires at least one muscle"""
+        self.assertEqual(
+            self.filter_ids([self.chest, self.legs], 'any'),
+            [self.push_up.id, self.squat.id],
+        )
+
+    def test_filter_none(self):
+        """Test match=none excludes every listed muscle"""
+        self.assertEqual(self.filter_ids([self.arms], 'none'),
+                         [self.squat.id])
+
+    def test_filter_uses_no_join(self):
+        """Test the filter is a single predicate on the exercise table"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.filter_ids([self.chest, self.arms])
+
+        list_sql = ctx.captured_queries[1]['sql']
+        self.assertIn('target_muscle_ids', list_sql)
+        self.assertNotIn('core_exercise_target_muscles', list_sql)
+
+    def test_filter_invalid_muscles(self):
+        """Test non-numeric muscle ids are rejected"""
+        res = self.client.get(exercise_url(), {'muscles': 'chest'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reverse_m2m_change_syncs_filter(self):
+        """Test adding exercises from the muscle side updates the filter"""
+        self.legs.exercise_set.add(self.curl)
+
+        self.assertEqual(self.filter_ids([self.legs]),
+                         [self.curl.id, self.squat.id])
+
+    def test_clear_and_delete_sync_filter(self):
+        """Test clearing and deleting muscle groups updates the filter"""
+        self.arms.exercise_set.clear()
+        self.legs.delete()
+
+        self.push_up.refresh_from_db()
+        self.squat.refresh_from_db()
+        self.assertEqual(self.push_up.target_muscle_ids, [self.chest.id])
+        self.assertEqual(self.squat.target_muscle_ids, [])
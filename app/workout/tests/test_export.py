@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+from django.urls import reverse
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import WorkoutPlan, WorkoutSession, Progress
+from datetime import date, timedelta
+
+
+def session_export_url():
+    """Return the workout session export URL"""
+    return reverse('workout:workout-session-export')
+
+
+def progress_export_url():
+    """Return the progress export URL"""
+    return reverse('workout:progress-export')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Helper function to create a new user"""
+    return get_user_model().objects.create_user(email, password)
+
+
+def read_content(response):
+    """Return the full body of a streaming response as text"""
+    return b''.join(response.streaming_content).decode()
+
+
+class ExportApiTests(TestCase):
+    """Test streaming exports of sessions and progress"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.workout_plan = WorkoutPlan.objects.create(
+            user=self.user,
+            name="Full Body Strength",
+            frequency=3,
+            goal="Build muscle & strength",
+            duration_per_session=timedelta(hours=1)
+        )
+        start = date(2024, 1, 1)
+        WorkoutSession.objects.bulk_create([
+            WorkoutSession(user=self.user, workout_plan=self.workout_plan,
+                           date=start + timedelta(days=i),
+                           completed=i % 2 == 0)
+            for i in range(30)
+        ])
+        Progress.objects.bulk_create([
+            Progress(user=self.user, date=start + timedelta(days=i),
+                     weight=80 + i / 10, notes=f"Day {i}, felt good")
+            for i in range(30)
+        ])
+
+    def test_export_requires_auth(self):
+        """Test exports require authentication"""
+        res = APIClient().get(session_export_url())
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_sessions_ndjson(self):
+        """Test sessions stream as NDJSON in date order"""
+        res = self.client.get(session_export_url())
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in read_content(res).splitlines()]
+        self.assertEqual(len(rows), 30)
+        self.assertEqual(rows[0], {
+            'id': rows[0]['id'],
+            'workout_plan': self.workout_plan.id,
+            'date': '2024-01-01',
+            'completed': True,
+        })
+        self.assertEqual(
+            [row['date'] for row in rows],
+            sorted(row['date'] for row in rows))
+
+    def test_export_progress_csv(self):
+        """Test progress streams as CSV with a header row"""
+        res = self.client.get(progress_export_url(), {'type': 'csv'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/csv')
+        self.assertIn('progress.csv', res['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(read_content(res))))
+        self.assertEqual(rows[0], ['id', 'date', 'weight', 'notes'])
+        self.assertEqual(len(rows), 31)
+        self.assertEqual(rows[1][1:], ['2024-01-30', '82.9',
+                                       'Day 29, felt good'])
+
+    def test_export_limited_to_user(self):
+        """Test exports only contain the user's own rows"""
+        other_user = create_user(email='other@example.com')
+        Progress.objects.create(user=other_user, date=date(2024, 1, 1),
+                                weight=60)
+
+        res = self.client.get(progress_export_url())
+
+        self.assertEqual(len(read_content(res).splitlines()), 30)
+
+    def test_export_single_query(self):
+        """Test an export reads its rows with a single query"""
+        res = self.client.get(session_export_url())
+
+        with self.assertNumQueries(1):
+            read_content(res)
+
+    def test_export_invalid_type(self):
+        """Test an unknown export type returns 400"""
+        res = self.client.get(session_export_url(), {'type': 'xml'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
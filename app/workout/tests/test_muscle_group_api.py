@@ -37,7 +37,7 @@ class MuscleGroupAPITest(APITestCase):
         expected = MuscleGroup.objects.all().order_by('id')
         serializer = MuscleGroupSerializer(expected, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_user_cannot_create_muscle_group(self):
         """Test that a user cannot create a muscle group"""
@@ -87,7 +87,7 @@ class AdminMuscleGroupAPITest(APITestCase):
         muscle_groups = MuscleGroup.objects.all().order_by('id')
         serializer = MuscleGroupSerializer(muscle_groups, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_update_muscle_group(self):
         """Test that an admin can update a muscle group"""
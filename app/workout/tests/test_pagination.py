@@ -0,0 +1,116 @@
+from django.urls import reverse
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import Progress, MuscleGroup
+from workout.catalog import clear_catalog_cache
+from workout.pagination import WorkoutCursorPagination
+from datetime import date, timedelta
+
+
+def progress_url():
+    """Return the progress list URL"""
+    return reverse('workout:progress-list')
+
+
+def muscle_group_url():
+    """Return the muscle group list URL"""
+    return reverse('workout:muscle-group-list')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Helper function to create a new user"""
+    return get_user_model().objects.create_user(email, password)
+
+
+class CursorPaginationTests(TestCase):
+    """Test keyset pagination on per-user lists"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        start = date(2020, 1, 1)
+        Progress.objects.bulk_create([
+            Progress(user=self.user, date=start + timedelta(days=i),
+                     weight=80 - i / 100)
+            for i in range(120)
+        ])
+
+    def test_first_page_uses_default_size(self):
+        """Test the first page holds the default number of rows"""
+        res = self.client.get(progress_url())
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            len(res.data['results']), WorkoutCursorPagination.page_size)
+        self.assertIsNone(res.data['previous'])
+        self.assertIsNotNone(res.data['next'])
+
+    def test_walk_all_pages_newest_first(self):
+        """Test following next links returns every row once, newest first"""
+        dates = []
+        url = progress_url() + '?page_size=25'
+        while url:
+            res = self.client.get(url)
+            dates.extend(item['date'] for item in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(len(dates), 120)
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_deep_page_costs_same_as_first(self):
+        """Test a deep page runs the same queries as the first page"""
+        url = progress_url() + '?page_size=10'
+        for _ in range(10):
+            url = self.client.get(url).data['next']
+
+        with self.assertNumQueries(2):
+            res = self.client.get(url)
+
+        self.assertEqual(len(res.data['results']), 10)
+
+    def test_page_size_is_capped(self):
+        """Test clients cannot request more than the maximum page size"""
+        res = self.client.get(progress_url(), {'page_size': 10000})
+
+        self.assertEqual(len(res.data['results']), 120)
+        self.assertLessEqual(
+            len(res.data['results']), WorkoutCursorPagination.max_page_size)
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor returns 404"""
+        res = self.client.get(progress_url(), {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CatalogPaginationTests(TestCase):
+    """Test keyset pagination over the catalog snapshot"""
+
+    def setUp(self):
+        clear_catalog_cache()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        MuscleGroup.objects.bulk_create([
+            MuscleGroup(name=f"Muscle {i}") for i in range(7)
+        ])
+        clear_catalog_cache()
+
+    def test_walk_catalog_pages(self):
+        """Test next and previous links over the catalog"""
+        first = self.client.get(muscle_group_url(), {'page_size': 3})
+        second = self.client.get(first.data['next'])
+        third = self.client.get(second.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        names = [item['name'] for item in (
+            first.data['results'] + second.data['results']
+            + third.data['results']
+        )]
+        self.assertEqual(names, [f"Muscle {i}" for i in range(7)])
+        self.assertIsNone(third.data['next'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(back.data['previous'])
@@ -0,0 +1,156 @@
+import math
+import time
+from django.urls import reverse
+from django.test import SimpleTestCase, TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import Progress
+from workout.analytics import analyze
+from datetime import date, timedelta
+
+
+def analytics_url():
+    """Return the progress analytics URL"""
+    return reverse('workout:progress-analytics')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Helper function to create a new user"""
+    return get_user_model().objects.create_user(email, password)
+
+
+def reference_ewma(dates, weights, halflife):
+    """Compute the decayed trend the slow way for comparison"""
+    decay = 0.5 ** (1 / halflife)
+    trend = []
+    for current in dates:
+        pairs = [(decay ** (current - d).days, w)
+                 for d, w in zip(dates, weights) if d <= current]
+        trend.append(sum(f * w for f, w in pairs) / sum(f for f, _ in pairs))
+    return trend
+
+
+class AnalyzeTests(SimpleTestCase):
+    """Test the vectorized weight analytics"""
+
+    def setUp(self):
+        start = date(2024, 1, 1)
+        # Logged on 20 of 40 days, with a two-week gap in the middle.
+        offsets = list(range(10)) + list(range(24, 34))
+        self.dates = [start + timedelta(days=i) for i in offsets]
+        self.weights = [80 - i * 0.1 for i in offsets]
+
+    def test_rolling_means_skip_missing_days(self):
+        """Test rolling means average calendar windows, not rows"""
+        result = analyze(self.dates, self.weights)
+
+        series = result['series']
+        # Day 24 is the first entry after the gap: its 7-day window
+        # holds only itself, but its 30-day window reaches back to day 0.
+        index = 10
+        self.assertEqual(series['mean_7'][index], self.weights[index])
+        self.assertAlmostEqual(
+            series['mean_30'][index],
+            sum(self.weights[:11]) / 11, places=2)
+
+    def test_trend_matches_reference(self):
+        """Test the trend matches a direct weighted average"""
+        result = analyze(self.dates, self.weights, halflife=5)
+
+        expected = reference_ewma(self.dates, self.weights, 5)
+        for actual, wanted in zip(result['series']['trend'], expected):
+            self.assertAlmostEqual(actual, wanted, places=2)
+
+    def test_weekly_deltas(self):
+        """Test weekly means and changes between consecutive weeks"""
+        result = analyze(self.dates, self.weights)
+
+        weekly = result['weekly']
+        self.assertEqual(weekly['week'][0], '2024-01-01')
+        self.assertIsNone(weekly['delta'][0])
+        self.assertAlmostEqual(weekly['delta'][1], -0.5, places=2)
+        # The week after the gap has no previous week to compare with.
+        self.assertIsNone(weekly['delta'][2])
+
+    def test_projection(self):
+        """Test a linear series projects along its slope"""
+        result = analyze(self.dates, self.weights, horizon=7)
+
+        projection = result['projection']
+        self.assertAlmostEqual(projection['slope_per_week'], -0.7)
+        self.assertEqual(projection['date'], '2024-02-10')
+        self.assertAlmostEqual(projection['weight'], 76.0, places=2)
+
+    def test_single_entry(self):
+        """Test one entry has no projection"""
+        result = analyze([date(2024, 1, 1)], [80.0])
+
+        self.assertEqual(result['series']['trend'], [80.0])
+        self.assertIsNone(result['projection'])
+
+    def test_long_series_is_stable(self):
+        """Test a 30-year series with a short half-life stays finite"""
+        start = date(1990, 1, 1)
+        dates = [start + timedelta(days=i) for i in range(0, 11000, 2)]
+
+        result = analyze(dates, [70.0] * len(dates), halflife=1)
+
+        self.assertTrue(all(
+            math.isclose(value, 70.0) for value in result['series']['trend']
+        ))
+
+
+class ProgressAnalyticsApiTests(TestCase):
+    """Test the progress analytics endpoint"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_empty_history(self):
+        """Test a user without entries gets empty series"""
+        res = self.client.get(analytics_url())
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['series']['date'], [])
+        self.assertIsNone(res.data['projection'])
+
+    def test_entries_without_weight_are_ignored(self):
+        """Test entries with only notes are left out"""
+        Progress.objects.create(user=self.user, date=date(2024, 1, 1),
+                                weight=80)
+        Progress.objects.create(user=self.user, date=date(2024, 1, 2),
+                                notes="Rest day")
+
+        res = self.client.get(analytics_url())
+
+        self.assertEqual(res.data['series']['date'], ['2024-01-01'])
+
+    def test_ten_years_in_one_query(self):
+        """Test ten years of daily entries are analyzed quickly"""
+        start = date(2014, 1, 1)
+        Progress.objects.bulk_create([
+            Progress(user=self.user, date=start + timedelta(days=i),
+                     weight=80 + math.sin(i / 30))
+            for i in range(3650)
+        ])
+        other_user = create_user(email='other@example.com')
+        Progress.objects.create(user=other_user, date=start, weight=50)
+
+        began = time.perf_counter()
+        with self.assertNumQueries(1):
+            res = self.client.get(analytics_url(), {'halflife': 7})
+        elapsed = time.perf_counter() - began
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['series']['date']), 3650)
+        self.assertEqual(len(res.data['weekly']['week']), 522)
+        self.assertLess(elapsed, 1)
+
+    def test_invalid_halflife(self):
+        """Test an out of range half-life returns 400"""
+        res = self.client.get(analytics_url(), {'halflife': 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -18,6 +20,11 @@ def detail_progress_url(progress_id):
     return reverse('workout:progress-detail', args=[progress_id])
 
 
+def progress_by_date_url(day):
+    """Return the upsert URL for the progress entry of a date"""
+    return reverse('workout:progress-by-date', args=[str(day)])
+
+
 def create_user(email='user@example.com', password='testpass123'):
     """Helper function to create a new user"""
     return get_user_model().objects.create_user(email, password)
@@ -107,7 +114,7 @@ class PrivateProgressApiTests(TestCase):
         serializer = ProgressSerializer(progresses, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_retrieve_progress_detail(self):
         """Test retrieving a single progress entry detail"""
@@ -145,3 +152,159 @@ class PrivateProgressApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Progress.objects.filter(id=progress.id).exists())
+
+    def test_create_duplicate_date(self):
+        """Test logging the same date twice returns 400"""
+        create_progress(self.user, date=date(2024, 1, 1))
+        payload = {"weight": 80, "date": "2024-01-01"}
+
+        res = self.client.post(progress_url(), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('date', res.data)
+
+    def test_update_to_taken_date(self):
+        """Test moving an entry onto a logged date returns 400"""
+        create_progress(self.user, date=date(2024, 1, 1))
+        progress = create_progress(self.user, date=date(2024, 1, 2))
+
+        res = self.client.patch(
+            detail_progress_url(progress.id), {"date": "2024-01-01"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        progress.refresh_from_db()
+        self.assertEqual(progress.date, date(2024, 1, 2))
+
+
+class ProgressUpsertApiTests(TestCase):
+    """Test the upsert-by-date endpoint"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_upsert_creates(self):
+        """Test upserting a new date creates an entry in one query"""
+        payload = {"weight": 80.5, "notes": "Morning"}
+
+        with self.assertNumQueries(1):
+            res = self.client.put(
+                progress_by_date_url(date(2024, 1, 1)), payload,
+                format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        progress = Progress.objects.get(id=res.data['id'])
+        self.assertEqual(progress.user, self.user)
+        self.assertEqual(progress.weight, 80.5)
+        self.assertEqual(res.data, ProgressSerializer(progress).data)
+
+    def test_upsert_replaces(self):
+        """Test upserting a logged date replaces the entry in one query"""
+        progress = create_progress(self.user, date=date(2024, 1, 1))
+
+        with self.assertNumQueries(1):
+            res = self.client.put(
+                progress_by_date_url(date(2024, 1, 1)), {"weight": 79},
+                format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['id'], progress.id)
+        progress.refresh_from_db()
+        self.assertEqual(progress.weight, 79)
+        self.assertIsNone(progress.notes)
+
+    def test_upsert_invalid_date(self):
+        """Test an impossible calendar date returns 400"""
+        res = self.client.put(
+            reverse('workout:progress-by-date', args=['2024-02-30']),
+            {"weight": 79}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upsert_limited_to_user(self):
+        """Test upserting never touches another user's entry"""
+        other_user = create_user(email='other@example.com')
+        other = create_progress(other_user, weight=60, date=date(2024, 1, 1))
+
+        res = self.client.put(
+            progress_by_date_url(date(2024, 1, 1)), {"weight": 90},
+            format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        other.refresh_from_db()
+        self.assertEqual(other.weight, 60)
+
+
+class ProgressUpsertConcurrencyTests(TransactionTestCase):
+    """Test concurrent upserts of the same date"""
+
+    def setUp(self):
+        self.user = create_user()
+
+    def put_weight(self, weight):
+        """Upsert a weight from a separate connection"""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        try:
+            return client.put(
+                progress_by_date_url(date(2024, 1, 1)), {"weight": weight},
+                format='json').status_code
+        finally:
+            connection.close()
+
+    def test_concurrent_upserts(self):
+        """Test racing upserts of one date all succeed on a single row"""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            codes = list(executor.map(self.put_weight, range(70, 86)))
+
+        self.assertEqual(codes.count(status.HTTP_201_CREATED), 1)
+        self.assertEqual(codes.count(status.HTTP_200_OK), 15)
+        self.assertEqual(Progress.objects.filter(user=self.user).count(), 1)
+
+
+class FilterProgressApiTests(TestCase):
+    """Test filtering the progress list by date"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for day in range(1, 32):
+            create_progress(
+                self.user, weight=80 + day, date=date(2024, 1, day))
+
+    def test_filter_by_month(self):
+        """Test a calendar month lists only its own entries"""
+        create_progress(self.user, date=date(2024, 2, 1))
+
+        res = self.client.get(
+            progress_url(), {'from': '2024-01-01', 'to': '2024-01-31'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 31)
+        self.assertEqual(res.data['results'][0]['date'], '2024-01-31')
+
+    def test_filter_open_ended(self):
+        """Test either end of the range may be left out"""
+        res = self.client.get(progress_url(), {'to': '2024-01-02'})
+
+        self.assertEqual(
+            [entry['date'] for entry in res.data['results']],
+            ['2024-01-02', '2024-01-01'],
+        )
+
+    def test_filtered_analytics(self):
+        """Test analytics only cover the filtered range"""
+        res = self.client.get(
+            reverse('workout:progress-analytics'), {'from': '2024-01-25'})
+
+        self.assertEqual(len(res.data['series']['date']), 7)
+
+    def test_invalid_range(self):
+        """Test a range ending before it starts returns 400"""
+        res = self.client.get(
+            progress_url(), {'from': '2024-01-31', 'to': '2024-01-01'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('to', res.data)
@@ -0,0 +1,158 @@
+import json
+from django.urls import reverse
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import Progress
+from workout.importer import IMPORT_BATCH_SIZE
+from datetime import date, timedelta
+
+
+def progress_import_url():
+    """Return the progress import URL"""
+    return reverse('workout:progress-import')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Helper function to create a new user"""
+    return get_user_model().objects.create_user(email, password)
+
+
+def csv_upload(lines, name='progress.csv'):
+    """Return an uploaded CSV file built from a list of lines"""
+    return SimpleUploadedFile(
+        name, '\n'.join(lines).encode(), content_type='text/csv')
+
+
+class ProgressImportApiTests(TestCase):
+    """Test bulk import of progress entries"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, upload, **params):
+        """Post an upload to the import endpoint"""
+        return self.client.post(
+            progress_import_url(), {'file': upload, **params},
+            format='multipart')
+
+    def test_import_csv(self):
+        """Test importing a CSV file creates progress entries"""
+        upload = csv_upload([
+            'date,weight,notes',
+            '2024-01-01,80.5,First weigh-in',
+            '2024-01-02,,',
+        ])
+
+        res = self.post(upload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 2)
+        self.assertEqual(res.data['errors'], [])
+        progress = Progress.objects.get(user=self.user, date='2024-01-01')
+        self.assertEqual(progress.weight, 80.5)
+        self.assertEqual(progress.notes, 'First weigh-in')
+        self.assertIsNone(
+            Progress.objects.get(user=self.user, date='2024-01-02').weight)
+
+    def test_import_ndjson(self):
+        """Test importing an NDJSON file creates progress entries"""
+        lines = [
+            json.dumps({'date': '2024-01-01', 'weight': 80}),
+            '',
+            json.dumps({'date': '2024-01-02', 'weight': 79.5}),
+        ]
+        upload = SimpleUploadedFile('progress.ndjson', '\n'.join(
+            lines).encode(), content_type='application/x-ndjson')
+
+        res = self.post(upload, type='ndjson')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['created'], 2)
+
+    def test_conflict_skip(self):
+        """Test the skip policy keeps already logged dates"""
+        Progress.objects.create(user=self.user, date=date(2024, 1, 1),
+                                weight=90)
+        upload = csv_upload([
+            'date,weight', '2024-01-01,80', '2024-01-02,81'])
+
+        res = self.post(upload)
+
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['skipped'], 1)
+        self.assertEqual(Progress.objects.get(
+            user=self.user, date='2024-01-01').weight, 90)
+
+    def test_conflict_overwrite(self):
+        """Test the overwrite policy replaces already logged dates"""
+        Progress.objects.create(user=self.user, date=date(2024, 1, 1),
+                                weight=90, notes="Old")
+        upload = csv_upload([
+            'date,weight', '2024-01-01,80', '2024-01-02,81'])
+
+        res = self.post(upload, on_conflict='overwrite')
+
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['updated'], 1)
+        progress = Progress.objects.get(user=self.user, date='2024-01-01')
+        self.assertEqual(progress.weight, 80)
+        self.assertIsNone(progress.notes)
+
+    def test_row_errors_reported_by_line(self):
+        """Test invalid rows are reported and valid rows still saved"""
+        upload = csv_upload([
+            'date,weight',
+            '2024-01-01,80',
+            'yesterday,80',
+            '2024-01-02,heavy',
+            '2024-01-01,81',
+        ])
+
+        res = self.post(upload)
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(
+            [error['line'] for error in res.data['errors']], [3, 4, 5])
+        self.assertIn('date', res.data['errors'][0]['errors'])
+        self.assertIn('weight', res.data['errors'][1]['errors'])
+        self.assertIn('line 2', res.data['errors'][2]['errors']['date'][0])
+
+    def test_missing_date_column(self):
+        """Test a CSV without a date column is rejected"""
+        res = self.post(csv_upload(['weight', '80']))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('file', res.data)
+
+    def test_import_other_users_dates(self):
+        """Test another user's entries do not conflict with an import"""
+        other_user = create_user(email='other@example.com')
+        Progress.objects.create(user=other_user, date=date(2024, 1, 1))
+
+        res = self.post(csv_upload(['date', '2024-01-01']))
+
+        self.assertEqual(res.data['created'], 1)
+        self.assertEqual(res.data['skipped'], 0)
+
+    def test_import_in_batches(self):
+        """Test large files cost one statement per batch"""
+        start = date(2000, 1, 1)
+        rows = 2 * IMPORT_BATCH_SIZE + 1
+        upload = csv_upload(['date,weight'] + [
+            f'{start + timedelta(days=i)},{70 + i % 10}'
+            for i in range(rows)
+        ])
+
+        # Two savepoint statements wrap the batches.
+        with self.assertNumQueries(3 + 2):
+            res = self.post(upload, on_conflict='overwrite')
+
+        self.assertEqual(res.data['created'], rows)
+        self.assertEqual(Progress.objects.filter(user=self.user).count(),
+                         rows)
@@ -0,0 +1,274 @@
+"""
+Test every API action stays within its declared query budget.
+"""
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import override_settings
+from django.urls import URLResolver, resolve, reverse
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.budgets import get_query_budget
+from core.models import (
+    Exercise,
+    MonthlyRollup,
+    MuscleGroup,
+    Progress,
+    WeeklyRollup,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutSession,
+)
+from user import urls as user_urls
+from workout import urls as workout_urls
+from workout.catalog import clear_catalog_cache
+
+# Third-party views whose queries are not ours to budget.
+UNBUDGETED = {'APIRootView', 'TokenObtainPairView', 'TokenRefreshView'}
+
+# (method, url name, fixture args, data or query, format); data may be a
+# callable taking the fixtures.
+REQUESTS = [
+    ('get', 'workout:autocomplete', (), {'q': 'curl'}, None),
+    ('get', 'workout:muscle-group-list', (), None, None),
+    ('get', 'workout:muscle-group-detail', ('muscle_group',), None, None),
+    ('post', 'workout:muscle-group-list', (), {'name': 'Calves'}, 'json'),
+    ('put', 'workout:muscle-group-detail', ('muscle_group',),
+     {'name': 'Upper Back'}, 'json'),
+    ('patch', 'workout:muscle-group-detail', ('muscle_group',),
+     {'description': 'Renamed'}, 'json'),
+    ('delete', 'workout:muscle-group-detail', ('muscle_group',), None, None),
+    ('get', 'workout:exercise-list', (), None, None),
+    ('get', 'workout:exercise-list', (),
+     lambda f: {'muscles': f['muscle_group']}, None),
+    ('get', 'workout:exercise-search', (), {'q': 'curl'}, None),
+    ('get', 'workout:exercise-detail', ('exercise',), None, None),
+    ('post', 'workout:exercise-list', (),
+     lambda f: {'name': 'Row', 'description': 'Pull', 'instructions': 'Row',
+                'target_muscles': f['muscle_groups'][:2]}, 'json'),
+    # Replacing target muscles both removes and adds through rows.
+    ('put', 'workout:exercise-detail', ('exercise',),
+     lambda f: {'name': 'Curl', 'description': 'Pull', 'instructions': 'Curl',
+                'target_muscles': f['muscle_groups'][1:]}, 'json'),
+    ('patch', 'workout:exercise-detail', ('exercise',),
+     lambda f: {'target_muscles': f['muscle_groups'][1:]}, 'json'),
+    ('delete', 'workout:exercise-detail', ('exercise',), None, None),
+    ('get', 'workout:workout-plan-list', (), None, None),
+    ('get', 'workout:workout-plan-list', (), {'expand': 'exercises'}, None),
+    ('get', 'workout:workout-plan-detail', ('plan',), None, None),
+    ('get', 'workout:workout-plan-detail', ('plan',),
+     {'expand': 'exercises'}, None),
+    ('post', 'workout:workout-plan-list', (),
+     {'name': 'New', 'frequency': 3, 'goal': 'Speed'}, 'json'),
+    ('put', 'workout:workout-plan-detail', ('plan',),
+     {'name': 'Renamed', 'frequency': 4, 'goal': 'Speed'}, 'json'),
+    ('patch', 'workout:workout-plan-detail', ('plan',), {'frequency': 4},
+     'json'),
+    ('delete', 'workout:workout-plan-detail', ('plan',), None, None),
+    ('get', 'workout:workout-plan-adherence', ('plan',), None, None),
+    ('get', 'workout:workout-plan-overall-adherence', (), None, None),
+    ('post', 'workout:workout-plan-clone', ('plan',), {}, 'json'),
+    ('post', 'workout:workout-plan-schedule', ('plan',), {'weeks': 4},
+     'json'),
+    ('get', 'workout:workout-plan-exercise-list', (), None, None),
+    ('get', 'workout:workout-plan-exercise-detail', ('plan_exercise',),
+     None, None),
+    ('post', 'workout:workout-plan-exercise-list', (),
+     lambda f: {'workout_plan': f['plan'], 'exercise': f['exercise'],
+                'sets': 3, 'repetitions': 10}, 'json'),
+    ('post', 'workout:workout-plan-exercise-bulk', (),
+     lambda f: {'workout_plan': f['plan'], 'items': [
+         {'id': f['plan_exercise'], 'exercise': f['exercise'], 'sets': 4,
+          'repetitions': 8},
+         *({'exercise': pk, 'sets': 3, 'repetitions': 10}
+           for pk in f['exercises']),
+     ]}, 'json'),
+    ('put', 'workout:workout-plan-exercise-detail', ('plan_exercise',),
+     lambda f: {'workout_plan': f['plan'], 'exercise': f['exercise'],
+                'sets': 4, 'repetitions': 8}, 'json'),
+    ('patch', 'workout:workout-plan-exercise-detail', ('plan_exercise',),
+     {'sets': 5}, 'json'),
+    ('delete', 'workout:workout-plan-exercise-detail', ('plan_exercise',),
+     None, None),
+    ('get', 'workout:workout-session-list', (), None, None),
+    ('get', 'workout:workout-session-list', (),
+     {'from': '2025-01-01', 'to': '2025-01-31', 'completed': 'true'}, None),
+    ('get', 'workout:workout-session-detail', ('session',), None, None),
+    ('get', 'workout:workout-session-export', (), None, None),
+    ('post', 'workout:workout-session-list', (),
+     lambda f: {'workout_plan': f['plan'], 'date': '2025-03-01'}, 'json'),
+    ('post', 'workout:workout-session-batch', (),
+     lambda f: {'operation': 'complete', 'ids': f['sessions']}, 'json'),
+    ('put', 'workout:workout-session-detail', ('session',),
+     lambda f: {'workout_plan': f['plan'], 'date': '2025-03-02',
+                'completed': True}, 'json'),
+    ('patch', 'workout:workout-session-detail', ('session',),
+     {'completed': True}, 'json'),
+    ('delete', 'workout:workout-session-detail', ('session',), None, None),
+    ('get', 'workout:progress-list', (), None, None),
+    ('get', 'workout:progress-list', (),
+     {'from': '2025-01-01', 'to': '2025-01-31'}, None),
+    ('get', 'workout:progress-detail', ('progress',), None, None),
+    ('get', 'workout:progress-analytics', (), None, None),
+    ('get', 'workout:progress-export', (), None, None),
+    ('post', 'workout:progress-list', (),
+     {'date': '2025-03-01', 'weight': 80}, 'json'),
+    ('put', 'workout:progress-by-date', ('day',), {'weight': 80.5}, 'json'),
+    ('post', 'workout:progress-import', (),
+     lambda f: {'file': SimpleUploadedFile(
+         'progress.csv',
+         b'date,weight\n2025-03-01,80\n2025-03-02,79.8\n2025-03-03,79.6\n',
+     )}, 'multipart'),
+    ('put', 'workout:progress-detail', ('progress',),
+     {'date': '2025-03-04', 'weight': 81}, 'json'),
+    ('patch', 'workout:progress-detail', ('progress',), {'notes': 'Good'},
+     'json'),
+    ('delete', 'workout:progress-detail', ('progress',), None, None),
+    ('get', 'workout:weekly-rollup-list', (), None, None),
+    ('get', 'workout:weekly-rollup-detail', ('weekly_rollup',), None, None),
+    ('get', 'workout:monthly-rollup-list', (), None, None),
+    ('get', 'workout:monthly-rollup-detail', ('monthly_rollup',), None,
+     None),
+    ('post', 'user:create', (),
+     {'email': 'new@example.com', 'password': 'testpass123', 'name': 'New'},
+     'json'),
+    ('get', 'user:me', (), None, None),
+    ('put', 'user:me', (),
+     {'email': 'user@example.com', 'password': 'newpass123',
+      'name': 'Renamed'}, 'json'),
+    ('patch', 'user:me', (), {'name': 'Renamed'}, 'json'),
+    ('post', 'user:logout', (), lambda f: {'refresh_token': f['refresh']},
+     'json'),
+]
+
+
+def routed_views(module):
+    """Yield the view function of every route in a URL module."""
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from walk(pattern.url_patterns)
+            else:
+                yield pattern.callback
+    return walk(module.urlpatterns)
+
+
+def routed_actions():
+    """Yield (view, method) for every action of our own routed views."""
+    for view in [*routed_views(workout_urls), *routed_views(user_urls)]:
+        view_class = getattr(view, 'cls', view)
+        if view_class.__name__ in UNBUDGETED:
+            continue
+        methods = getattr(view, 'actions', None) or [
+            method for method in view_class.http_method_names
+            if method not in ('head', 'options', 'trace')
+            and hasattr(view_class, method)
+        ]
+        for method in methods:
+            yield view, method
+
+
+class QueryBudgetCoverageTests(APITestCase):
+    """Test every routed action declares a query budget."""
+
+    def test_every_action_has_a_budget(self):
+        """Test no action of our own views is left without a budget."""
+        missing = {
+            f'{view.cls.__name__} {method}'
+            for view, method in routed_actions()
+            if get_query_budget(view, method) is None
+        }
+
+        self.assertEqual(missing, set())
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetApiTests(APITestCase):
+    """Test every action runs within its budget on a populated account."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            'user@example.com', 'testpass123')
+        muscle_groups = MuscleGroup.objects.bulk_create(
+            MuscleGroup(name=name) for name in ('Back', 'Biceps', 'Core'))
+        exercises = [
+            Exercise.objects.create(name=f'Curl {index}')
+            for index in range(5)
+        ]
+        for exercise in exercises:
+            exercise.target_muscles.set(muscle_groups[:2])
+        plans = [
+            WorkoutPlan.objects.create(
+                user=self.user, name=f'Plan {index}', frequency=3,
+                goal='Strength')
+            for index in range(3)
+        ]
+        plan_exercises = WorkoutPlanExercise.objects.bulk_create(
+            WorkoutPlanExercise(workout_plan=plan, exercise=exercise,
+                                sets=3, repetitions=10)
+            for plan in plans for exercise in exercises[:4]
+        )
+        start = date(2025, 1, 1)
+        sessions = WorkoutSession.objects.bulk_create(
+            WorkoutSession(user=self.user, workout_plan=plans[0],
+                           date=start + timedelta(days=2 * index))
+            for index in range(10)
+        )
+        progress = Progress.objects.bulk_create(
+            Progress(user=self.user, date=start + timedelta(days=index),
+                     weight=80 - index / 10)
+            for index in range(10)
+        )
+        refresh = RefreshToken.for_user(self.user)
+
+        self.fixtures = {
+            'muscle_group': muscle_groups[0].pk,
+            'muscle_groups': [group.pk for group in muscle_groups],
+            'exercise': exercises[0].pk,
+            'exercises': [exercise.pk for exercise in exercises],
+            'plan': plans[0].pk,
+            'plan_exercise': plan_exercises[0].pk,
+            'session': sessions[0].pk,
+            'sessions': [session.pk for session in sessions],
+            'progress': progress[0].pk,
+            'day': '2025-01-05',
+            'weekly_rollup': WeeklyRollup.objects.filter(
+                user=self.user).first().pk,
+            'monthly_rollup': MonthlyRollup.objects.filter(
+                user=self.user).first().pk,
+            'refresh': str(refresh),
+        }
+        self.client = APIClient()
+        # Authenticate for real so the JWT user lookup is counted too.
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_every_action_within_budget(self):
+        """Test each request runs no more queries than its action allows."""
+        visited = set()
+        for method, name, args, data, data_format in REQUESTS:
+            url = reverse(name, args=[self.fixtures[arg] for arg in args])
+            if callable(data):
+                data = data(self.fixtures)
+            with self.subTest(method=method, url=url):
+                # Start from a cold catalog so snapshot builds are counted.
+                clear_catalog_cache()
+                with transaction.atomic():
+                    send = getattr(self.client, method)
+                    if method == 'get':
+                        res = send(url, data)
+                    else:
+                        res = send(url, data, format=data_format)
+                    transaction.set_rollback(True)
+
+                self.assertLess(res.status_code, 400)
+                label, _ = get_query_budget(resolve(url).func, method)
+                visited.add(label)
+
+        self.assertEqual(visited, {
+            get_query_budget(view, method)[0]
+            for view, method in routed_actions()
+        })
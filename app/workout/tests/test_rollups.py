@@ -0,0 +1,181 @@
+from django.urls import reverse
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.models import (
+    WorkoutPlan,
+    WorkoutSession,
+    Progress,
+    WeeklyRollup,
+    MonthlyRollup,
+)
+from datetime import date, timedelta
+
+
+def weekly_rollup_url():
+    """Return the weekly rollup list URL"""
+    return reverse('workout:weekly-rollup-list')
+
+
+def monthly_rollup_url():
+    """Return the monthly rollup list URL"""
+    return reverse('workout:monthly-rollup-list')
+
+
+def create_user(email='user@example.com', password='testpass123'):
+    """Helper function to create a new user"""
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_workout_plan(user, name="Full Body Strength"):
+    """Helper function to create a workout plan"""
+    return WorkoutPlan.objects.create(
+        user=user,
+        name=name,
+        frequency=3,
+        goal="Build muscle & strength",
+        duration_per_session=timedelta(hours=1)
+    )
+
+
+def weekly_totals(user):
+    """Return the weekly rollups of a user as tuples"""
+    return list(WeeklyRollup.objects.filter(user=user).order_by(
+        'week'
+    ).values_list(
+        'week', 'sessions', 'completed_sessions', 'progress_entries',
+        'weight_entries', 'weight_total',
+    ))
+
+
+class RollupMaintenanceTests(TestCase):
+    """Test the rollups follow every write to sessions and progress"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.workout_plan = create_workout_plan(self.user)
+
+    def create_session(self, day, completed=False):
+        """Create a session for the test user"""
+        return WorkoutSession.objects.create(
+            user=self.user, workout_plan=self.workout_plan, date=day,
+            completed=completed)
+
+    def test_create(self):
+        """Test creating rows adds to their week and month"""
+        self.create_session(date(2024, 1, 3), completed=True)
+        self.create_session(date(2024, 1, 5))
+        Progress.objects.create(user=self.user, date=date(2024, 1, 4),
+                                weight=80)
+
+        self.assertEqual(weekly_totals(self.user), [
+            (date(2024, 1, 1), 2, 1, 1, 1, 80.0),
+        ])
+        monthly = MonthlyRollup.objects.get(user=self.user)
+        self.assertEqual(monthly.month, date(2024, 1, 1))
+        self.assertEqual(monthly.completion_rate, 0.5)
+        self.assertEqual(monthly.average_weight, 80.0)
+
+    def test_update_moves_between_weeks(self):
+        """Test changing a date moves the row to its new week"""
+        session = self.create_session(date(2024, 1, 3))
+        progress = Progress.objects.create(
+            user=self.user, date=date(2024, 1, 3), weight=80)
+
+        session.date = date(2024, 1, 10)
+        session.completed = True
+        session.save()
+        progress.weight = 82
+        progress.save()
+
+        self.assertEqual(weekly_totals(self.user), [
+            (date(2024, 1, 1), 0, 0, 1, 1, 82.0),
+            (date(2024, 1, 8), 1, 1, 0, 0, 0.0),
+        ])
+
+    def test_delete_removes_empty_buckets(self):
+        """Test deleting the last row of a week removes the rollup"""
+        session = self.create_session(date(2024, 1, 3))
+        self.create_session(date(2024, 2, 3))
+
+        session.delete()
+
+        self.assertEqual(
+            [row[0] for row in weekly_totals(self.user)],
+            [date(2024, 1, 29)])
+        self.assertEqual(
+            list(MonthlyRollup.objects.values_list('month', flat=True)),
+            [date(2024, 2, 1)])
+
+    def test_bulk_writes(self):
+        """Test bulk inserts and queryset updates are rolled up"""
+        start = date(2024, 1, 1)
+        WorkoutSession.objects.bulk_create([
+            WorkoutSession(user=self.user, workout_plan=self.workout_plan,
+                           date=start + timedelta(days=i))
+            for i in range(14)
+        ])
+
+        WorkoutSession.objects.filter(
+            user=self.user, date__lt=start + timedelta(days=7)
+        ).update(completed=True)
+
+        self.assertEqual(
+            [row[1:3] for row in weekly_totals(self.user)],
+            [(7, 7), (7, 0)])
+
+    def test_deleting_user(self):
+        """Test deleting a user removes their rollups cleanly"""
+        self.create_session(date(2024, 1, 3))
+        Progress.objects.create(user=self.user, date=date(2024, 1, 3))
+
+        self.user.delete()
+
+        self.assertFalse(WeeklyRollup.objects.exists())
+        self.assertFalse(MonthlyRollup.objects.exists())
+
+
+class RollupApiTests(TestCase):
+    """Test reading the dashboard rollups"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        start = date(2024, 1, 1)
+        Progress.objects.bulk_create([
+            Progress(user=self.user, date=start + timedelta(days=i),
+                     weight=80 - i / 10)
+            for i in range(365)
+        ])
+
+    def test_weekly_newest_first(self):
+        """Test weekly rollups are listed newest first"""
+        res = self.client.get(weekly_rollup_url(), {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row['week'] for row in res.data['results']],
+            ['2024-12-30', '2024-12-23'])
+        self.assertEqual(res.data['results'][1]['progress_entries'], 7)
+        self.assertIsNone(res.data['results'][1]['completion_rate'])
+
+    def test_monthly_limited_to_user(self):
+        """Test monthly rollups only cover the user's own rows"""
+        other_user = create_user(email='other@example.com')
+        Progress.objects.create(user=other_user, date=date(2025, 6, 1))
+
+        res = self.client.get(monthly_rollup_url())
+
+        self.assertEqual(len(res.data['results']), 12)
+        self.assertEqual(res.data['results'][0]['month'], '2024-12-01')
+        self.assertAlmostEqual(
+            res.data['results'][-1]['average_weight'], 78.5)
+
+    def test_read_does_not_scan_rows(self):
+        """Test a dashboard read is a page query plus its validators"""
+        with self.assertNumQueries(2):
+            res = self.client.get(monthly_rollup_url())
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
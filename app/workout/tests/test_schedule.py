@@ -0,0 +1,46 @@
+"""
+Tests for generating session dates from a plan's frequency.
+"""
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from workout.schedule import schedule_dates
+
+
+class ScheduleDatesTests(SimpleTestCase):
+    """Test the session dates picked for each week"""
+
+    def test_spread_evenly_through_week(self):
+        """Test sessions are spaced out from the start date"""
+        dates = schedule_dates(date(2024, 1, 1), weeks=2, frequency=3)
+
+        self.assertEqual(dates, [
+            date(2024, 1, 1), date(2024, 1, 3), date(2024, 1, 5),
+            date(2024, 1, 8), date(2024, 1, 10), date(2024, 1, 12),
+        ])
+
+    def test_preferred_weekdays(self):
+        """Test only preferred weekdays are used, from the start date on"""
+        # 2024-01-03 is a Wednesday; Monday and Friday are preferred.
+        dates = schedule_dates(date(2024, 1, 3), weeks=2, frequency=2,
+                               weekdays=[0, 4])
+
+        self.assertEqual(dates, [
+            date(2024, 1, 5), date(2024, 1, 8),
+            date(2024, 1, 12), date(2024, 1, 15),
+        ])
+
+    def test_more_weekdays_than_frequency(self):
+        """Test extra preferred weekdays are thinned out evenly"""
+        dates = schedule_dates(date(2024, 1, 1), weeks=1, frequency=2,
+                               weekdays=[0, 1, 2, 3])
+
+        self.assertEqual(dates, [date(2024, 1, 1), date(2024, 1, 3)])
+
+    def test_daily_plan(self):
+        """Test a frequency of seven uses every day"""
+        dates = schedule_dates(date(2024, 1, 1), weeks=52, frequency=7)
+
+        self.assertEqual(len(dates), 364)
+        self.assertEqual(len(set(dates)), 364)
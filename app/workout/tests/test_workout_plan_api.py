@@ -3,9 +3,16 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
-from core.models import WorkoutPlan
+from core.models import (
+    Exercise,
+    MuscleGroup,
+    WorkoutPlan,
+    WorkoutPlanExercise,
+    WorkoutSession,
+)
+from workout.catalog import bump_catalog_version
 from workout.serializers import WorkoutPlanSerializer
-from datetime import timedelta
+from datetime import date, timedelta
 
 
 def workout_plan_url():
@@ -66,7 +73,7 @@ class PrivateWorkoutPlanApiTests(TestCase):
         serializer = WorkoutPlanSerializer(workout_plans, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_workout_plans_limited_to_user(self):
         """Test that workout plans are limited to authenticated user"""
@@ -80,7 +87,7 @@ class PrivateWorkoutPlanApiTests(TestCase):
         serializer = WorkoutPlanSerializer(workout_plans, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_retrieve_workout_plan_detail(self):
         """Test retrieving a single workout plan detail"""
@@ -143,3 +150,317 @@ class PrivateWorkoutPlanApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(WorkoutPlan.objects.filter(
             id=workout_plan.id).exists())
+
+
+class ExpandedWorkoutPlanApiTests(TestCase):
+    """Test nesting exercises with ?expand=exercises"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.muscles = [
+            MuscleGroup.objects.create(name=name)
+            for name in ('Chest', 'Triceps', 'Quadriceps')
+        ]
+
+    def add_exercises(self, workout_plan, count):
+        """Add `count` exercises, each with two target muscles."""
+        for i in range(count):
+            exercise = Exercise.objects.create(
+                name=f'{workout_plan.name} {i}',
+                description='Compound lift',
+            )
+            exercise.target_muscles.set(self.muscles[:2])
+            WorkoutPlanExercise.objects.create(
+                workout_plan=workout_plan, exercise=exercise,
+                repetitions=10, sets=3,
+            )
+
+    def test_retrieve_expanded_plan(self):
+        """Test the detail nests exercises and their target muscles"""
+        workout_plan = create_workout_plan(user=self.user)
+        self.add_exercises(workout_plan, 2)
+
+        res = self.client.get(detail_url(workout_plan.id),
+                              {'expand': 'exercises'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        exercises = res.data['exercises']
+        self.assertEqual(len(exercises), 2)
+        self.assertEqual(exercises[0]['sets'], 3)
+        self.assertEqual(exercises[0]['exercise']['name'],
+                         'Full Body Strength 0')
+        self.assertEqual(
+            [m['name'] for m in exercises[0]['exercise']['target_muscles']],
+            ['Chest', 'Triceps'],
+        )
+
+    def test_not_expanded_by_default(self):
+        """Test plans carry no nested exercises unless asked"""
+        workout_plan = create_workout_plan(user=self.user)
+        self.add_exercises(workout_plan, 1)
+
+        res = self.client.get(detail_url(workout_plan.id))
+
+        self.assertNotIn('exercises', res.data)
+
+    def test_invalid_expand_rejected(self):
+        """Test an unknown expand value returns 400"""
+        res = self.client.get(workout_plan_url(), {'expand': 'sessions'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_query_count_is_constant(self):
+        """Test the expanded detail runs a fixed number of queries"""
+        workout_plan = create_workout_plan(user=self.user)
+        self.add_exercises(workout_plan, 10)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(detail_url(workout_plan.id),
+                                  {'expand': 'exercises'})
+
+        self.assertEqual(len(res.data['exercises']), 10)
+
+    def test_list_query_count_is_constant(self):
+        """Test the expanded list runs a fixed number of queries"""
+        for name in ('Push', 'Pull', 'Legs'):
+            self.add_exercises(create_workout_plan(self.user, name=name), 5)
+
+        with self.assertNumQueries(4):
+            res = self.client.get(workout_plan_url(),
+                                  {'expand': 'exercises'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [len(plan['exercises']) for plan in res.data['results']],
+            [5, 5, 5],
+        )
+
+    def test_etag_changes_with_nested_exercise(self):
+        """Test editing a plan exercise invalidates the expanded ETag"""
+        workout_plan = create_workout_plan(user=self.user)
+        self.add_exercises(workout_plan, 1)
+        params = {'expand': 'exercises'}
+        list_etag = self.client.get(workout_plan_url(), params)['ETag']
+        detail_etag = self.client.get(
+            detail_url(workout_plan.id), params)['ETag']
+
+        row = WorkoutPlanExercise.objects.get(workout_plan=workout_plan)
+        row.sets = 5
+        row.save()
+
+        res = self.client.get(workout_plan_url(), params,
+                              HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(detail_url(workout_plan.id), params,
+                              HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['exercises'][0]['sets'], 5)
+
+    def test_etag_follows_catalog_content(self):
+        """Test the expanded ETag changes with muscles, not the version"""
+        workout_plan = create_workout_plan(user=self.user)
+        self.add_exercises(workout_plan, 1)
+        params = {'expand': 'exercises'}
+        urls = (workout_plan_url(), detail_url(workout_plan.id))
+        etags = [self.client.get(url, params)['ETag'] for url in urls]
+
+        bump_catalog_version()
+        for url, etag in zip(urls, etags):
+            res = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.muscles[0].name = 'Pectorals'
+        self.muscles[0].save()
+        for url, etag in zip(urls, etags):
+            res = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+def clone_url(workout_plan_id):
+    """Return the clone URL for a specific workout plan"""
+    return reverse('workout:workout-plan-clone', args=[workout_plan_id])
+
+
+class CloneWorkoutPlanApiTests(TestCase):
+    """Test copying a workout plan with its exercises"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.workout_plan = create_workout_plan(user=self.user)
+        for i, (sets, repetitions) in enumerate([(3, 10), (4, 8), (1, 1)]):
+            WorkoutPlanExercise.objects.create(
+                workout_plan=self.workout_plan,
+                exercise=Exercise.objects.create(
+                    name=f'Exercise {i}', description='Lift'),
+                sets=sets,
+                repetitions=repetitions,
+                distance=1.5,
+            )
+
+    def test_clone_copies_plan_and_exercises(self):
+        """Test cloning creates a new plan with the same exercises"""
+        res = self.client.post(clone_url(self.workout_plan.id))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        copy = WorkoutPlan.objects.get(id=res.data['id'])
+        self.assertNotEqual(copy.id, self.workout_plan.id)
+        self.assertEqual(copy.name, self.workout_plan.name)
+        self.assertEqual(copy.goal, self.workout_plan.goal)
+        self.assertEqual(
+            list(copy.workout_plan_exercises.order_by('id').values_list(
+                'exercise__name', 'sets', 'repetitions', 'distance')),
+            [('Exercise 0', 3, 10, 1.5), ('Exercise 1', 4, 8, 1.5),
+             ('Exercise 2', 1, 1, 1.5)],
+        )
+        self.assertEqual(self.workout_plan.workout_plan_exercises.count(), 3)
+
+    def test_clone_with_overrides(self):
+        """Test overrides rename the copy and scale sets and repetitions"""
+        payload = {
+            'name': 'Deload Week',
+            'frequency': 2,
+            'sets_scale': 0.5,
+            'repetitions_scale': 1.25,
+        }
+
+        res = self.client.post(clone_url(self.workout_plan.id), payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['name'], 'Deload Week')
+        self.assertEqual(res.data['frequency'], 2)
+        copy = WorkoutPlan.objects.get(id=res.data['id'])
+        self.assertEqual(
+            list(copy.workout_plan_exercises.order_by('id').values_list(
+                'sets', 'repetitions')),
+            [(2, 13), (2, 10), (1, 1)],
+        )
+
+    def test_clone_keeps_zero_counts(self):
+        """Test zero sets and repetitions are copied as zero"""
+        WorkoutPlanExercise.objects.filter(
+            workout_plan=self.workout_plan).update(sets=0, repetitions=0)
+
+        for payload in ({}, {'sets_scale': 2, 'repetitions_scale': 0.5}):
+            with self.subTest(payload=payload):
+                res = self.client.post(
+                    clone_url(self.workout_plan.id), payload)
+
+                self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+                copy = WorkoutPlan.objects.get(id=res.data['id'])
+                self.assertEqual(
+                    set(copy.workout_plan_exercises.values_list(
+                        'sets', 'repetitions')),
+                    {(0, 0)},
+                )
+
+    def test_clone_query_count_is_constant(self):
+        """Test cloning uses one INSERT per table whatever the plan size"""
+        with self.assertNumQueries(6):
+            res = self.client.post(clone_url(self.workout_plan.id))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_clone_invalid_scale(self):
+        """Test an out of range scale returns 400 and copies nothing"""
+        res = self.client.post(clone_url(self.workout_plan.id),
+                               {'sets_scale': 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(WorkoutPlan.objects.count(), 1)
+
+    def test_clone_other_users_plan_not_found(self):
+        """Test users cannot clone someone else's plan"""
+        other = create_workout_plan(
+            user=create_user(email='other@example.com'))
+
+        res = self.client.post(clone_url(other.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(WorkoutPlan.objects.filter(user=self.user).count(),
+                         1)
+
+
+def schedule_url(workout_plan_id):
+    """Return the schedule URL for a specific workout plan"""
+    return reverse('workout:workout-plan-schedule', args=[workout_plan_id])
+
+
+class ScheduleWorkoutPlanApiTests(TestCase):
+    """Test generating the sessions of a workout plan"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.workout_plan = create_workout_plan(user=self.user)
+
+    def test_schedule_sessions(self):
+        """Test a session is created for each scheduled day"""
+        payload = {'start': '2024-01-01', 'weeks': 2}
+
+        res = self.client.post(schedule_url(self.workout_plan.id), payload,
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['created'], 6)
+        self.assertEqual(res.data['skipped'], 0)
+        self.assertEqual(res.data['sessions'][1]['date'], '2024-01-03')
+        sessions = WorkoutSession.objects.filter(user=self.user)
+        self.assertEqual(sessions.count(), 6)
+        self.assertFalse(sessions.filter(completed=True).exists())
+
+    def test_schedule_skips_existing_dates(self):
+        """Test days that already have a session for the plan are skipped"""
+        WorkoutSession.objects.create(
+            user=self.user, workout_plan=self.workout_plan,
+            date=date(2024, 1, 3), completed=True,
+        )
+        payload = {'start': '2024-01-01', 'weeks': 1}
+
+        res = self.client.post(schedule_url(self.workout_plan.id), payload,
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['created'], 2)
+        self.assertEqual(res.data['skipped'], 1)
+        self.assertEqual(
+            WorkoutSession.objects.filter(date=date(2024, 1, 3)).count(), 1)
+
+    def test_schedule_year_query_count(self):
+        """Test a year of sessions is created in a fixed number of queries"""
+        payload = {'start': '2024-01-01', 'weeks': 52, 'weekdays': [0, 2, 4]}
+
+        # Savepoint, locked plan, existing dates, insert, release.
+        with self.assertNumQueries(5):
+            res = self.client.post(schedule_url(self.workout_plan.id),
+                                   payload, format='json')
+
+        self.assertEqual(res.data['created'], 156)
+        self.assertTrue(all(
+            day.weekday() in (0, 2, 4)
+            for day in WorkoutSession.objects.values_list('date', flat=True)
+        ))
+
+    def test_schedule_too_few_weekdays(self):
+        """Test fewer preferred weekdays than the frequency returns 400"""
+        payload = {'start': '2024-01-01', 'weeks': 1, 'weekdays': [0, 2]}
+
+        res = self.client.post(schedule_url(self.workout_plan.id), payload,
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(WorkoutSession.objects.exists())
+
+    def test_schedule_other_users_plan_not_found(self):
+        """Test users cannot schedule someone else's plan"""
+        other = create_workout_plan(
+            user=create_user(email='other@example.com'))
+
+        res = self.client.post(schedule_url(other.id), {'weeks': 1},
+                               format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
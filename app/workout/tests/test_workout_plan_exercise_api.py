@@ -86,7 +86,7 @@ class PrivateWorkoutPlanExerciseApiTests(TestCase):
             workout_plan=workout_plan).order_by('id')
         serializer = WorkoutPlanExerciseSerializer(exercises, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_workout_plan_exercises_limited_to_user(self):
         """Test workout plan exercises limited to authenticated user's plans"""
@@ -105,7 +105,7 @@ class PrivateWorkoutPlanExerciseApiTests(TestCase):
             workout_plan_exercises, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_retrieve_workout_plan_exercise_detail(self):
         """Test retrieving a single workout plan exercise detail"""
@@ -174,3 +174,124 @@ class PrivateWorkoutPlanExerciseApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(WorkoutPlanExercise.objects.filter(
             id=workout_plan_exercise.id).exists())
+
+
+def bulk_workout_plan_exercise_url():
+    """Return the bulk workout plan exercise URL"""
+    return reverse('workout:workout-plan-exercise-bulk')
+
+
+class BulkWorkoutPlanExerciseApiTests(TestCase):
+    """Test batch writes of workout plan exercises"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.workout_plan = create_workout_plan(user=self.user)
+        self.exercises = Exercise.objects.bulk_create([
+            Exercise(name=f"Exercise {i}", description="Bulk exercise")
+            for i in range(20)
+        ])
+
+    def test_bulk_create(self):
+        """Test creating many exercises with a fixed number of queries"""
+        payload = {
+            "workout_plan": self.workout_plan.id,
+            "items": [
+                {"exercise": exercise.id, "repetitions": 12, "sets": 4}
+                for exercise in self.exercises
+            ],
+        }
+
+        with self.assertNumQueries(5):
+            res = self.client.post(
+                bulk_workout_plan_exercise_url(), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['created']), 20)
+        self.assertEqual(res.data['errors'], [])
+        rows = WorkoutPlanExercise.objects.filter(
+            workout_plan=self.workout_plan)
+        self.assertEqual(rows.count(), 20)
+        self.assertTrue(all(row.sets == 4 for row in rows))
+
+    def test_bulk_update(self):
+        """Test items with an id update rows of the plan"""
+        row = create_workout_plan_exercise(
+            workout_plan=self.workout_plan, exercise=self.exercises[0])
+        payload = {
+            "workout_plan": self.workout_plan.id,
+            "items": [
+                {"id": row.id, "exercise": self.exercises[1].id, "sets": 5},
+                {"exercise": self.exercises[2].id},
+            ],
+        }
+
+        res = self.client.post(
+            bulk_workout_plan_exercise_url(), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['created']), 1)
+        self.assertEqual(res.data['updated'][0]['id'], row.id)
+        row.refresh_from_db()
+        self.assertEqual(row.exercise, self.exercises[1])
+        self.assertEqual(row.sets, 5)
+        self.assertEqual(row.repetitions, 10)
+
+    def test_bulk_partial_failure(self):
+        """Test invalid items are reported by index and valid ones saved"""
+        other_plan = create_workout_plan(
+            user=create_user(email='other@example.com'))
+        other_row = create_workout_plan_exercise(
+            workout_plan=other_plan, exercise=self.exercises[0])
+        payload = {
+            "workout_plan": self.workout_plan.id,
+            "items": [
+                {"exercise": self.exercises[0].id},
+                {"exercise": 999999},
+                {"exercise": self.exercises[1].id, "sets": -1},
+                {"id": other_row.id, "exercise": self.exercises[2].id},
+            ],
+        }
+
+        res = self.client.post(
+            bulk_workout_plan_exercise_url(), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(res.data['created']), 1)
+        self.assertEqual(
+            [error['index'] for error in res.data['errors']], [1, 2, 3])
+        self.assertIn('exercise', res.data['errors'][0]['errors'])
+        self.assertIn('sets', res.data['errors'][1]['errors'])
+        self.assertIn('id', res.data['errors'][2]['errors'])
+        other_row.refresh_from_db()
+        self.assertEqual(other_row.workout_plan, other_plan)
+
+    def test_bulk_all_invalid(self):
+        """Test a batch with no valid items returns 400"""
+        payload = {
+            "workout_plan": self.workout_plan.id,
+            "items": [{"exercise": 999999}],
+        }
+
+        res = self.client.post(
+            bulk_workout_plan_exercise_url(), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(WorkoutPlanExercise.objects.exists())
+
+    def test_bulk_other_users_plan(self):
+        """Test writing to another user's plan returns 404"""
+        other_plan = create_workout_plan(
+            user=create_user(email='other@example.com'))
+        payload = {
+            "workout_plan": other_plan.id,
+            "items": [{"exercise": self.exercises[0].id}],
+        }
+
+        res = self.client.post(
+            bulk_workout_plan_exercise_url(), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(WorkoutPlanExercise.objects.exists())
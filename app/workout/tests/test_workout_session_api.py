@@ -121,7 +121,7 @@ class PrivateWorkoutSessionApiTests(TestCase):
         serializer = WorkoutSessionSerializer(sessions, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_retrieve_workout_session_detail(self):
         """Test retrieving a single workout session detail"""
@@ -156,3 +156,201 @@ class PrivateWorkoutSessionApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(WorkoutSession.objects.filter(
             id=workout_session.id).exists())
+
+
+def batch_url():
+    """Return the batch transition URL for workout sessions"""
+    return reverse('workout:workout-session-batch')
+
+
+class BatchWorkoutSessionApiTests(TestCase):
+    """Test batch transitions of workout sessions"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.workout_plan = create_workout_plan(user=self.user)
+        self.other_plan = create_workout_plan(user=self.user, name="Cardio")
+        self.sessions = [
+            WorkoutSession.objects.create(
+                user=self.user, workout_plan=plan,
+                date=date(2024, 1, day), completed=False,
+            )
+            for day in (1, 3, 5, 8)
+            for plan in (self.workout_plan, self.other_plan)
+        ]
+
+    def test_complete_by_ids(self):
+        """Test completing the listed sessions in one UPDATE"""
+        ids = [self.sessions[0].id, self.sessions[2].id]
+
+        with self.assertNumQueries(1):
+            res = self.client.post(
+                batch_url(), {'operation': 'complete', 'ids': ids},
+                format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['updated'], 2)
+        self.assertEqual(
+            set(WorkoutSession.objects.filter(
+                completed=True).values_list('id', flat=True)),
+            set(ids),
+        )
+
+    def test_complete_skips_already_completed(self):
+        """Test sessions already in the target state are not counted"""
+        WorkoutSession.objects.filter(id=self.sessions[0].id).update(
+            completed=True)
+        ids = [self.sessions[0].id, self.sessions[1].id]
+
+        res = self.client.post(
+            batch_url(), {'operation': 'complete', 'ids': ids},
+            format='json')
+
+        self.assertEqual(res.data['updated'], 1)
+
+    def test_uncomplete_by_range_and_plan(self):
+        """Test a date range narrowed to one plan"""
+        WorkoutSession.objects.update(completed=True)
+        payload = {
+            'operation': 'uncomplete',
+            'from': '2024-01-01',
+            'to': '2024-01-05',
+            'workout_plan': self.workout_plan.id,
+        }
+
+        res = self.client.post(batch_url(), payload, format='json')
+
+        self.assertEqual(res.data['updated'], 3)
+        self.assertEqual(
+            list(WorkoutSession.objects.filter(completed=False).values_list(
+                'workout_plan', 'date').order_by('date')),
+            [(self.workout_plan.id, date(2024, 1, day)) for day in (1, 3, 5)],
+        )
+
+    def test_reschedule_by_range(self):
+        """Test shifting every session in a range forward"""
+        payload = {
+            'operation': 'reschedule',
+            'from': '2024-01-03',
+            'to': '2024-01-05',
+            'days': 7,
+        }
+
+        res = self.client.post(batch_url(), payload, format='json')
+
+        self.assertEqual(res.data['updated'], 4)
+        self.assertEqual(
+            sorted(set(WorkoutSession.objects.values_list('date', flat=True))),
+            [date(2024, 1, day) for day in (1, 8, 10, 12)],
+        )
+
+    def test_other_users_sessions_untouched(self):
+        """Test ids of other users' sessions are ignored"""
+        other_user = create_user(email='other@example.com')
+        other_session = create_workout_session(
+            other_user, create_workout_plan(user=other_user))
+
+        res = self.client.post(
+            batch_url(),
+            {'operation': 'complete',
+             'ids': [other_session.id, self.sessions[0].id]},
+            format='json')
+
+        self.assertEqual(res.data['updated'], 1)
+        other_session.refresh_from_db()
+        self.assertFalse(other_session.completed)
+
+    def test_invalid_selection(self):
+        """Test ids and a date range cannot be combined or both omitted"""
+        for payload in (
+            {'operation': 'complete'},
+            {'operation': 'complete', 'from': '2024-01-01'},
+            {'operation': 'complete', 'ids': [self.sessions[0].id],
+             'from': '2024-01-01', 'to': '2024-01-31'},
+            {'operation': 'complete', 'from': '2024-01-31',
+             'to': '2024-01-01'},
+            {'operation': 'reschedule', 'ids': [self.sessions[0].id]},
+            {'operation': 'complete', 'ids': [self.sessions[0].id],
+             'days': 1},
+        ):
+            res = self.client.post(batch_url(), payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST,
+                             payload)
+
+        self.assertFalse(WorkoutSession.objects.filter(
+            completed=True).exists())
+
+
+class FilterWorkoutSessionApiTests(TestCase):
+    """Test filtering the workout session list"""
+
+    def setUp(self):
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.workout_plan = create_workout_plan(user=self.user)
+        self.other_plan = create_workout_plan(user=self.user, name="Cardio")
+        for day in range(1, 32):
+            WorkoutSession.objects.create(
+                user=self.user,
+                workout_plan=self.workout_plan if day % 2 else self.other_plan,
+                date=date(2024, 1, day),
+                completed=day % 3 == 0,
+            )
+
+    def get_dates(self, **params):
+        """Return the dates of the sessions listed for the filters."""
+        res = self.client.get(workout_session_url(), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [session['date'] for session in res.data['results']]
+
+    def test_filter_by_date_range(self):
+        """Test from and to are inclusive"""
+        dates = self.get_dates(**{'from': '2024-01-10', 'to': '2024-01-12'})
+
+        self.assertEqual(dates, ['2024-01-10', '2024-01-11', '2024-01-12'])
+
+    def test_filter_by_plan_and_completed(self):
+        """Test plan and completed narrow the range further"""
+        dates = self.get_dates(**{
+            'from': '2024-01-01', 'to': '2024-01-15',
+            'plan': self.workout_plan.id, 'completed': 'true',
+        })
+
+        self.assertEqual(dates, ['2024-01-03', '2024-01-09', '2024-01-15'])
+
+    def test_filter_pending(self):
+        """Test completed=false lists only pending sessions"""
+        dates = self.get_dates(
+            **{'from': '2024-01-01', 'to': '2024-01-06', 'completed': 'false'})
+
+        self.assertEqual(
+            dates, ['2024-01-01', '2024-01-02', '2024-01-04', '2024-01-05'])
+
+    def test_no_filters_lists_everything(self):
+        """Test an unfiltered list includes completed and pending sessions"""
+        self.assertEqual(len(self.get_dates(page_size=100)), 31)
+
+    def test_invalid_filters(self):
+        """Test malformed or reversed filters return 400"""
+        for params in (
+            {'from': '2024-13-01'},
+            {'from': '2024-01-10', 'to': '2024-01-01'},
+            {'plan': 'cardio'},
+            {'completed': 'maybe'},
+        ):
+            res = self.client.get(workout_session_url(), params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST,
+                             params)
+
+    def test_filtered_export(self):
+        """Test exports honour the same filters"""
+        res = self.client.get(
+            reverse('workout:workout-session-export'),
+            {'type': 'csv', 'from': '2024-01-30'},
+        )
+
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
@@ -23,9 +23,17 @@ router.register(
     basename='workout-session'
 )
 router.register('progress', views.ProgressViewSet, basename='progress')
+router.register(
+    'rollups/weekly', views.WeeklyRollupViewSet, basename='weekly-rollup'
+)
+router.register(
+    'rollups/monthly', views.MonthlyRollupViewSet, basename='monthly-rollup'
+)
 
 app_name = 'workout'
 
 urlpatterns = [
+    path('autocomplete/', views.AutocompleteView.as_view(),
+         name='autocomplete'),
     path('', include(router.urls))
 ]
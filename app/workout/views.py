@@ -1,10 +1,47 @@
-from rest_framework import viewsets
+import datetime
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    DateField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Prefetch,
+)
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .permissions import IsAdminOrReadOnly
+from .catalog import CatalogCacheMixin
+from .conditional import ConditionalGetMixin, make_etag
+from .export import ExportMixin
+from .filters import HistoryFilterMixin
+from .importer import (
+    ImportFileError,
+    import_progress,
+    read_upload,
+    upsert_progress,
+)
+from .adherence import plan_adherence
+from .analytics import analyze
+from .autocomplete import autocomplete
+from .schedule import schedule_dates
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema, OpenApiExample
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiExample,
+    OpenApiParameter,
+)
 
 from core.models import (
     MuscleGroup,
@@ -12,23 +49,130 @@ from core.models import (
     WorkoutPlan,
     WorkoutPlanExercise,
     WorkoutSession,
-    Progress
+    Progress,
+    WeeklyRollup,
+    MonthlyRollup,
 )
 from workout import serializers
 
 
+def scale(value, factor):
+    """Scale a set or repetition count, rounding halves up.
+
+    A count that was positive stays at least 1; zero stays zero, and a
+    factor of 1 copies the count unchanged.
+    """
+    if factor == 1 or not value:
+        return value
+    return max(1, int(value * factor + 0.5))
+
+
 @extend_schema(tags=['Muscle groups'])
-class MuscleGroupViewSet(viewsets.ModelViewSet):
+class MuscleGroupViewSet(CatalogCacheMixin, viewsets.ModelViewSet):
     serializer_class = serializers.MuscleGroupSerializer
-    queryset = MuscleGroup.objects.all()
+    queryset = MuscleGroup.objects.order_by('id')
     permission_classes = [IsAdminOrReadOnly]
+    query_budgets = {
+        'list': 4, 'retrieve': 4, 'create': 2, 'update': 3,
+        'partial_update': 3, 'destroy': 5,
+    }
 
 
 @extend_schema(tags=['Exercises'])
-class ExerciseViewSet(viewsets.ModelViewSet):
+class ExerciseViewSet(CatalogCacheMixin, viewsets.ModelViewSet):
     serializer_class = serializers.ExerciseSerializer
-    queryset = Exercise.objects.all()
+    queryset = Exercise.objects.defer(
+        'search_vector', 'target_muscle_ids'
+    ).prefetch_related(
+        'target_muscles'
+    ).order_by('id')
     permission_classes = [IsAdminOrReadOnly]
+    query_budgets = {
+        'list': 5, 'retrieve': 5, 'search': 3, 'create': 9, 'update': 14,
+        'partial_update': 14, 'destroy': 6,
+    }
+    catalog_filter_params = ('muscles',)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('muscles', str,
+                             description="Comma-separated muscle group ids"),
+            OpenApiParameter('match', str, enum=['all', 'any', 'none'],
+                             description="How exercises must match muscles "
+                             "(default: all)"),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        """Filter the list by target muscles using the denormalized ids."""
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list' or 'muscles' not in self.request.query_params:
+            return queryset
+
+        params = serializers.ExerciseFilterSerializer(
+            data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        muscles = params.validated_data['muscles']
+        match = params.validated_data['match']
+
+        if match == 'all':
+            return queryset.filter(target_muscle_ids__contains=muscles)
+        if match == 'any':
+            return queryset.filter(target_muscle_ids__overlap=muscles)
+        return queryset.exclude(target_muscle_ids__overlap=muscles)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter('q', str, required=True,
+                             description="Search terms"),
+            OpenApiParameter('limit', int,
+                             description="Maximum results (1-100)"),
+        ],
+        responses={200: serializers.ExerciseSerializer(many=True)},
+    )
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def search(self, request):
+        """Full-text search over exercises, best matches first."""
+        params = serializers.ExerciseSearchSerializer(
+            data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        query = SearchQuery(
+            params.validated_data['q'],
+            search_type='websearch',
+            config='english',
+        )
+        exercises = self.get_queryset().filter(
+            search_vector=query
+        ).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by('-rank', 'id')[:params.validated_data['limit']]
+
+        serializer = self.get_serializer(exercises, many=True)
+        return Response(serializer.data)
+
+
+@extend_schema(
+    tags=['Exercises'],
+    parameters=[
+        OpenApiParameter('q', str, required=True,
+                         description="What the user has typed so far"),
+    ],
+    responses={200: serializers.AutocompleteSerializer},
+)
+class AutocompleteView(APIView):
+    """Suggest exercise and muscle group names while the user types."""
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'get': 6}
+
+    def get(self, request):
+        params = serializers.AutocompleteQuerySerializer(
+            data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(autocomplete(params.validated_data['q']))
 
 
 @extend_schema(
@@ -48,19 +192,216 @@ class ExerciseViewSet(viewsets.ModelViewSet):
     ],
     responses={201: serializers.WorkoutPlanSerializer}
 )
-class WorkoutPlanViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[serializers.WorkoutPlanExpandSerializer],
+        responses={200: serializers.WorkoutPlanDetailSerializer(many=True)},
+    ),
+    retrieve=extend_schema(
+        parameters=[serializers.WorkoutPlanExpandSerializer],
+        responses={200: serializers.WorkoutPlanDetailSerializer},
+    ),
+)
+class WorkoutPlanViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = serializers.WorkoutPlanSerializer
     queryset = WorkoutPlan.objects.all()
+    ordering = ('name', 'id')
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': 5, 'retrieve': 4, 'create': 2, 'update': 3,
+        'partial_update': 3, 'destroy': 5, 'adherence': 3,
+        'overall_adherence': 2, 'clone': 5, 'schedule': 4,
+    }
+
+    @property
+    def expand_exercises(self):
+        """Whether a read should nest the plan's exercises."""
+        if self.action not in ('list', 'retrieve'):
+            return False
+        params = serializers.WorkoutPlanExpandSerializer(
+            data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data.get('expand') == 'exercises'
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('name')
+        queryset = self.queryset.filter(
+            user=self.request.user
+        ).order_by('name')
+        if self.expand_exercises:
+            queryset = queryset.prefetch_related(Prefetch(
+                'workout_plan_exercises',
+                queryset=WorkoutPlanExercise.objects.select_related(
+                    'exercise'
+                ).defer(
+                    'exercise__search_vector', 'exercise__target_muscle_ids'
+                ).prefetch_related('exercise__target_muscles').order_by('id'),
+            ))
+        return queryset
+
+    def get_serializer_class(self):
+        if self.expand_exercises:
+            return serializers.WorkoutPlanDetailSerializer
+        return self.serializer_class
+
+    def get_list_validators(self):
+        """Also track nested exercises and catalog renames when expanded."""
+        if not self.expand_exercises:
+            return super().get_list_validators()
+
+        state = self.filter_queryset(self.get_queryset()).order_by(
+        ).aggregate(
+            count=Count('pk', distinct=True),
+            exercises=Count('workout_plan_exercises', distinct=True),
+            plans_modified=Max('updated_at'),
+            rows_modified=Max('workout_plan_exercises__updated_at'),
+            exercises_modified=Max(
+                'workout_plan_exercises__exercise__updated_at'),
+            muscles=Count(
+                'workout_plan_exercises__exercise__target_muscles',
+                distinct=True),
+            muscles_modified=Max(
+                'workout_plan_exercises__exercise__target_muscles__updated_at'
+            ),
+        )
+        last_modified = max(filter(None, (
+            state['plans_modified'], state['rows_modified'],
+            state['exercises_modified'], state['muscles_modified'],
+        )), default=None)
+        etag = make_etag(
+            self.basename,
+            self.request.user.pk,
+            self.request.get_full_path(),
+            state['count'],
+            state['exercises'],
+            state['muscles'],
+            last_modified and last_modified.isoformat(),
+        )
+        return etag, last_modified
+
+    def get_object_validators(self, instance):
+        """Also track nested exercises and catalog renames when expanded."""
+        if not self.expand_exercises:
+            return super().get_object_validators(instance)
+
+        rows = instance.workout_plan_exercises.all()
+        muscles = {
+            muscle for row in rows
+            for muscle in row.exercise.target_muscles.all()
+        }
+        last_modified = max(
+            [instance.updated_at]
+            + [row.updated_at for row in rows]
+            + [row.exercise.updated_at for row in rows]
+            + [muscle.updated_at for muscle in muscles]
+        )
+        etag = make_etag(
+            self.basename, instance.pk, len(rows), len(muscles),
+            last_modified.isoformat(),
+        )
+        return etag, last_modified
 
     def perform_create(self, serializer):
         """Create a new workout plan."""
         serializer.save(user=self.request.user)
 
+    @extend_schema(
+        request=serializers.WorkoutPlanCloneSerializer,
+        responses={201: serializers.WorkoutPlanSerializer},
+    )
+    @action(detail=True, methods=['post'])
+    def clone(self, request, pk=None):
+        """Copy this plan and all of its exercises."""
+        plan = self.get_object()
+        params = serializers.WorkoutPlanCloneSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        overrides = params.validated_data
+
+        with transaction.atomic():
+            copy = WorkoutPlan.objects.create(
+                user=request.user,
+                name=overrides.get('name', plan.name),
+                frequency=overrides.get('frequency', plan.frequency),
+                goal=plan.goal,
+                duration_per_session=plan.duration_per_session,
+            )
+            rows = plan.workout_plan_exercises.order_by('id').values(
+                'exercise_id', 'repetitions', 'sets', 'duration', 'distance')
+            WorkoutPlanExercise.objects.bulk_create([
+                WorkoutPlanExercise(
+                    workout_plan=copy,
+                    exercise_id=row['exercise_id'],
+                    repetitions=scale(
+                        row['repetitions'], overrides['repetitions_scale']),
+                    sets=scale(row['sets'], overrides['sets_scale']),
+                    duration=row['duration'],
+                    distance=row['distance'],
+                )
+                for row in rows
+            ])
+
+        serializer = self.get_serializer(copy)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        request=serializers.WorkoutScheduleSerializer,
+        responses={201: serializers.WorkoutScheduleResultSerializer},
+    )
+    @action(detail=True, methods=['post'])
+    def schedule(self, request, pk=None):
+        """Create this plan's sessions for a number of weeks."""
+        with transaction.atomic():
+            # Locking the plan keeps concurrent requests from both
+            # creating a session for the same date.
+            plan = get_object_or_404(
+                self.get_queryset().select_for_update(), pk=pk)
+            params = serializers.WorkoutScheduleSerializer(
+                data=request.data, context={'plan': plan})
+            params.is_valid(raise_exception=True)
+            dates = schedule_dates(
+                frequency=plan.frequency, **params.validated_data)
+
+            taken = set(plan.sessions.filter(
+                date__range=(dates[0], dates[-1])
+            ).values_list('date', flat=True))
+            sessions = WorkoutSession.objects.bulk_create([
+                WorkoutSession(user=request.user, workout_plan=plan, date=day)
+                for day in dates if day not in taken
+            ])
+
+        result = serializers.WorkoutScheduleResultSerializer({
+            'created': len(sessions),
+            'skipped': len(dates) - len(sessions),
+            'sessions': sessions,
+        })
+        return Response(result.data, status=status.HTTP_201_CREATED)
+
+    def adherence_response(self, request, plan=None):
+        params = serializers.AdherenceQuerySerializer(
+            data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(
+            plan_adherence(request.user, plan, **params.validated_data))
+
+    @extend_schema(
+        parameters=[serializers.AdherenceQuerySerializer],
+        responses=serializers.AdherenceSerializer,
+    )
+    @action(detail=True, pagination_class=None)
+    def adherence(self, request, pk=None):
+        """Weekly completed sessions against this plan's frequency."""
+        return self.adherence_response(request, self.get_object())
+
+    @extend_schema(
+        parameters=[serializers.AdherenceQuerySerializer],
+        responses=serializers.AdherenceSerializer,
+    )
+    @action(detail=False, url_path='adherence', url_name='overall-adherence',
+            pagination_class=None)
+    def overall_adherence(self, request):
+        """Weekly completed sessions against the frequency of every plan."""
+        return self.adherence_response(request)
+
 
 @extend_schema(
     tags=['Workout Plan Exercises'],
@@ -82,11 +423,16 @@ class WorkoutPlanViewSet(viewsets.ModelViewSet):
     ],
     responses={201: serializers.WorkoutPlanExerciseSerializer}
 )
-class WorkoutPlanExerciseViewSet(viewsets.ModelViewSet):
+class WorkoutPlanExerciseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = serializers.WorkoutPlanExerciseSerializer
     queryset = WorkoutPlanExercise.objects.all()
+    ordering = ('id',)
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': 3, 'retrieve': 2, 'create': 5, 'bulk': 6, 'update': 5,
+        'partial_update': 3, 'destroy': 3,
+    }
 
     def get_queryset(self):
         return self.queryset.filter(workout_plan__user=self.request.user)
@@ -98,6 +444,117 @@ class WorkoutPlanExerciseViewSet(viewsets.ModelViewSet):
                                          user=self.request.user)
         serializer.save(workout_plan=workout_plan)
 
+    @extend_schema(
+        request=serializers.WorkoutPlanExerciseBulkSerializer,
+        responses={
+            201: serializers.WorkoutPlanExerciseBulkResultSerializer,
+            207: serializers.WorkoutPlanExerciseBulkResultSerializer,
+        },
+        examples=[
+            OpenApiExample(
+                "Bulk Example",
+                value={
+                    "workout_plan": 1,
+                    "items": [
+                        {"exercise": 3, "repetitions": 12, "sets": 4},
+                        {"id": 7, "exercise": 5, "sets": 5},
+                    ]
+                },
+                request_only=True,
+            )
+        ],
+    )
+    @action(detail=False, methods=['post'], pagination_class=None)
+    def bulk(self, request):
+        """Create or update many exercises of one plan in a single batch.
+
+        Items with an ``id`` update that row of the plan, the rest are
+        created. Valid items are written in one transaction; invalid ones
+        are reported by their index in the request.
+        """
+        payload = serializers.WorkoutPlanExerciseBulkSerializer(
+            data=request.data)
+        payload.is_valid(raise_exception=True)
+        workout_plan = get_object_or_404(
+            WorkoutPlan,
+            id=payload.validated_data['workout_plan'],
+            user=request.user,
+        )
+
+        errors = {}
+        valid = []
+        for index, item in enumerate(payload.validated_data['items']):
+            serializer = serializers.WorkoutPlanExerciseBulkItemSerializer(
+                data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors[index] = serializer.errors
+
+        exercise_ids = set(Exercise.objects.filter(
+            id__in={data['exercise'] for _, data in valid}
+        ).values_list('id', flat=True))
+        update_ids = {data['id'] for _, data in valid if 'id' in data}
+        existing = workout_plan.workout_plan_exercises.in_bulk(
+            update_ids) if update_ids else {}
+
+        now = timezone.now()
+        to_create = []
+        to_update = {}
+        for index, data in valid:
+            data = dict(data)
+            row_id = data.pop('id', None)
+            exercise_id = data.pop('exercise')
+            if exercise_id not in exercise_ids:
+                errors[index] = {'exercise': [
+                    f'Invalid pk "{exercise_id}" - object does not exist.'
+                ]}
+            elif row_id is None:
+                to_create.append(WorkoutPlanExercise(
+                    workout_plan=workout_plan, exercise_id=exercise_id,
+                    **data
+                ))
+            elif row_id not in existing:
+                errors[index] = {'id': [
+                    f'Invalid pk "{row_id}" - not in this workout plan.'
+                ]}
+            elif row_id in to_update:
+                errors[index] = {'id': [
+                    f'Duplicate pk "{row_id}" in this request.'
+                ]}
+            else:
+                instance = existing[row_id]
+                instance.exercise_id = exercise_id
+                for field, value in data.items():
+                    setattr(instance, field, value)
+                instance.updated_at = now
+                to_update[row_id] = instance
+
+        with transaction.atomic():
+            WorkoutPlanExercise.objects.bulk_create(to_create)
+            if to_update:
+                WorkoutPlanExercise.objects.bulk_update(
+                    to_update.values(),
+                    ['exercise', 'repetitions', 'sets', 'duration',
+                     'distance', 'updated_at'],
+                )
+
+        if errors and not (to_create or to_update):
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        result = serializers.WorkoutPlanExerciseBulkResultSerializer({
+            'created': to_create,
+            'updated': list(to_update.values()),
+            'errors': [
+                {'index': index, 'errors': errors[index]}
+                for index in sorted(errors)
+            ],
+        })
+        return Response(result.data, status=response_status)
+
 
 @extend_schema(
     tags=['Workout Sessions'],
@@ -116,11 +573,30 @@ class WorkoutPlanExerciseViewSet(viewsets.ModelViewSet):
     responses={201: serializers.WorkoutSessionSerializer}
 
 )
-class WorkoutSessionViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[serializers.WorkoutSessionFilterSerializer]),
+    export=extend_schema(
+        parameters=[serializers.WorkoutSessionFilterSerializer]),
+)
+class WorkoutSessionViewSet(HistoryFilterMixin, ConditionalGetMixin,
+                            ExportMixin, viewsets.ModelViewSet):
     serializer_class = serializers.WorkoutSessionSerializer
     queryset = WorkoutSession.objects.all()
+    ordering = ('date', 'id')
+    export_fields = ('id', 'workout_plan', 'date', 'completed')
+    history_filter_class = serializers.WorkoutSessionFilterSerializer
+    history_filters = {
+        **HistoryFilterMixin.history_filters,
+        'plan': 'workout_plan_id',
+        'completed': 'completed',
+    }
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': 3, 'retrieve': 2, 'create': 3, 'batch': 2, 'export': 1,
+        'update': 4, 'partial_update': 3, 'destroy': 3,
+    }
 
     def get_queryset(self):
         return self.queryset.filter(user=self.request.user)
@@ -129,17 +605,192 @@ class WorkoutSessionViewSet(viewsets.ModelViewSet):
         """Create a new workout session"""
         serializer.save(user=self.request.user)
 
+    @extend_schema(
+        request=serializers.WorkoutSessionBatchSerializer,
+        responses=serializers.WorkoutSessionBatchResultSerializer,
+    )
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Complete, uncomplete or reschedule many sessions at once."""
+        params = serializers.WorkoutSessionBatchSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        # Ownership is part of the UPDATE's WHERE clause, so sessions of
+        # other users are never loaded or touched.
+        sessions = self.get_queryset()
+        if 'ids' in data:
+            sessions = sessions.filter(id__in=data['ids'])
+        else:
+            sessions = sessions.filter(date__range=(data['from'], data['to']))
+            if 'workout_plan' in data:
+                sessions = sessions.filter(
+                    workout_plan_id=data['workout_plan'])
+
+        changes = {'updated_at': timezone.now()}
+        if data['operation'] == 'reschedule':
+            changes['date'] = ExpressionWrapper(
+                F('date') + datetime.timedelta(days=data['days']),
+                output_field=DateField(),
+            )
+        else:
+            completed = data['operation'] == 'complete'
+            sessions = sessions.exclude(completed=completed)
+            changes['completed'] = completed
+
+        return Response({'updated': sessions.update(**changes)})
+
 
 @extend_schema(tags=['Progress Tracking'])
-class ProgressViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[serializers.DateRangeSerializer]),
+    export=extend_schema(parameters=[serializers.DateRangeSerializer]),
+    analytics=extend_schema(parameters=[serializers.DateRangeSerializer]),
+)
+class ProgressViewSet(HistoryFilterMixin, ConditionalGetMixin, ExportMixin,
+                      viewsets.ModelViewSet):
     serializer_class = serializers.ProgressSerializer
     queryset = Progress.objects.all()
+    ordering = ('-date', 'id')
+    export_fields = ('id', 'date', 'weight', 'notes')
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    query_budgets = {
+        'list': 3, 'retrieve': 2, 'create': 2, 'by_date': 2,
+        'analytics': 2, 'export': 1, 'update': 3, 'partial_update': 3,
+        'destroy': 3,
+        # One upsert per batch of rows, however long the file is.
+        'import_file': None,
+    }
 
     def get_queryset(self):
-        return self.queryset.filter(user=self.request.user).order_by('-date')
+        return self.queryset.filter(
+            user=self.request.user
+        ).select_related('user').order_by('-date')
 
     def perform_create(self, serializer):
         """Create a new Progress record"""
-        serializer.save(user=self.request.user)
+        self.save_unique_date(serializer, user=self.request.user)
+
+    def perform_update(self, serializer):
+        self.save_unique_date(serializer)
+
+    def save_unique_date(self, serializer, **kwargs):
+        """Save, turning a clash on the (user, date) constraint into a 400"""
+        try:
+            with transaction.atomic():
+                serializer.save(**kwargs)
+        except IntegrityError:
+            raise ValidationError({'date': [
+                "You have already logged progress for this date"
+            ]})
+
+    @extend_schema(
+        parameters=[serializers.ProgressAnalyticsQuerySerializer],
+        responses=serializers.ProgressAnalyticsSerializer,
+    )
+    @action(detail=False, pagination_class=None)
+    def analytics(self, request):
+        """Return rolling means, trend, weekly changes and a projection."""
+        params = serializers.ProgressAnalyticsQuerySerializer(
+            data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        rows = list(self.filter_queryset(self.get_queryset()).filter(
+            weight__isnull=False
+        ).order_by('date').values_list('date', 'weight'))
+        dates, weights = zip(*rows) if rows else ((), ())
+        return Response(analyze(dates, weights, **params.validated_data))
+
+    @extend_schema(
+        request=serializers.ProgressUpsertSerializer,
+        responses={
+            200: serializers.ProgressSerializer,
+            201: serializers.ProgressSerializer,
+        },
+    )
+    @action(detail=False, methods=['put'],
+            url_path=r'by-date/(?P<date>[0-9]{4}-[0-9]{2}-[0-9]{2})',
+            url_name='by-date', pagination_class=None)
+    def by_date(self, request, date=None):
+        """Create or replace the entry for a date in a single statement."""
+        try:
+            day = datetime.date.fromisoformat(date)
+        except ValueError:
+            raise ValidationError({'date': ['Not a valid calendar date.']})
+        payload = serializers.ProgressUpsertSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+
+        progress, created = upsert_progress(
+            request.user, day,
+            payload.validated_data.get('weight'),
+            payload.validated_data.get('notes'),
+        )
+        return Response(
+            serializers.ProgressSerializer(progress).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        request={'multipart/form-data': serializers.ProgressImportSerializer},
+        responses={
+            200: serializers.ProgressImportResultSerializer,
+            207: serializers.ProgressImportResultSerializer,
+        },
+    )
+    @action(detail=False, methods=['post'], url_path='import',
+            url_name='import', parser_classes=[MultiPartParser],
+            pagination_class=None)
+    def import_file(self, request):
+        """Import progress entries from an uploaded CSV or NDJSON file."""
+        payload = serializers.ProgressImportSerializer(data=request.data)
+        payload.is_valid(raise_exception=True)
+
+        rows = read_upload(
+            payload.validated_data['file'], payload.validated_data['type'])
+        try:
+            report = import_progress(
+                request.user, rows, payload.validated_data['on_conflict'])
+        except ImportFileError as exc:
+            raise ValidationError({'file': [str(exc)]})
+        except UnicodeDecodeError:
+            raise ValidationError({'file': ['The file must be UTF-8.']})
+
+        written = report['created'] + report['updated'] + report['skipped']
+        if report['errors'] and not written:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif report['errors']:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_200_OK
+        result = serializers.ProgressImportResultSerializer(report)
+        return Response(result.data, status=response_status)
+
+
+@extend_schema(tags=['Dashboard'])
+class WeeklyRollupViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
+    """Weekly session and weight totals, newest week first."""
+    serializer_class = serializers.WeeklyRollupSerializer
+    queryset = WeeklyRollup.objects.all()
+    ordering = ('-week',)
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 3, 'retrieve': 2}
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)
+
+
+@extend_schema(tags=['Dashboard'])
+class MonthlyRollupViewSet(ConditionalGetMixin,
+                           viewsets.ReadOnlyModelViewSet):
+    """Monthly session and weight totals, newest month first."""
+    serializer_class = serializers.MonthlyRollupSerializer
+    queryset = MonthlyRollup.objects.all()
+    ordering = ('-month',)
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    query_budgets = {'list': 3, 'retrieve': 2}
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)